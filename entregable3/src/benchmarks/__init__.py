@@ -0,0 +1,4 @@
+"""Benchmarks de rendimiento sobre redes sociales sintéticas.
+
+Uso (desde src): python -m benchmarks --aristas 1000 100000 --salida resultados.json
+"""
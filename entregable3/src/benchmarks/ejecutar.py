@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import grafo
+import recorridos
+from benchmarks.generador import generar, leer_relaciones
+from redsocial import Red_social
+
+
+def _medir(funcion: Callable[[], object], memoria: bool) -> Dict[str, Optional[float]]:
+    """Mide el tiempo de funcion y, si se pide, su pico de memoria en una segunda ejecución."""
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    pico = None
+    if memoria:
+        tracemalloc.start()
+        try:
+            funcion()
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {'segundos': segundos, 'pico_bytes': pico}
+
+
+def _casos(usuarios_file: str, relaciones_file: str, semilla: int) -> Dict[str, Callable[[], object]]:
+    """Prepara las entradas y devuelve {nombre: función a medir} para un conjunto de datos."""
+    filas = leer_relaciones(relaciones_file)
+    dirigido = grafo.Graph(directed=True)
+    for a, b, interacciones, _ in filas:
+        dirigido.add_edge(a, b, interacciones)
+    simple = recorridos.Graph()
+    for a, b, _, _ in filas:
+        simple.add_edge(a, b)
+    origen = filas[0][0]
+    dfs = recorridos.RecorridoEnProfundidad.of(simple)
+    dfs.traverse(origen)
+    muestra = random.Random(semilla).sample(list(dfs._tree), min(1000, len(dfs._tree)))
+
+    origenes = [a for a, _, _, _ in filas]
+    destinos = [b for _, b, _, _ in filas]
+    pesos = [interacciones for _, _, interacciones, _ in filas]
+
+    def add_edge(directed=True):
+        graph = grafo.Graph(directed=directed)
+        for a, b, interacciones, _ in filas:
+            graph.add_edge(a, b, interacciones)
+
+    def add_edges_from(directed=True):
+        grafo.Graph(directed=directed).add_edges_from((a, b, interacciones) for a, b, interacciones, _ in filas)
+
+    def add_edges_from_arrays(directed=True):
+        grafo.Graph(directed=directed).add_edges_from_arrays(origenes, destinos, pesos)
+
+    def path_to_origin():
+        for vertex in muestra:
+            dfs.path_to_origin(vertex)
+
+    return {
+        'grafo.Graph.add_edge': add_edge,
+        'grafo.Graph.add_edges_from': add_edges_from,
+        'grafo.Graph.add_edges_from_arrays': add_edges_from_arrays,
+        'grafo.Graph.add_edge (no dirigido)': lambda: add_edge(False),
+        'grafo.Graph.add_edges_from (no dirigido)': lambda: add_edges_from(False),
+        'grafo.Graph.add_edges_from_arrays (no dirigido)': lambda: add_edges_from_arrays(False),
+        'Red_social.parse': lambda: Red_social.parse(usuarios_file, relaciones_file),
+        'Red_social.parse_bulk': lambda: Red_social.parse_bulk(usuarios_file, relaciones_file),
+        'RecorridoEnProfundidad.traverse': lambda: recorridos.RecorridoEnProfundidad.of(simple).traverse(origen),
+        'Graph.inverse_graph': dirigido.inverse_graph,
+        'ReversedGraph.materialize': lambda: dirigido.inverse_graph().materialize(),
+        'Recorrido.path_to_origin (x1000)': path_to_origin,
+    }
+
+
+def ejecutar(aristas: List[int], modelos: List[str], semilla: int = 0, memoria: bool = True,
+             directorio: Optional[str] = None, verbose: bool = False) -> Dict:
+    """Genera los conjuntos de datos, ejecuta todos los casos y devuelve los resultados serializables.
+
+    Los ficheros se generan en directorio; si no se indica, en uno temporal que se borra al
+    terminar. Con verbose se escribe el progreso en la salida de error.
+    """
+    resultados = []
+    temporal = tempfile.TemporaryDirectory(prefix='bench_') if directorio is None else nullcontext(directorio)
+    with temporal as directorio:
+        for modelo in modelos:
+            for objetivo in aristas:
+                usuarios_file = os.path.join(directorio, f'usuarios_{modelo}_{objetivo}.csv')
+                relaciones_file = os.path.join(directorio, f'relaciones_{modelo}_{objetivo}.csv')
+                escritas = generar(modelo, objetivo, usuarios_file, relaciones_file, semilla)
+                for nombre, funcion in _casos(usuarios_file, relaciones_file, semilla).items():
+                    medida = _medir(funcion, memoria)
+                    resultados.append({'benchmark': nombre, 'modelo': modelo, 'aristas': escritas, **medida})
+                    if verbose:
+                        print(f"{modelo:12} {escritas:>10} {nombre:48} {medida['segundos']:9.4f} s", file=sys.stderr)
+    return {
+        'entorno': {'python': platform.python_version(), 'plataforma': platform.platform(),
+                    'fecha': datetime.now().isoformat(timespec='seconds'), 'semilla': semilla},
+        'resultados': resultados,
+    }
+
+
+def aceleraciones(datos: Dict) -> List[str]:
+    """Devuelve una línea por inserción en bloque con su aceleración frente a add_edge con las mismas aristas."""
+    tiempos = {(r['benchmark'], r['modelo'], r['aristas']): r['segundos'] for r in datos['resultados']}
+    lineas = []
+    for (nombre, modelo, aristas), segundos in tiempos.items():
+        if nombre.startswith('grafo.Graph.add_edges_from') and segundos > 0:
+            base = tiempos.get((re.sub(r'add_edges_from(_arrays)?', 'add_edge', nombre), modelo, aristas))
+            if base is not None:
+                lineas.append(f"{modelo:12} {aristas:>10} {nombre:48} x{base / segundos:.2f} frente a add_edge")
+    return lineas
+
+
+def comparar(anterior: Dict, actual: Dict) -> List[str]:
+    """Compara dos ficheros de resultados y devuelve una línea por caso común con la razón de tiempos."""
+    clave = lambda r: (r['benchmark'], r['modelo'], r['aristas'])
+    previos = {clave(r): r for r in anterior['resultados']}
+    lineas = []
+    for r in actual['resultados']:
+        previo = previos.get(clave(r))
+        if previo and previo['segundos'] > 0:
+            razon = r['segundos'] / previo['segundos']
+            lineas.append(f"{r['modelo']:12} {r['aristas']:>10} {r['benchmark']:48} x{razon:.2f}")
+    return lineas
+
+
+def main(argv: Optional[List[str]] = None):
+    """Punto de entrada de línea de órdenes."""
+    parser = argparse.ArgumentParser(description="Benchmarks de grafos y redes sociales sintéticas.")
+    parser.add_argument('--aristas', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--modelos', nargs='+', default=['power_law', 'small_world'],
+                        choices=['power_law', 'small_world'])
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--sin-memoria', action='store_true', help="No medir el pico de memoria")
+    parser.add_argument('--salida', help="Fichero JSON de resultados (por defecto, salida estándar)")
+    parser.add_argument('--comparar', help="Fichero JSON de una ejecución anterior con el que comparar")
+    parser.add_argument('--silencioso', action='store_true', help="No mostrar el progreso")
+    args = parser.parse_args(argv)
+
+    datos = ejecutar(args.aristas, args.modelos, args.semilla, not args.sin_memoria, verbose=not args.silencioso)
+    texto = json.dumps(datos, indent=2)
+    if args.salida:
+        with open(args.salida, 'w') as f:
+            f.write(texto)
+    else:
+        print(texto)
+    if not args.silencioso:
+        for linea in aceleraciones(datos):
+            print(linea, file=sys.stderr)
+    if args.comparar:
+        with open(args.comparar) as f:
+            for linea in comparar(json.load(f), datos):
+                print(linea, file=sys.stderr)
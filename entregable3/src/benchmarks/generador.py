@@ -0,0 +1,85 @@
+import random
+from datetime import date
+from typing import Iterator, List, Set, Tuple
+
+LETRAS_DNI = "TRWAGMYFPDXBNJZSQVHLCKE"
+NOMBRES = ["Ana", "Luis", "Eva", "Juan", "Marta", "Carlos", "Lucia", "Pablo", "Sara", "Jorge", "Elena", "Mario"]
+APELLIDOS = ["Garcia", "Lopez", "Perez", "Ruiz", "Martin", "Sanchez", "Gomez", "Diaz", "Moreno", "Alonso"]
+
+
+def dni(i: int) -> str:
+    """Devuelve un DNI válido (8 dígitos y letra de control) para el número i."""
+    return f"{i:08d}{LETRAS_DNI[i % 23]}"
+
+
+def power_law(n: int, m: int, rng: random.Random) -> Iterator[Tuple[int, int]]:
+    """Aristas de un grafo de Barabási-Albert: cada vértice nuevo se une a m existentes con probabilidad proporcional al grado."""
+    repetidos: List[int] = []  # Cada vértice aparece tantas veces como su grado
+    for i in range(min(m + 1, n)):
+        for j in range(i):
+            yield j, i
+            repetidos += (i, j)
+    for i in range(m + 1, n):
+        elegidos: Set[int] = set()
+        while len(elegidos) < m:
+            elegidos.add(rng.choice(repetidos))
+        for j in elegidos:
+            yield j, i
+            repetidos += (i, j)
+
+
+def small_world(n: int, k: int, p: float, rng: random.Random) -> Iterator[Tuple[int, int]]:
+    """Aristas de un grafo de Watts-Strogatz: anillo con k vecinos por lado y recableado con probabilidad p."""
+    aristas: Set[Tuple[int, int]] = set()
+    for i in range(n):
+        for salto in range(1, k + 1):
+            j = (i + salto) % n
+            if rng.random() < p:
+                j = rng.randrange(n)
+            a, b = min(i, j), max(i, j)
+            if a != b and (a, b) not in aristas:
+                aristas.add((a, b))
+                yield a, b
+
+
+def generar(modelo: str, aristas: int, usuarios_file: str, relaciones_file: str, semilla: int = 0) -> int:
+    """Escribe los CSV de usuarios y relaciones de una red sintética de unas 'aristas' relaciones.
+
+    modelo es 'power_law' (grado medio 2 * 5) o 'small_world' (grado medio 2 * 5, p = 0.1).
+    Devuelve el número de relaciones escritas. El resultado solo depende de la semilla.
+    """
+    rng = random.Random(semilla)
+    grado = 5
+    n = max(grado + 2, aristas // grado)
+    if modelo == 'power_law':
+        generador = power_law(n, grado, rng)
+    elif modelo == 'small_world':
+        generador = small_world(n, grado, 0.1, rng)
+    else:
+        raise ValueError("Modelo no válido. Use 'power_law' o 'small_world'.")
+
+    inicio = date(1950, 1, 1).toordinal()
+    dias = (date(2005, 12, 31) - date(1950, 1, 1)).days
+    with open(usuarios_file, 'w', buffering=1 << 20) as f:
+        for i in range(n):
+            nacimiento = date.fromordinal(inicio + rng.randrange(dias))
+            f.write(f"{dni(i)},{rng.choice(NOMBRES)},{rng.choice(APELLIDOS)},{nacimiento.isoformat()}\n")
+
+    escritas = 0
+    with open(relaciones_file, 'w', buffering=1 << 20) as f:
+        for a, b in generador:
+            if escritas >= aristas:
+                break
+            f.write(f"{dni(a)},{dni(b)},{1 + int(rng.paretovariate(1.5))},{1 + rng.randrange(365)}\n")
+            escritas += 1
+    return escritas
+
+
+def leer_relaciones(relaciones_file: str) -> List[Tuple[str, str, int, int]]:
+    """Lee un CSV de relaciones como lista de tuplas (dni origen, dni destino, interacciones, días)."""
+    filas = []
+    with open(relaciones_file) as f:
+        for line in f:
+            a, b, interacciones, dias_activa = line.rstrip('\n').split(',')
+            filas.append((a, b, int(interacciones), int(dias_activa)))
+    return filas
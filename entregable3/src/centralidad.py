@@ -0,0 +1,117 @@
+from array import array
+from math import isnan, sqrt
+from typing import Sequence
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # SciPy es opcional: sin él las centralidades se calculan en Python puro
+    np = sparse = None
+
+# Las funciones trabajan sobre una adyacencia CSR en buffers de 'array': offsets ('q', V + 1
+# posiciones), destinos ('i') y pesos ('d', NaN para las aristas sin peso, que cuentan como 1).
+# Es el formato de FrozenGraph; Graph y Red_social lo construyen a partir de sus diccionarios.
+
+
+def pesos_efectivos(weights: Sequence[float]) -> array:
+    """Copia los pesos sustituyendo NaN (arista sin peso) por 1."""
+    return array('d', (1.0 if isnan(weight) else weight for weight in weights))
+
+
+def matriz_csr(offsets: array, targets: array, weights: array):
+    """Devuelve la adyacencia como scipy.sparse.csr_matrix de V x V. Requiere SciPy."""
+    if sparse is None:
+        raise ImportError("to_sparse necesita SciPy (pip install scipy).")
+    n = len(offsets) - 1
+    datos = np.frombuffer(weights, dtype=np.float64).copy()
+    datos[np.isnan(datos)] = 1.0
+    return sparse.csr_matrix((datos, np.frombuffer(targets, dtype=np.int32).copy(),
+                              np.frombuffer(offsets, dtype=np.int64).copy()), shape=(n, n))
+
+
+def centralidad_grado(offsets: array, targets: array, dirigido: bool) -> list:
+    """Grado de cada vértice (entrada más salida si es dirigido) dividido entre V - 1."""
+    n = len(offsets) - 1
+    escala = 1.0 / (n - 1) if n > 1 else 1.0
+    grados = [offsets[i + 1] - offsets[i] for i in range(n)]
+    if dirigido:
+        for j in targets:
+            grados[j] += 1
+    return [grado * escala for grado in grados]
+
+
+def pagerank(offsets: array, targets: array, weights: array, amortiguacion: float = 0.85,
+             tolerancia: float = 1e-10, max_iter: int = 100) -> list:
+    """PageRank ponderado por iteración de potencias; los vértices sin salida reparten su peso entre todos.
+
+    Se detiene cuando la variación total es menor que V * tolerancia. Lanza ValueError si no converge.
+    """
+    n = len(offsets) - 1
+    if n == 0:
+        return []
+    if sparse is not None:
+        matriz = matriz_csr(offsets, targets, weights)
+        salida = np.asarray(matriz.sum(axis=1)).ravel()
+        colgantes = salida == 0
+        inversa = np.divide(1.0, salida, out=np.zeros(n), where=~colgantes)
+        transicion = (sparse.diags(inversa) @ matriz).T.tocsr()
+        x = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            nuevo = amortiguacion * (transicion @ x + x[colgantes].sum() / n) + (1 - amortiguacion) / n
+            if np.abs(nuevo - x).sum() < n * tolerancia:
+                return nuevo.tolist()
+            x = nuevo
+        raise ValueError(f"PageRank no converge en {max_iter} iteraciones.")
+
+    pesos = pesos_efectivos(weights)
+    salida = [sum(pesos[offsets[i]:offsets[i + 1]]) for i in range(n)]
+    x = [1.0 / n] * n
+    for _ in range(max_iter):
+        colgante = sum(x[i] for i in range(n) if salida[i] == 0)
+        base = amortiguacion * colgante / n + (1 - amortiguacion) / n
+        nuevo = [base] * n
+        for i in range(n):
+            if salida[i]:
+                parte = amortiguacion * x[i] / salida[i]
+                for k in range(offsets[i], offsets[i + 1]):
+                    nuevo[targets[k]] += parte * pesos[k]
+        if sum(abs(a - b) for a, b in zip(nuevo, x)) < n * tolerancia:
+            return nuevo
+        x = nuevo
+    raise ValueError(f"PageRank no converge en {max_iter} iteraciones.")
+
+
+def centralidad_autovector(offsets: array, targets: array, weights: array, tolerancia: float = 1e-10,
+                           max_iter: int = 1000) -> list:
+    """Centralidad de autovector (por aristas entrantes) por iteración de potencias, normalizada en norma 2.
+
+    Itera con A^T + I, que tiene los mismos autovectores y converge también en grafos bipartitos.
+    Lanza ValueError si no converge.
+    """
+    n = len(offsets) - 1
+    if n == 0:
+        return []
+    if sparse is not None:
+        transpuesta = matriz_csr(offsets, targets, weights).T.tocsr()
+        x = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            nuevo = x + transpuesta @ x
+            nuevo /= np.linalg.norm(nuevo) or 1.0
+            if np.abs(nuevo - x).sum() < n * tolerancia:
+                return nuevo.tolist()
+            x = nuevo
+        raise ValueError(f"La centralidad de autovector no converge en {max_iter} iteraciones.")
+
+    pesos = pesos_efectivos(weights)
+    x = [1.0 / n] * n
+    for _ in range(max_iter):
+        nuevo = list(x)
+        for i in range(n):
+            for k in range(offsets[i], offsets[i + 1]):
+                nuevo[targets[k]] += x[i] * pesos[k]
+        norma = sqrt(sum(valor * valor for valor in nuevo)) or 1.0
+        nuevo = [valor / norma for valor in nuevo]
+        if sum(abs(a - b) for a, b in zip(nuevo, x)) < n * tolerancia:
+            return nuevo
+        x = nuevo
+    raise ValueError(f"La centralidad de autovector no converge en {max_iter} iteraciones.")
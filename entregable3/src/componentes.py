@@ -0,0 +1,142 @@
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+
+class DisjointSet:
+    """Conjuntos disjuntos (union-find) con unión por rango y compresión de caminos.
+
+    Mantiene además el tamaño de cada conjunto y el número de conjuntos, de modo que
+    todas las consultas cuestan tiempo casi constante (inversa de Ackermann amortizada).
+    """
+
+    def __init__(self):
+        self._parent: Dict[Hashable, Hashable] = {}  # {elemento: padre}; las raíces son su propio padre
+        self._rank: Dict[Hashable, int] = {}  # Cota superior de la altura, solo para raíces
+        self._sizes: Dict[Hashable, int] = {}  # {raíz: tamaño de su conjunto}
+
+    def add(self, x: Hashable) -> bool:
+        """Añade x como conjunto unitario si no existe. Devuelve True si se ha añadido."""
+        if x in self._parent:
+            return False
+        self._parent[x] = x
+        self._rank[x] = 0
+        self._sizes[x] = 1
+        return True
+
+    def __contains__(self, x: Hashable) -> bool:
+        return x in self._parent
+
+    def __len__(self) -> int:
+        """Número de elementos."""
+        return len(self._parent)
+
+    def find(self, x: Hashable) -> Optional[Hashable]:
+        """Devuelve el representante del conjunto de x, o None si x no está."""
+        parent = self._parent
+        if x not in parent:
+            return None
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:  # Compresión de caminos
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, a: Hashable, b: Hashable) -> bool:
+        """Une los conjuntos de a y b (añadiéndolos si no existen). Devuelve True si eran distintos."""
+        self.add(a)
+        self.add(b)
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+        if self._rank[root_a] < self._rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        if self._rank[root_a] == self._rank[root_b]:
+            self._rank[root_a] += 1
+        del self._rank[root_b]
+        self._sizes[root_a] += self._sizes.pop(root_b)
+        return True
+
+    def union_all(self, pairs: Iterable[Tuple[Hashable, Hashable]]) -> int:
+        """Equivale a llamar a union con cada par en orden, sin el coste de una llamada por par.
+
+        Deja los mismos representantes que union. Devuelve el número de uniones efectivas.
+        """
+        parent, rank, sizes = self._parent, self._rank, self._sizes
+        merged = 0
+        for a, b in pairs:
+            for x in (a, b):
+                if x not in parent:
+                    parent[x] = x
+                    rank[x] = 0
+                    sizes[x] = 1
+            while parent[a] != a:  # Búsqueda con división a la mitad del camino
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            if a == b:
+                continue
+            if rank[a] < rank[b]:
+                a, b = b, a
+            parent[b] = a
+            if rank[a] == rank[b]:
+                rank[a] += 1
+            del rank[b]
+            sizes[a] += sizes.pop(b)
+            merged += 1
+        return merged
+
+    def union_many(self, x: Hashable, others: Iterable[Hashable]) -> int:
+        """Une x con cada elemento de others (añadiéndolos si no existen) y devuelve el número de uniones efectivas.
+
+        Los conjuntos quedan como con union(x, y) para cada y, pero los elementos nuevos se
+        cuelgan directamente de la raíz en bloque, así que el representante puede ser otro.
+        """
+        parent, rank, sizes = self._parent, self._rank, self._sizes
+        self.add(x)
+        root = self.find(x)
+        grupo = set(others)
+        nuevos = grupo.difference(parent)  # Recorre grupo, no parent
+        merged = 0
+        if len(nuevos) < len(grupo):
+            for y in grupo.difference(nuevos):
+                while parent[y] != y:
+                    parent[y] = parent[parent[y]]
+                    y = parent[y]
+                if y == root:
+                    continue
+                if rank[root] < rank[y]:
+                    root, y = y, root
+                parent[y] = root
+                if rank[root] == rank[y]:
+                    rank[root] += 1
+                del rank[y]
+                sizes[root] += sizes.pop(y)
+                merged += 1
+        if nuevos:
+            parent.update(dict.fromkeys(nuevos, root))
+            sizes[root] += len(nuevos)
+            if rank[root] == 0:
+                rank[root] = 1
+        return merged + len(nuevos)
+
+    def same(self, a: Hashable, b: Hashable) -> bool:
+        """Indica si a y b pertenecen al mismo conjunto."""
+        root_a = self.find(a)
+        return root_a is not None and root_a == self.find(b)
+
+    def size(self, x: Hashable) -> int:
+        """Tamaño del conjunto de x (0 si x no está)."""
+        root = self.find(x)
+        return 0 if root is None else self._sizes[root]
+
+    def sizes(self) -> Dict[Hashable, int]:
+        """Devuelve {representante: tamaño} de todos los conjuntos."""
+        return dict(self._sizes)
+
+    def count(self) -> int:
+        """Número de conjuntos."""
+        return len(self._sizes)
@@ -0,0 +1,69 @@
+from collections import Counter
+from datetime import date
+from array import array
+from typing import Dict, Hashable, Iterable, Sequence
+
+from interner import VertexInterner
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se calcula en Python puro con el mismo resultado
+    np = None
+
+# Ordinal de 1970-01-01, origen de datetime64 en NumPy
+_EPOCA = date(1970, 1, 1).toordinal()
+
+
+def fecha_limite(referencia: date, anios: int) -> date:
+    """Devuelve la última fecha de nacimiento con la que se tienen al menos 'anios' años en referencia."""
+    try:
+        return referencia.replace(year=referencia.year - anios)
+    except ValueError:  # 29 de febrero en un año no bisiesto: el último día válido es el 28
+        return referencia.replace(year=referencia.year - anios, day=28)
+
+
+def edades(ordinales: Sequence[int], referencia: date):
+    """Calcula la edad en referencia de cada fecha de nacimiento, dada como ordinal.
+
+    Con NumPy devuelve un ndarray de enteros; sin él, un array('i'). Coincide con usuarios.edad().
+    """
+    if np is not None:
+        fechas = (np.asarray(ordinales, dtype=np.int64) - _EPOCA).astype('datetime64[D]')
+        anios = fechas.astype('datetime64[Y]')
+        meses = fechas.astype('datetime64[M]')
+        mes = (meses - anios).astype(np.int64) + 1
+        dia = (fechas - meses).astype(np.int64) + 1
+        pendiente = (mes > referencia.month) | ((mes == referencia.month) & (dia > referencia.day))
+        return referencia.year - 1970 - anios.astype(np.int64) - pendiente
+    resultado = array('i')
+    hoy = (referencia.month, referencia.day)
+    for ordinal in ordinales:
+        nacimiento = date.fromordinal(ordinal)
+        resultado.append(referencia.year - nacimiento.year - ((nacimiento.month, nacimiento.day) > hoy))
+    return resultado
+
+
+def histograma(valores: Sequence[int], ancho: int = 10) -> Dict[int, int]:
+    """Cuenta los valores por tramos de 'ancho'. Devuelve {inicio del tramo: número de valores} ordenado."""
+    if np is not None:
+        tramos, cuentas = np.unique(np.asarray(valores) // ancho, return_counts=True)
+        return {int(tramo) * ancho: int(cuenta) for tramo, cuenta in zip(tramos, cuentas)}
+    cuentas = Counter(valor // ancho for valor in valores)
+    return {tramo * ancho: cuentas[tramo] for tramo in sorted(cuentas)}
+
+
+def media_por_grupo(valores: Sequence[int], grupos: Iterable[Hashable]) -> Dict[Hashable, float]:
+    """Devuelve la media de los valores de cada grupo; grupos indica el grupo de cada valor, en el mismo orden."""
+    interner = VertexInterner()
+    ids = array('i', (interner.intern(grupo) for grupo in grupos))
+    if np is not None:
+        ids = np.frombuffer(ids, dtype=np.int32)
+        sumas = np.bincount(ids, weights=np.asarray(valores, dtype=np.float64), minlength=len(interner))
+        cuentas = np.bincount(ids, minlength=len(interner))
+        return {grupo: float(sumas[i] / cuentas[i]) for i, grupo in enumerate(interner)}
+    sumas = [0] * len(interner)
+    cuentas = [0] * len(interner)
+    for i, valor in zip(ids, valores):
+        sumas[i] += valor
+        cuentas[i] += 1
+    return {grupo: sumas[i] / cuentas[i] for i, grupo in enumerate(interner)}
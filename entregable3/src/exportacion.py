@@ -0,0 +1,91 @@
+import gzip
+import json
+from contextlib import contextmanager
+from typing import IO, Iterator, Union
+from xml.sax.saxutils import escape, quoteattr
+
+# Los exportadores escriben línea a línea con writelines sobre un fichero con búfer, de modo
+# que la memoria no depende del tamaño de la red. El destino puede ser una ruta (comprimida
+# con gzip si termina en .gz o se pide con comprimir=True) o un fichero de texto ya abierto.
+
+Destino = Union[str, IO[str]]
+_BUFFER = 1 << 20
+
+
+def abrir(path: str, modo: str = 'r', comprimir: bool = False) -> IO[str]:
+    """Abre un fichero de texto UTF-8 con búfer grande; con gzip si termina en .gz o comprimir es True."""
+    if comprimir or path.endswith('.gz'):
+        return gzip.open(path, modo + 't', encoding='utf-8', newline='')
+    return open(path, modo, buffering=_BUFFER, encoding='utf-8', newline='')
+
+
+@contextmanager
+def _destino(destino: Destino, comprimir: bool) -> Iterator[IO[str]]:
+    """Devuelve el fichero de destino; solo lo cierra si lo ha abierto."""
+    if isinstance(destino, str):
+        with abrir(destino, 'w', comprimir) as f:
+            yield f
+    else:
+        yield destino
+
+
+_NO_CSV = (',', '\n', '\r')  # Caracteres que el formato sin comillas no puede representar
+
+
+def _linea_csv(*campos: str) -> str:
+    """Une los campos en una línea CSV sin comillas. Lanza ValueError si alguno no se podría volver a leer."""
+    for campo in campos:
+        if any(caracter in campo for caracter in _NO_CSV):
+            raise ValueError(f"El campo {campo!r} contiene comas o saltos de línea y no se puede exportar a CSV.")
+    return ','.join(campos) + '\n'
+
+
+def exportar_csv(red, usuarios: Destino, relaciones: Destino, comprimir: bool = False):
+    """Escribe los usuarios y las relaciones en el formato CSV sin comillas que lee Red_social.parse.
+
+    Lanza ValueError si un DNI, nombre o apellido contiene comas o saltos de línea.
+    """
+    with _destino(usuarios, comprimir) as f:
+        f.writelines(_linea_csv(u.dni, u.nombre, u.apellidos, u.fecha_nacimiento.isoformat())
+                     for u in red.vertices.values())
+    with _destino(relaciones, comprimir) as f:
+        f.writelines(f"{a['source'].dni},{a['target'].dni},{a['interacciones']},{a['dias_activa']}\n"
+                     for a in red.aristas)
+
+
+def exportar_jsonl(red, destino: Destino, comprimir: bool = False):
+    """Escribe un objeto JSON por línea: primero los usuarios (tipo 'usuario') y luego las relaciones (tipo 'relacion')."""
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    with _destino(destino, comprimir) as f:
+        f.writelines(dumps({'tipo': 'usuario', 'dni': u.dni, 'nombre': u.nombre, 'apellidos': u.apellidos,
+                            'fecha_nacimiento': u.fecha_nacimiento.isoformat()}) + '\n'
+                     for u in red.vertices.values())
+        f.writelines(dumps({'tipo': 'relacion', 'source': a['source'].dni, 'target': a['target'].dni,
+                            'interacciones': a['interacciones'], 'dias_activa': a['dias_activa']}) + '\n'
+                     for a in red.aristas)
+
+
+_CABECERA_GRAPHML = """<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <key id="nombre" for="node" attr.name="nombre" attr.type="string"/>
+  <key id="apellidos" for="node" attr.name="apellidos" attr.type="string"/>
+  <key id="fecha_nacimiento" for="node" attr.name="fecha_nacimiento" attr.type="string"/>
+  <key id="interacciones" for="edge" attr.name="interacciones" attr.type="long"/>
+  <key id="dias_activa" for="edge" attr.name="dias_activa" attr.type="long"/>
+  <graph id="red_social" edgedefault="{}">
+"""
+
+
+def exportar_graphml(red, destino: Destino, comprimir: bool = False):
+    """Escribe la red en GraphML (nodos por DNI con sus datos y aristas con interacciones y días activa)."""
+    with _destino(destino, comprimir) as f:
+        f.write(_CABECERA_GRAPHML.format('directed' if red.dirigido else 'undirected'))
+        f.writelines(f'    <node id={quoteattr(u.dni)}><data key="nombre">{escape(u.nombre)}</data>'
+                     f'<data key="apellidos">{escape(u.apellidos)}</data>'
+                     f'<data key="fecha_nacimiento">{u.fecha_nacimiento.isoformat()}</data></node>\n'
+                     for u in red.vertices.values())
+        f.writelines(f'    <edge source={quoteattr(a["source"].dni)} target={quoteattr(a["target"].dni)}>'
+                     f'<data key="interacciones">{a["interacciones"]}</data>'
+                     f'<data key="dias_activa">{a["dias_activa"]}</data></edge>\n'
+                     for a in red.aristas)
+        f.write("  </graph>\n</graphml>\n")
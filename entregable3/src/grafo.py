@@ -1,24 +1,38 @@
-class Graph:
+import gc
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import islice, repeat
+from math import isnan
+
+import centralidad
+from componentes import DisjointSet
+from interner import VertexInterner
+from instrumentacion import Estadisticas, desinstrumentar, estimar_bytes, instrumentar
+from snapshot import KIND_GRAFO, open_snapshot, pack_strings, string_at, write_snapshot
+from versiones import Versionado
+
+_NAN = float('nan')
+
+
+class Graph(Versionado):
+    """Grafo con pesos, dirigido o no, sobre vértices de cualquier tipo hashable.
+
+    Los vértices se numeran con enteros densos (interner) y las adyacencias, los pesos y los
+    componentes trabajan solo con esos enteros; las claves originales se traducen en la
+    interfaz pública. Los recorridos usan directamente los enteros (successor_ids).
+    """
+
     def __init__(self, directed=False):
         """Inicializa el grafo. Si 'directed' es True, el grafo será dirigido."""
         self.directed = directed  # Tipo de grafo (dirigido o no dirigido)
-        self.vertices = set()  # Conjunto de vértices
-        self.edges = {}  # Diccionario de aristas {origen: {destino: peso}}
-        self.predecessors = {}  # Diccionario de predecesores {vértice: set de predecesores}
-        self.successors = {}  # Diccionario de sucesores {vértice: set de sucesores}
-        self._weight = {}  # Diccionario de pesos de las aristas {(origen, destino): peso}
-
-    def __add_neighbors(self, vertex, neighbor):
-        """Añade un vecino al conjunto de vecinos de un vértice."""
-        if vertex not in self.successors:
-            self.successors[vertex] = set()
-        self.successors[vertex].add(neighbor)
-
-    def __add_predecessors(self, vertex, predecessor):
-        """Añade un predecesor al conjunto de predecesores de un vértice (para grafo dirigido)."""
-        if vertex not in self.predecessors:
-            self.predecessors[vertex] = set()
-        self.predecessors[vertex].add(predecessor)
+        self.interner = VertexInterner()  # Numeración de los vértices: {vértice: entero} y su inversa
+        self._out = {}  # Aristas salientes con su peso {i: {j: peso}} (en no dirigido, en los dos sentidos)
+        self._in = {} if directed else self._out  # Aristas entrantes {j: {i: peso}} (las mismas si no es dirigido)
+        self._components = DisjointSet()  # Componentes conexas (débilmente, si es dirigido), sin _pendientes
+        self._pendientes = []  # Grupos (i, {j: peso}) de inserciones en bloque aún no unidos en _components
+        self._listeners = []  # Funciones listener(source, target, weight) avisadas de cada arista nueva
+        self._stats = None  # Estadisticas mientras la instrumentación está activa
 
     def add_edge(self, source, target, weight=None):
         """Añade una arista entre dos vértices con un peso. Asegura que no haya bucles ni duplicados."""
@@ -26,39 +40,245 @@ class Graph:
             raise ValueError("No se permiten bucles (vértice origen igual al de destino).")
 
         # Asegurarse de que los vértices existan en el grafo
-        if source not in self.vertices:
+        ids = self.interner._ids
+        if source not in ids:
             self.add_vertex(source)
-        if target not in self.vertices:
+        if target not in ids:
             self.add_vertex(target)
+        i, j = ids[source], ids[target]
 
         # No agregar arista duplicada
-        if target in self.edges.get(source, {}):
+        if j in self._out.get(i, ()):
             return
+        if self._propios is not None:  # Hay una versión publicada: copia en escritura
+            self._preparar_escritura((('_out', i), ('_in' if self.directed else '_out', j)))
 
-        # Añadir la arista
-        if source not in self.edges:
-            self.edges[source] = {}
-        self.edges[source][target] = weight
-        self._weight[(source, target)] = weight
-
-        # Actualizar los vecinos y predecesores
-        self.__add_neighbors(source, target)
-        if self.directed:
-            self.__add_predecessors(target, source)
+        # Añadir la arista en los dos sentidos de la adyacencia y unir los componentes
+        fila = self._out.get(i)
+        if fila is None:
+            self._out[i] = {j: weight}
         else:
-            self.__add_neighbors(target, source)
+            fila[j] = weight
+        fila = self._in.get(j)
+        if fila is None:
+            self._in[j] = {i: weight}
+        else:
+            fila[i] = weight
+        self._components.union(i, j)
+        for listener in self._listeners:
+            listener(source, target, weight)
+
+    def add_edges_from(self, edges):
+        """Añade en bloque aristas (source, target) o (source, target, weight); equivale a add_edge con cada una.
+
+        Devuelve el número de aristas nuevas (ver add_edges_from_arrays).
+        """
+        return self.__add_batch(edge if len(edge) > 2 else (edge[0], edge[1], None) for edge in edges)
+
+    def add_edges_from_arrays(self, sources, targets, weights=None):
+        """Añade en bloque las aristas (sources[i], targets[i], weights[i]); weights None equivale a sin peso.
+
+        El resultado es el de llamar a add_edge con cada arista en orden, pero se valida todo el
+        lote antes de insertar (un bucle lanza ValueError sin modificar el grafo) y los listeners
+        se avisan al terminar, en orden de inserción. Devuelve el número de aristas nuevas.
+        """
+        if len(sources) != len(targets) or (weights is not None and len(weights) != len(sources)):
+            raise ValueError("sources, targets y weights deben tener la misma longitud.")
+        return self.__add_batch(zip(sources, targets, repeat(None) if weights is None else weights))
+
+    def __add_batch(self, batch):
+        """Inserta un lote de aristas (source, target, weight) agrupadas por origen.
+
+        Un primer bucle agrupa el lote en {origen: {destino: peso}} (gana la primera aparición,
+        como en add_edge) sin tocar el grafo; después cada origen se traduce a enteros y se
+        inserta con una operación update por fila. Los pares distintos se unen en los
+        componentes en una sola pasada, en la siguiente consulta de componentes. El recolector
+        de ciclos se pausa durante la carga.
+        """
+        directed = self.directed
+        orden = [] if self._listeners else None  # Aristas distintas en orden de llegada, para los listeners
+        filas = {}
+        get = filas.get
+        pausado = gc.isenabled()
+        gc.disable()
+        try:
+            if directed and orden is None:
+                for source, target, weight in batch:
+                    fila = get(source)
+                    if fila is None:
+                        filas[source] = {target: weight}
+                    elif target not in fila:  # Las repetidas en el lote se descartan
+                        fila[target] = weight
+            else:
+                for source, target, weight in batch:
+                    fila = get(source)
+                    if fila is None:
+                        fila = filas[source] = {}
+                    elif target in fila:
+                        continue
+                    if not directed and source in get(target, ()):  # La misma arista al revés
+                        continue
+                    fila[target] = weight
+                    if orden is not None:
+                        orden.append((source, target))
+            if any(source in fila for source, fila in filas.items()):
+                raise ValueError("No se permiten bucles (vértice origen igual al de destino).")
+            return self.__insertar_filas(filas, orden)
+        finally:
+            if pausado:
+                gc.enable()
+
+    def __insertar_filas(self, filas, orden):
+        """Inserta {origen: {destino: peso}} en el grafo y avisa a los listeners; devuelve las aristas nuevas."""
+        interner = self.interner
+        ids = interner._ids
+        conocidos = ids.keys()
+        traducidas = []  # (i, {j: peso}) de cada origen
+        for source, fila in filas.items():
+            i = interner.intern(source)
+            if not conocidos >= fila.keys():  # Solo se numeran uno a uno si hay destinos nuevos
+                interner.intern_many(fila)
+            traducidas.append((i, dict(zip(map(ids.__getitem__, fila), fila.values()))))
+
+        directed = self.directed
+        salida, entrada = self._out, self._in
+        if self._propios is not None:
+            inversa = '_in' if directed else '_out'
+            cambios = set()
+            for i, fila in traducidas:
+                cambios.add(('_out', i))
+                cambios.update(zip(repeat(inversa), fila))
+            self._preparar_escritura(cambios)
+
+        entrada_get = entrada.get
+        nuevas = {}
+        for i, fila in traducidas:
+            actual = salida.get(i)
+            if actual is None:
+                salida[i] = fila if directed else fila.copy()  # En no dirigido entrada también escribe en salida
+            else:
+                if not actual.keys().isdisjoint(fila):  # Aristas que ya estaban en el grafo
+                    fila = {j: weight for j, weight in fila.items() if j not in actual}
+                    if not fila:
+                        continue
+                actual.update(fila)
+            nuevas[i] = fila
+            for j, weight in fila.items():
+                entrantes = entrada_get(j)
+                if entrantes is None:
+                    entrada[j] = {i: weight}
+                else:
+                    entrantes[i] = weight
+
+        self._pendientes.extend(nuevas.items())  # Se unen en la siguiente consulta de componentes
+
+        if orden is None:
+            return sum(map(len, nuevas.values()))
+        added = 0
+        for source, target in orden:
+            fila = nuevas.get(ids[source])
+            if fila is not None and ids[target] in fila:
+                added += 1
+                for listener in self._listeners:
+                    listener(source, target, fila[ids[target]])
+        return added
+
+    # Copia en escritura (ver Versionado): los vértices de una versión son los enteros
+    # menores que _num_vertices al publicarla, y los componentes no se comparten con ellas
+    _COMPARTIDOS = ('_out', '_in')
+
+    def _crear_version(self, numero):
+        """Crea la versión publicada número 'numero' (ver publish)."""
+        return GraphSnapshot(self, numero)
+
+    @property
+    def _num_vertices(self):
+        """Número de vértices: los enteros 0.._num_vertices-1 del interner."""
+        return len(self.interner)
+
+    _METODOS_CONTADOS = ('add_vertex', 'add_edge', 'add_edges_from', 'add_edges_from_arrays', 'contains_edge',
+                         'edge_weight', 'successors', 'predecessors', 'get_neighbors')
+
+    def enable_stats(self, hook=None):
+        """Activa la instrumentación: cuenta las llamadas a los métodos de consulta y modificación.
+
+        hook(nombre, valor), si se indica, recibe cada dato registrado. Desactivada no tiene coste.
+        """
+        self.disable_stats()
+        self._stats = Estadisticas(hook)
+        instrumentar(self, self._stats, contados=self._METODOS_CONTADOS)
+        return self._stats
+
+    def disable_stats(self):
+        """Desactiva la instrumentación y descarta los datos registrados."""
+        desinstrumentar(self, self._METODOS_CONTADOS)
+        self._stats = None
+
+    def stats(self):
+        """Devuelve los datos de instrumentación y una estimación del tamaño del grafo.
+
+        El tamaño se calcula al llamar (recorre las estructuras), no en cada operación.
+        """
+        datos = {} if self._stats is None else self._stats.as_dict()
+        num_aristas = sum(map(len, self._out.values()))
+        adyacencias = (self._out, self._in) if self.directed else (self._out,)
+        if not self.directed:
+            num_aristas //= 2  # Cada arista está en las filas de sus dos extremos
+        num_vertices = self._num_vertices
+        bytes_vertices = estimar_bytes(self.interner._ids, self.interner._keys)
+        bytes_aristas = estimar_bytes(*adyacencias)
+        datos.update({
+            'vertices': num_vertices,
+            'aristas': num_aristas,
+            'bytes_por_vertice': bytes_vertices / num_vertices if num_vertices else 0.0,
+            'bytes_por_arista': bytes_aristas / num_aristas if num_aristas else 0.0,
+        })
+        return datos
+
+    def subscribe(self, listener):
+        """Registra una función listener(source, target, weight) que se llama tras añadir cada arista nueva."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Da de baja una función registrada con subscribe."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     def edge_weight(self, source, target):
         """Devuelve el peso de la arista entre los vértices source y target."""
-        return self._weight.get((source, target), None)
+        fila = self._out.get(self.interner.id_of(source))
+        return None if fila is None else fila.get(self.interner.id_of(target))
 
     def add_vertex(self, vertex):
         """Añade un nuevo vértice al grafo si no existe."""
-        if vertex in self.vertices:
+        if vertex in self.interner:
             return False
-        self.vertices.add(vertex)
+        if self._propios is not None:
+            self._preparar_escritura()  # Las versiones no lo ven: su entero es nuevo
+        self._components.add(self.interner.intern(vertex))
         return True
 
+    @property
+    def vertices(self):
+        """Vista de conjunto de los vértices del grafo, sin copia."""
+        return self.vertex_set()
+
+    @property
+    def edges(self):
+        """Diccionario de aristas {origen: {destino: peso}} con los vértices originales.
+
+        Se construye al consultarlo. En un grafo no dirigido cada arista aparece una sola vez,
+        desde el extremo añadido antes al grafo.
+        """
+        keys = self.interner._keys
+        edges = {}
+        for i, fila in self._out.items():
+            row = {keys[j]: weight for j, weight in fila.items() if self.directed or i < j}
+            if row:
+                edges[keys[i]] = row
+        return edges
+
     def edge_source(self, source, target):
         """Devuelve el vértice de origen de una arista."""
         return source
@@ -69,36 +289,397 @@ class Graph:
 
     def vertex_set(self):
         """Devuelve el conjunto de todos los vértices del grafo."""
-        return self.vertices
+        return self.interner.keys()
+
+    def vertex_id(self, vertex):
+        """Devuelve el identificador entero denso de un vértice."""
+        return self.interner._ids[vertex]
+
+    def vertex_of(self, i):
+        """Devuelve el vértice correspondiente a un identificador entero."""
+        return self.interner._keys[i]
+
+    def successor_ids(self, i):
+        """Devuelve, sin copia, {identificador: peso} de los sucesores del vértice i."""
+        return self._out.get(i, {})
+
+    def predecessor_ids(self, i):
+        """Devuelve, sin copia, {identificador: peso} de los predecesores del vértice i."""
+        return self._in.get(i, {})
+
+    def successor_weights(self, i):
+        """Devuelve los pares (identificador, peso) de las aristas que salen del vértice i."""
+        return self._out.get(i, {}).items()
 
     def contains_edge(self, source, target):
         """Verifica si existe una arista entre los vértices source y target."""
-        return target in self.edges.get(source, {})
+        return self.interner.id_of(target) in self._out.get(self.interner.id_of(source), ())
+
+    def _claves(self, adyacencia, vertex):
+        """Traduce a vértices originales la fila de vertex en una adyacencia {i: {j: peso}}."""
+        keys = self.interner._keys
+        return {keys[j] for j in adyacencia.get(self.interner.id_of(vertex), ())}
 
     def predecessors(self, vertex):
         """Devuelve los predecesores de un vértice (vecinos en grafo no dirigido)."""
-        if self.directed:
-            return self.predecessors.get(vertex, set())
-        return self.successors.get(vertex, set())
+        return self._claves(self._in, vertex)
 
     def successors(self, vertex, traversal_type="FORWARD"):
         """Devuelve los sucesores de un vértice dependiendo del tipo de recorrido."""
         if traversal_type == "FORWARD":
-            return self.successors.get(vertex, set())
+            return self._claves(self._out, vertex)
         elif traversal_type == "BACK":
-            return self.predecessors.get(vertex, set())
+            return self.predecessors(vertex)
         else:
             raise ValueError("Tipo de recorrido no válido. Use 'FORWARD' o 'BACK'.")
 
+    def get_neighbors(self, vertex):
+        """Devuelve los vecinos de un vértice (sus sucesores), como recorridos.Graph."""
+        return self._claves(self._out, vertex)
+
+    def __componentes(self):
+        """Devuelve los componentes tras unir, en una sola pasada, los grupos pendientes de las inserciones en bloque."""
+        if self._pendientes:
+            union_many = self._components.union_many
+            for i, fila in self._pendientes:
+                union_many(i, fila)
+            self._pendientes = []
+        return self._components
+
+    def same_component(self, a, b):
+        """Indica si dos vértices están en la misma componente conexa (débil si el grafo es dirigido)."""
+        return self.__componentes().same(self.interner.id_of(a), self.interner.id_of(b))
+
+    def component_of(self, vertex):
+        """Devuelve el representante de la componente de un vértice, o None si no existe."""
+        root = self.__componentes().find(self.interner.id_of(vertex))
+        return None if root is None else self.interner._keys[root]
+
+    def component_sizes(self):
+        """Devuelve {representante: número de vértices} de cada componente."""
+        keys = self.interner._keys
+        return {keys[root]: size for root, size in self.__componentes().sizes().items()}
+
+    def component_count(self):
+        """Devuelve el número de componentes conexas."""
+        return self.__componentes().count()
+
     def inverse_graph(self):
-        """Devuelve el grafo inverso si es dirigido. Si no es dirigido, retorna el grafo original."""
+        """Devuelve el grafo inverso si es dirigido. Si no es dirigido, retorna el grafo original.
+
+        El inverso es una vista (ReversedGraph) que se construye en O(1) sin copiar aristas;
+        use materialize() sobre ella para obtener un Graph independiente.
+        """
         if not self.directed:
             return self
-        
+        return ReversedGraph(self)
+
+    def freeze(self):
+        """Devuelve una instantánea inmutable del grafo en formato CSR (ver FrozenGraph)."""
+        return FrozenGraph.of(self)
+
+    def to_sparse(self):
+        """Devuelve (matriz, interner): la adyacencia como scipy.sparse.csr_matrix y la numeración de vértices.
+
+        Las aristas sin peso valen 1. Requiere SciPy.
+        """
+        n = self._num_vertices
+        offsets, targets, weights = FrozenGraph._build_csr(n, self._out)
+        return centralidad.matriz_csr(offsets, targets, weights), VertexInterner(islice(self.interner._keys, n))
+
+    def save_snapshot(self, path):
+        """Guarda el grafo en una instantánea binaria (ver FrozenGraph.save_snapshot)."""
+        self.freeze().save_snapshot(path)
+
+    @staticmethod
+    def load_snapshot(path):
+        """Carga una instantánea binaria como FrozenGraph proyectado en memoria."""
+        return FrozenGraph.load_snapshot(path)
+
+
+class GraphSnapshot:
+    """Versión publicada de un Graph (ver Graph.publish): de solo lectura y consistente.
+
+    Ve las adyacencias del grafo a través de vistas (ver VistaVersion), sin copiarlas, y
+    comparte su interner: sus vértices son los que ya estaban numerados al publicarla. Se
+    puede recorrer desde otros hilos sin bloqueos mientras el grafo sigue cambiando. Ofrece
+    las consultas de Graph que usan los recorridos; los componentes no forman parte de ella.
+    """
+
+    def __init__(self, graph, version):
+        self.directed = graph.directed
+        self.version = version  # Número de versión, creciente
+        self.interner = graph.interner
+        self._num_vertices = graph._num_vertices
+        self._out = graph._vista('_out')
+        self._in = graph._vista('_in') if graph.directed else self._out
+        self._vertices = None  # Vista de los vértices, construida en la primera consulta
+
+    def vertex_set(self):
+        """Devuelve el conjunto de los vértices de la versión (se construye una vez, en O(V))."""
+        if self._vertices is None:
+            self._vertices = dict.fromkeys(islice(self.interner._keys, self._num_vertices)).keys()
+        return self._vertices
+
+    vertices = property(vertex_set)
+    edges = Graph.edges
+    edge_weight = Graph.edge_weight
+    vertex_id = Graph.vertex_id
+    vertex_of = Graph.vertex_of
+    successor_ids = Graph.successor_ids
+    predecessor_ids = Graph.predecessor_ids
+    successor_weights = Graph.successor_weights
+    contains_edge = Graph.contains_edge
+    _claves = Graph._claves
+    predecessors = Graph.predecessors
+    successors = Graph.successors
+    get_neighbors = Graph.get_neighbors
+    freeze = Graph.freeze
+    to_sparse = Graph.to_sparse
+
+
+class ReversedGraph:
+    """Vista del grafo inverso de un Graph dirigido, sin copias.
+
+    Intercambia los papeles de las adyacencias de salida y de entrada del grafo original, por
+    lo que refleja al momento cualquier cambio en él.
+    """
+
+    directed = True
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    @property
+    def interner(self):
+        return self._graph.interner
+
+    @property
+    def _num_vertices(self):
+        return self._graph._num_vertices
+
+    @property
+    def _out(self):
+        return self._graph._in
+
+    @property
+    def _in(self):
+        return self._graph._out
+
+    vertices = Graph.vertices
+    edges = Graph.edges
+    edge_weight = Graph.edge_weight
+    vertex_set = Graph.vertex_set
+    vertex_id = Graph.vertex_id
+    vertex_of = Graph.vertex_of
+    successor_ids = Graph.successor_ids
+    predecessor_ids = Graph.predecessor_ids
+    successor_weights = Graph.successor_weights
+    contains_edge = Graph.contains_edge
+    _claves = Graph._claves
+    predecessors = Graph.predecessors
+    successors = Graph.successors
+    get_neighbors = Graph.get_neighbors
+
+    def same_component(self, a, b):
+        """Indica si dos vértices están en la misma componente (débil: no depende del sentido)."""
+        return self._graph.same_component(a, b)
+
+    def component_of(self, vertex):
+        """Devuelve el representante de la componente de un vértice, o None si no existe."""
+        return self._graph.component_of(vertex)
+
+    def component_sizes(self):
+        """Devuelve {representante: número de vértices} de cada componente (las del grafo original)."""
+        return self._graph.component_sizes()
+
+    def component_count(self):
+        """Devuelve el número de componentes conexas (las del grafo original)."""
+        return self._graph.component_count()
+
+    def inverse_graph(self):
+        """El inverso de la vista es el grafo original."""
+        return self._graph
+
+    def freeze(self):
+        """Devuelve una instantánea inmutable del grafo inverso en formato CSR."""
+        return FrozenGraph.of(self)
+
+    def materialize(self):
+        """Construye un Graph independiente con las aristas invertidas."""
         inverted_graph = Graph(directed=True)
-        for source in self.edges:
-            for target in self.edges[source]:
-                inverted_graph.add_edge(target, source, self.edges[source][target])
-        
+        keys = self.interner._keys
+        for vertex in keys:
+            inverted_graph.add_vertex(vertex)
+        for i, fila in self._out.items():
+            for j, weight in fila.items():
+                inverted_graph.add_edge(keys[i], keys[j], weight)
         return inverted_graph
-    print(grafo.py)
\ No newline at end of file
+
+
+class FrozenGraph:
+    """Instantánea inmutable de un Graph en formato CSR (compressed sparse row).
+
+    Los vértices se numeran con identificadores enteros densos (un VertexInterner) y las
+    adyacencias se guardan en buffers de 'array': offsets, destinos (ordenados por fila) y
+    pesos, tanto hacia delante como en sentido inverso. Los pesos deben ser numéricos o None.
+    Los recorridos trabajan directamente con los identificadores (successor_ids) y solo
+    traducen a vértices al rellenar su árbol.
+    """
+
+    def __init__(self, directed, vertices, offsets, targets, weights,
+                 rev_offsets=None, rev_targets=None, rev_weights=None):
+        """Inicializa la instantánea a partir de los buffers CSR ya construidos.
+
+        vertices es un VertexInterner o la secuencia de vértices en orden de identificador.
+        """
+        self.directed = directed
+        self.interner = vertices if isinstance(vertices, VertexInterner) else VertexInterner(vertices)
+        self._vertices = self.interner._keys  # Lista de vértices indexada por identificador
+        self._ids = self.interner._ids  # {vértice: identificador}
+        self._offsets = offsets  # array('q') con V + 1 posiciones
+        self._targets = targets  # array('i') con los destinos de cada fila, ordenados
+        self._weights = weights  # array('d') con los pesos (NaN representa None)
+        # En un grafo no dirigido el CSR inverso es el mismo que el directo
+        self._rev_offsets = offsets if rev_offsets is None else rev_offsets
+        self._rev_targets = targets if rev_targets is None else rev_targets
+        self._rev_weights = weights if rev_weights is None else rev_weights
+
+    @staticmethod
+    def _build_csr(n, adjacency):
+        """Construye los buffers (offsets, destinos, pesos) de un CSR a partir de {i: {j: peso}}, con i < n."""
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+        get = adjacency.get
+        for i in range(n):
+            fila = get(i)
+            if fila:
+                row = sorted(fila)
+                targets.extend(row)
+                weights.extend(_NAN if fila[j] is None else fila[j] for j in row)
+            offsets.append(len(targets))
+        return offsets, targets, weights
+
+    @classmethod
+    def of(cls, graph):
+        """Método de factoría que congela un Graph (o una versión o vista suya) en una nueva instantánea CSR.
+
+        Conserva la numeración de vértices del grafo, así que las filas se copian sin traducir.
+        """
+        n = graph._num_vertices
+        interner = VertexInterner(islice(graph.interner._keys, n))
+        offsets, targets, weights = cls._build_csr(n, graph._out)
+        if not graph.directed:
+            return cls(False, interner, offsets, targets, weights)
+        rev_offsets, rev_targets, rev_weights = cls._build_csr(n, graph._in)
+        return cls(True, interner, offsets, targets, weights, rev_offsets, rev_targets, rev_weights)
+
+    def _row(self, offsets, targets, vertex):
+        """Devuelve los límites [lo, hi) de la fila del vértice, o (0, 0) si no existe."""
+        i = self._ids.get(vertex)
+        if i is None:
+            return 0, 0
+        return offsets[i], offsets[i + 1]
+
+    def vertex_set(self):
+        """Devuelve el conjunto de todos los vértices de la instantánea."""
+        return self._ids.keys()
+
+    def vertex_id(self, vertex):
+        """Devuelve el identificador entero denso de un vértice."""
+        return self._ids[vertex]
+
+    def vertex_of(self, i):
+        """Devuelve el vértice correspondiente a un identificador entero."""
+        return self._vertices[i]
+
+    def successor_ids(self, i):
+        """Devuelve una vista sin copia de los identificadores de los sucesores del vértice i."""
+        return memoryview(self._targets)[self._offsets[i]:self._offsets[i + 1]]
+
+    def predecessor_ids(self, i):
+        """Devuelve una vista sin copia de los identificadores de los predecesores del vértice i."""
+        return memoryview(self._rev_targets)[self._rev_offsets[i]:self._rev_offsets[i + 1]]
+
+    def successor_weights(self, i):
+        """Devuelve los pares (identificador, peso) de las aristas que salen del vértice i."""
+        lo, hi = self._offsets[i], self._offsets[i + 1]
+        return [(j, None if isnan(weight) else weight) for j, weight in zip(self._targets[lo:hi], self._weights[lo:hi])]
+
+    def contains_edge(self, source, target):
+        """Verifica si existe una arista entre los vértices source y target."""
+        return self._find(source, target) is not None
+
+    def _find(self, source, target):
+        """Devuelve la posición de la arista (source, target) en el CSR directo, o None."""
+        j = self._ids.get(target)
+        if j is None:
+            return None
+        lo, hi = self._row(self._offsets, self._targets, source)
+        k = bisect_left(self._targets, j, lo, hi)
+        if k < hi and self._targets[k] == j:
+            return k
+        return None
+
+    def edge_weight(self, source, target):
+        """Devuelve el peso de la arista entre los vértices source y target."""
+        k = self._find(source, target)
+        if k is None:
+            return None
+        weight = self._weights[k]
+        return None if isnan(weight) else weight
+
+    def predecessors(self, vertex):
+        """Devuelve los predecesores de un vértice (vecinos en grafo no dirigido)."""
+        lo, hi = self._row(self._rev_offsets, self._rev_targets, vertex)
+        return {self._vertices[j] for j in self._rev_targets[lo:hi]}
+
+    def successors(self, vertex, traversal_type="FORWARD"):
+        """Devuelve los sucesores de un vértice dependiendo del tipo de recorrido."""
+        if traversal_type == "FORWARD":
+            lo, hi = self._row(self._offsets, self._targets, vertex)
+            return {self._vertices[j] for j in self._targets[lo:hi]}
+        elif traversal_type == "BACK":
+            return self.predecessors(vertex)
+        else:
+            raise ValueError("Tipo de recorrido no válido. Use 'FORWARD' o 'BACK'.")
+
+    def get_neighbors(self, vertex):
+        """Devuelve los vecinos de un vértice (sus sucesores), como recorridos.Graph."""
+        return self.successors(vertex)
+
+    def freeze(self):
+        """Una instantánea ya es inmutable: se devuelve a sí misma."""
+        return self
+
+    def to_sparse(self):
+        """Devuelve (matriz, interner) con la adyacencia como scipy.sparse.csr_matrix, sin recorrer diccionarios."""
+        return centralidad.matriz_csr(self._offsets, self._targets, self._weights), self.interner
+
+    def save_snapshot(self, path):
+        """Guarda los buffers CSR en un fichero binario versionado. Los vértices deben ser str o int."""
+        if all(isinstance(vertex, int) for vertex in self._vertices):
+            vertex_kind = 1
+            vertex_sections = [array('q', self._vertices), array('B')]
+        elif all(isinstance(vertex, str) for vertex in self._vertices):
+            vertex_kind = 0
+            vertex_sections = list(pack_strings(self._vertices))
+        else:
+            raise ValueError("Solo se pueden guardar grafos cuyos vértices sean todos str o todos int.")
+        sections = vertex_sections + [self._offsets, self._targets, self._weights]
+        if self.directed:
+            sections += [self._rev_offsets, self._rev_targets, self._rev_weights]
+        write_snapshot(path, KIND_GRAFO, (int(self.directed), len(self._vertices), vertex_kind), sections)
+
+    @classmethod
+    def load_snapshot(cls, path):
+        """Carga una instantánea con mmap: los buffers CSR se leen del fichero sin copiarlos."""
+        mapped, (directed, n, vertex_kind), sections = open_snapshot(path, KIND_GRAFO)
+        if vertex_kind == 1:
+            vertices = sections[0].tolist()
+        else:
+            vertices = [string_at(sections[0], sections[1], i) for i in range(n)]
+        frozen = cls(bool(directed), vertices, *sections[2:])
+        frozen._mmap = mapped  # Mantiene viva la proyección mientras exista la instantánea
+        return frozen
\ No newline at end of file
@@ -0,0 +1,184 @@
+import asyncio
+import time
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple, Union
+
+from redsocial import EstadisticasCarga, Red_social, Usuario
+
+# Un evento es un Usuario nuevo, una relación (dni origen, dni destino, interacciones, días)
+# o una línea de texto: "U,dni,nombre,apellidos,AAAA-MM-DD" o "R,dni,dni,interacciones,días"
+Evento = Union[Usuario, Tuple[str, str, int, int], str]
+_FIN = object()  # Marca de fin de la cola interna
+
+
+def parse_evento(linea: str) -> Union[Usuario, Tuple[str, str, int, int]]:
+    """Convierte una línea de texto en un evento de usuario o de relación. Lanza ValueError si no es válida."""
+    tipo, _, resto = linea.strip().partition(',')
+    if tipo == 'U':
+        return Usuario.parse(resto)
+    if tipo == 'R':
+        dni_origen, dni_destino, interacciones, dias_activa = resto.split(',')
+        return dni_origen, dni_destino, int(interacciones), int(dias_activa)
+    raise ValueError(f"Tipo de evento no válido: {tipo!r}. Use 'U' o 'R'.")
+
+
+class EstadisticasIngesta(EstadisticasCarga):
+    """Métricas de una ingesta en streaming: las de una carga más el retraso y los eventos pendientes."""
+
+    def __init__(self):
+        super().__init__()
+        self.recibidos = 0
+        self.eventos_rechazados = 0  # Líneas que no son un evento válido
+        self.lotes = 0
+        self.retraso = 0.0  # Segundos que esperó en cola el evento más antiguo del último lote
+        self.retraso_maximo = 0.0
+
+    @property
+    def procesados(self) -> int:
+        """Eventos ya aplicados a la red o rechazados."""
+        return (self.usuarios + self.relaciones + self.usuarios_rechazados + self.relaciones_rechazadas
+                + self.eventos_rechazados)
+
+    @property
+    def pendientes(self) -> int:
+        """Eventos recibidos que aún no se han aplicado (retraso medido en eventos)."""
+        return self.recibidos - self.procesados
+
+    @property
+    def filas_por_segundo(self) -> float:
+        """Eventos procesados por segundo desde el inicio de la ingesta."""
+        return self.procesados / self.segundos if self.segundos > 0 else 0.0
+
+    def __str__(self):
+        """Representación en cadena de las métricas de la ingesta."""
+        return (f"{super().__str__()} - {self.lotes} lotes, {self.pendientes} pendientes, "
+                f"retraso {self.retraso * 1000:.1f} ms (máx. {self.retraso_maximo * 1000:.1f} ms)")
+
+
+class Ingesta:
+    """Aplica a una Red_social un flujo asíncrono de eventos en micro-lotes.
+
+    Los eventos pasan por una cola acotada a 'capacidad': si la red no da abasto, el lector
+    espera (contrapresión) en lugar de acumular memoria. Cada lote aplica como mucho
+    'max_lote' eventos en orden; las métricas se pueden consultar en estadisticas durante
+    la ingesta.
+    """
+
+    def __init__(self, red: Red_social, max_lote: int = 1024, capacidad: int = 8192):
+        self.red = red
+        self.max_lote = max_lote
+        self.capacidad = capacidad
+        self.estadisticas = EstadisticasIngesta()
+
+    async def consumir(self, eventos: AsyncIterable[Evento]) -> EstadisticasIngesta:
+        """Consume los eventos hasta que se agotan y los aplica a la red. Devuelve las métricas."""
+        estadisticas = self.estadisticas
+        cola: asyncio.Queue = asyncio.Queue(self.capacidad)
+        inicio = time.perf_counter() - estadisticas.segundos  # Acumula si se consumen varios flujos
+        aplicador = asyncio.create_task(self._aplicar(cola, inicio))
+        try:
+            async for evento in eventos:
+                estadisticas.recibidos += 1
+                if isinstance(evento, str):
+                    try:
+                        evento = parse_evento(evento)
+                    except ValueError:
+                        estadisticas.eventos_rechazados += 1
+                        continue
+                if not await self._encolar(cola, (time.perf_counter(), evento), aplicador):
+                    break
+            if not aplicador.done():
+                await self._encolar(cola, _FIN, aplicador)
+            await aplicador  # Propaga la excepción si el aplicador ha fallado
+        finally:
+            aplicador.cancel()
+        return estadisticas
+
+    @staticmethod
+    async def _encolar(cola: asyncio.Queue, elemento, aplicador: asyncio.Task) -> bool:
+        """Encola esperando si la cola está llena. Devuelve False si el aplicador ha terminado antes."""
+        if not cola.full():
+            cola.put_nowait(elemento)
+            return True
+        espera = asyncio.ensure_future(cola.put(elemento))
+        await asyncio.wait((espera, aplicador), return_when=asyncio.FIRST_COMPLETED)
+        if espera.done():
+            return True
+        espera.cancel()
+        return False
+
+    async def _aplicar(self, cola: asyncio.Queue, inicio: float):
+        """Saca de la cola lo disponible (hasta max_lote eventos) y lo aplica como un lote."""
+        while True:
+            elemento = await cola.get()
+            lote = []
+            while elemento is not _FIN:
+                lote.append(elemento)
+                if len(lote) >= self.max_lote or cola.empty():
+                    break
+                elemento = cola.get_nowait()
+            if lote:
+                self._aplicar_lote(lote, inicio)
+            if elemento is _FIN:
+                return
+
+    def _aplicar_lote(self, lote: List[Tuple[float, Evento]], inicio: float):
+        """Aplica un lote en orden; las relaciones consecutivas se insertan juntas con _add_edges_batch."""
+        estadisticas = self.estadisticas
+        filas = []
+        for _, evento in lote:
+            if isinstance(evento, Usuario):
+                self._insertar_relaciones(filas)
+                filas = []
+                if self.red.add_vertex(evento):
+                    estadisticas.usuarios += 1
+                else:
+                    estadisticas.usuarios_rechazados += 1
+            else:
+                filas.append(evento)
+        self._insertar_relaciones(filas)
+        ahora = time.perf_counter()
+        estadisticas.lotes += 1
+        estadisticas.retraso = ahora - lote[0][0]
+        estadisticas.retraso_maximo = max(estadisticas.retraso_maximo, estadisticas.retraso)
+        estadisticas.segundos = ahora - inicio
+
+    def _insertar_relaciones(self, filas: List[Tuple[str, str, int, int]]):
+        """Inserta las relaciones y cuenta las aceptadas y las rechazadas."""
+        if filas:
+            insertadas = self.red._add_edges_batch(filas)
+            self.estadisticas.relaciones += insertadas
+            self.estadisticas.relaciones_rechazadas += len(filas) - insertadas
+
+
+async def eventos_de_cola(cola: asyncio.Queue) -> AsyncIterator[Evento]:
+    """Itera los eventos de una asyncio.Queue hasta recibir None."""
+    while True:
+        evento = await cola.get()
+        if evento is None:
+            return
+        yield evento
+
+
+async def eventos_de_stream(reader: asyncio.StreamReader, encoding: str = 'utf-8') -> AsyncIterator[str]:
+    """Itera las líneas no vacías de un StreamReader (un socket TCP o Unix) hasta el fin de datos."""
+    async for linea in reader:
+        linea = linea.decode(encoding).strip()
+        if linea:
+            yield linea
+
+
+async def ingerir_socket(red: Red_social, host: Optional[str] = None, port: Optional[int] = None,
+                         path: Optional[str] = None, **opciones) -> EstadisticasIngesta:
+    """Conecta a un socket TCP (host, port) o Unix (path) e ingiere sus líneas hasta que se cierra.
+
+    opciones se pasan a Ingesta (max_lote, capacidad).
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await Ingesta(red, **opciones).consumir(eventos_de_stream(reader))
+    finally:
+        writer.close()
+        await writer.wait_closed()
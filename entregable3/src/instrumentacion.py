@@ -0,0 +1,100 @@
+import sys
+import time
+from collections import defaultdict
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional
+
+# Los métodos se instrumentan sustituyéndolos en la propia instancia por envoltorios. Así,
+# con la instrumentación desactivada el código no hace ninguna comprobación adicional: las
+# llamadas llegan directamente a los métodos de la clase.
+
+
+class Estadisticas:
+    """Contadores, tiempos y máximos de una estructura instrumentada.
+
+    Si se indica un hook, se llama como hook(nombre, valor) con cada dato registrado.
+    """
+
+    def __init__(self, hook: Optional[Callable[[str, float], None]] = None):
+        self.contadores: Dict[str, int] = defaultdict(int)
+        self.tiempos: Dict[str, float] = defaultdict(float)  # Segundos acumulados por método o fase
+        self.maximos: Dict[str, float] = {}
+        self.hook = hook
+
+    def registrar(self, nombre: str, cantidad: int = 1):
+        """Suma cantidad al contador nombre."""
+        self.contadores[nombre] += cantidad
+        if self.hook is not None:
+            self.hook(nombre, cantidad)
+
+    def registrar_tiempo(self, nombre: str, segundos: float):
+        """Acumula segundos en el tiempo de nombre."""
+        self.tiempos[nombre] += segundos
+        if self.hook is not None:
+            self.hook(nombre, segundos)
+
+    def registrar_maximo(self, nombre: str, valor: float):
+        """Guarda valor si supera el máximo registrado para nombre."""
+        if valor > self.maximos.get(nombre, float('-inf')):
+            self.maximos[nombre] = valor
+        if self.hook is not None:
+            self.hook(nombre, valor)
+
+    def as_dict(self) -> dict:
+        """Devuelve una copia serializable de los datos registrados."""
+        return {'contadores': dict(self.contadores), 'tiempos': dict(self.tiempos), 'maximos': dict(self.maximos)}
+
+
+def instrumentar(objeto, estadisticas: Estadisticas, contados: Iterable[str] = (),
+                 cronometrados: Iterable[str] = (), despues: Optional[Callable[[], None]] = None):
+    """Sustituye en la instancia los métodos indicados por envoltorios.
+
+    Los métodos de contados suman una llamada a su contador; los de cronometrados acumulan
+    su tiempo y, si se indica, llaman después a despues().
+    """
+    for nombre in contados:
+        setattr(objeto, nombre, _contador(getattr(objeto, nombre), nombre, estadisticas))
+    for nombre in cronometrados:
+        setattr(objeto, nombre, _cronometro(getattr(objeto, nombre), nombre, estadisticas, despues))
+
+
+def desinstrumentar(objeto, nombres: Iterable[str]):
+    """Retira los envoltorios de la instancia, de modo que vuelven a usarse los métodos de la clase."""
+    for nombre in nombres:
+        objeto.__dict__.pop(nombre, None)
+
+
+def _contador(metodo, nombre: str, estadisticas: Estadisticas):
+    @wraps(metodo)
+    def envoltorio(*args, **kwargs):
+        estadisticas.registrar(nombre)
+        return metodo(*args, **kwargs)
+    return envoltorio
+
+
+def _cronometro(metodo, nombre: str, estadisticas: Estadisticas, despues: Optional[Callable[[], None]]):
+    @wraps(metodo)
+    def envoltorio(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            estadisticas.registrar_tiempo(nombre, time.perf_counter() - inicio)
+            if despues is not None:
+                despues()
+    return envoltorio
+
+
+def estimar_bytes(*contenedores) -> int:
+    """Estima los bytes de unos contenedores y de los contenedores que guardan como valores (un nivel).
+
+    No cuenta las claves ni los objetos compartidos (cadenas, usuarios), solo la estructura.
+    """
+    total = 0
+    for contenedor in contenedores:
+        total += sys.getsizeof(contenedor)
+        valores = contenedor.values() if isinstance(contenedor, dict) else ()
+        for valor in valores:
+            if isinstance(valor, (dict, set, list, tuple)):
+                total += sys.getsizeof(valor)
+    return total
@@ -0,0 +1,53 @@
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional
+
+
+class VertexInterner:
+    """Traduce claves externas de vértices (p. ej. DNIs) a enteros densos 0..n-1 y viceversa.
+
+    Las estructuras internas trabajan con los enteros (indexables en arrays y baratos de
+    comparar) y solo se traduce a la clave original en la interfaz pública.
+    """
+    __slots__ = ('_ids', '_keys')
+
+    def __init__(self, keys: Iterable[Hashable] = ()):
+        self._ids: Dict[Hashable, int] = {}  # {clave: entero}
+        self._keys: List[Hashable] = []  # Clave de cada entero
+        for key in keys:
+            self.intern(key)
+
+    def intern(self, key: Hashable) -> int:
+        """Devuelve el entero de una clave, asignándole el siguiente libre si es nueva."""
+        i = self._ids.get(key)
+        if i is None:
+            i = len(self._keys)
+            self._ids[key] = i
+            self._keys.append(key)
+        return i
+
+    def intern_many(self, keys: Iterable[Hashable]):
+        """Asigna en bloque, en orden, enteros a las claves de keys (distintas entre sí) que aún no lo tienen."""
+        ids = self._ids
+        nuevas = [key for key in keys if key not in ids]
+        ids.update(zip(nuevas, range(len(self._keys), len(self._keys) + len(nuevas))))
+        self._keys.extend(nuevas)
+
+    def id_of(self, key: Hashable) -> Optional[int]:
+        """Devuelve el entero de una clave, o None si no se ha internado."""
+        return self._ids.get(key)
+
+    def key_of(self, i: int) -> Hashable:
+        """Devuelve la clave correspondiente a un entero."""
+        return self._keys[i]
+
+    def keys(self):
+        """Vista de las claves en orden de entero (sin copia)."""
+        return self._ids.keys()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._ids
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._keys)
@@ -0,0 +1,158 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+import os
+
+from grafo import FrozenGraph
+from interner import VertexInterner
+
+# Adyacencia compartida de cada proceso trabajador: (offsets, destinos, nº de vértices)
+_compartido: Optional[Tuple[memoryview, memoryview, int]] = None
+_bloques: List[shared_memory.SharedMemory] = []
+
+
+class ResultadoMultiple:
+    """Resultado de traverse_many: histogramas de distancias y, opcionalmente, arrays de padres.
+
+    histogramas[s][d] es el número de vértices a d saltos de s. padres[s] es un array('i')
+    indexado por identificador de vértice (ver vertices) con el identificador del padre en el
+    árbol BFS, el propio vértice para el origen y -1 para los no alcanzables.
+    """
+
+    def __init__(self, interner: VertexInterner):
+        self.interner = interner  # Traducción entre vértices e identificadores enteros
+        self.histogramas: Dict[Hashable, List[int]] = {}
+        self.padres: Dict[Hashable, array] = {}
+
+    @property
+    def vertices(self) -> List[Hashable]:
+        """Vértice de cada identificador entero."""
+        return self.interner._keys
+
+    def parent(self, source: Hashable, vertex: Hashable) -> Optional[Hashable]:
+        """Devuelve el predecesor de vertex en el árbol BFS desde source (None si es el origen o no se alcanza)."""
+        i = self.interner.id_of(vertex)
+        padre = self.padres[source][i]
+        if padre < 0 or padre == i:
+            return None
+        return self.interner.key_of(padre)
+
+
+def _csr(grafo) -> Tuple[VertexInterner, array, array]:
+    """Obtiene la adyacencia en CSR (interner, offsets, destinos) de cualquier grafo del proyecto."""
+    if isinstance(grafo, FrozenGraph):
+        return grafo.interner, array('q', grafo._offsets), array('i', grafo._targets)
+    offsets = array('q', [0])
+    targets = array('i')
+    if hasattr(grafo, 'successor_ids'):  # Grafos que ya numeran sus vértices: las filas se copian sin traducir
+        n = len(grafo.vertex_set())
+        for i in range(n):
+            targets.extend(grafo.successor_ids(i))
+            offsets.append(len(targets))
+        return VertexInterner(islice(grafo.interner._keys, n)), offsets, targets
+    interner = VertexInterner(grafo.vertex_set())
+    for vertex in interner:
+        targets.extend(interner.id_of(neighbor) for neighbor in grafo.successors(vertex))
+        offsets.append(len(targets))
+    return interner, offsets, targets
+
+
+def _compartir(buffer: array) -> shared_memory.SharedMemory:
+    """Copia un array a un bloque nuevo de memoria compartida."""
+    bloque = shared_memory.SharedMemory(create=True, size=max(1, len(buffer) * buffer.itemsize))
+    bloque.buf[:len(buffer) * buffer.itemsize] = buffer.tobytes()
+    return bloque
+
+
+def _adjuntar(nombre_offsets: str, nombre_targets: str, n: int, m: int):
+    """Inicializador de cada trabajador: proyecta los bloques compartidos sin copiarlos."""
+    global _compartido
+    # Los trabajadores comparten el resource_tracker del proceso principal, que es quien
+    # libera los bloques con unlink al terminar; aquí solo se adjuntan
+    for nombre in (nombre_offsets, nombre_targets):
+        _bloques.append(shared_memory.SharedMemory(name=nombre))
+    offsets = _bloques[-2].buf[:8 * (n + 1)].cast('q')
+    targets = _bloques[-1].buf[:4 * m].cast('i')
+    _compartido = (offsets, targets, n)
+
+
+def _bfs(source: int, padres: bool) -> Tuple[int, List[int], Optional[bytes]]:
+    """BFS sobre la adyacencia compartida. Devuelve (origen, histograma, padres en bytes o None)."""
+    offsets, targets, n = _compartido
+    parent = array('i', [-1]) * n
+    parent[source] = source
+    histograma = [1]
+    frontier = [source]
+    while frontier:
+        next_frontier = []
+        for vertex in frontier:
+            for neighbor in targets[offsets[vertex]:offsets[vertex + 1]]:
+                if parent[neighbor] < 0:
+                    parent[neighbor] = vertex
+                    next_frontier.append(neighbor)
+        if next_frontier:
+            histograma.append(len(next_frontier))
+        frontier = next_frontier
+    return source, histograma, parent.tobytes() if padres else None
+
+
+def _bfs_lote(sources: List[int], padres: bool) -> List[Tuple[int, List[int], Optional[bytes]]]:
+    """Ejecuta el BFS para un lote de orígenes (reduce el coste de comunicación por tarea)."""
+    return [_bfs(source, padres) for source in sources]
+
+
+def traverse_many(grafo, sources: Iterable[Hashable], workers: Optional[int] = None,
+                  padres: bool = False, lote: int = 16) -> ResultadoMultiple:
+    """Recorridos en anchura desde muchos orígenes repartidos entre procesos.
+
+    La adyacencia se congela una vez en CSR y se publica en multiprocessing.shared_memory;
+    cada trabajador la proyecta sin copiarla y procesa los orígenes en lotes de 'lote'.
+    Con workers <= 1 todo se ejecuta en el proceso actual. Admite recorridos.Graph,
+    grafo.Graph y grafo.FrozenGraph. Lanza KeyError, antes de repartir el trabajo, si algún
+    origen no es un vértice del grafo.
+    """
+    global _compartido
+    interner, offsets, targets = _csr(grafo)
+    vertices = interner._keys
+    source_ids = []
+    for source in sources:
+        source_id = interner.id_of(source)
+        if source_id is None:
+            raise KeyError(f"El vértice origen {source!r} no está en el grafo.")
+        source_ids.append(source_id)
+    resultado = ResultadoMultiple(interner)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        anterior = _compartido
+        _compartido = (offsets, targets, len(vertices))
+        try:
+            salidas = _bfs_lote(source_ids, padres)
+        finally:
+            _compartido = anterior
+    else:
+        bloque_offsets = _compartir(offsets)
+        bloque_targets = _compartir(targets)
+        try:
+            lotes = [source_ids[i:i + lote] for i in range(0, len(source_ids), lote)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_adjuntar,
+                                     initargs=(bloque_offsets.name, bloque_targets.name,
+                                               len(vertices), len(targets))) as pool:
+                salidas = [salida for parcial in pool.map(_bfs_lote, lotes, [padres] * len(lotes))
+                           for salida in parcial]
+        finally:
+            for bloque in (bloque_offsets, bloque_targets):
+                bloque.close()
+                bloque.unlink()
+
+    for source, histograma, parent in salidas:
+        vertex = vertices[source]
+        resultado.histogramas[vertex] = histograma
+        if parent is not None:
+            buffer = array('i')
+            buffer.frombytes(parent)
+            resultado.padres[vertex] = buffer
+    return resultado
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from heapq import nlargest
+from math import log
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from redsocial import E_grafo, Usuario
+
+METRICAS = ('vecinos_comunes', 'adamic_adar', 'interacciones')
+
+
+class Recomendador:
+    """Recomendaciones de "personas que quizá conozcas": usuarios a distancia 2, por puntuación.
+
+    Las métricas son 'vecinos_comunes' (número de vecinos en común), 'adamic_adar' (suma de
+    1 / log(grado) de cada vecino común) y 'interacciones' (suma de las interacciones de las
+    dos relaciones que pasan por cada vecino común). En una red dirigida las relaciones
+    cuentan en ambos sentidos.
+
+    Los resultados se guardan en una caché LRU de 'capacidad' usuarios. El recomendador se
+    suscribe a la red: cada relación nueva (a, b) invalida solo a a, b y sus vecinos, que son
+    los únicos usuarios cuyo resultado puede cambiar.
+    """
+
+    def __init__(self, red: E_grafo, metrica: str = 'vecinos_comunes', capacidad: int = 1024):
+        if metrica not in METRICAS:
+            raise ValueError(f"Métrica no válida. Use una de {METRICAS}.")
+        self.red = red
+        self.metrica = metrica
+        self.capacidad = capacidad
+        self._cache: 'OrderedDict[str, List[Tuple[str, float]]]' = OrderedDict()  # {dni: [(dni candidato, puntuación)]}
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+        red.subscribe(self._on_edge_added)
+
+    def close(self):
+        """Da de baja el recomendador en la red y vacía la caché."""
+        self.red.unsubscribe(self._on_edge_added)
+        self._cache.clear()
+
+    def _vecinos(self, i: int) -> Dict[int, dict]:
+        """Devuelve {entero del vecino: relación} del usuario i en ambos sentidos."""
+        vecinos = self.red._vecinos.get(i, {})
+        if not self.red.dirigido:
+            return vecinos
+        predecesores = self.red._predecesores.get(i)
+        if not predecesores:
+            return vecinos
+        return {**predecesores, **vecinos}
+
+    def _calcular(self, dni: str) -> List[Tuple[str, float]]:
+        """Puntúa los usuarios a distancia 2 de dni y los devuelve ordenados (mejor puntuación, luego DNI).
+
+        Se puntúa sobre los enteros de los usuarios en la red; los DNIs solo se traducen al final.
+        """
+        i = self.red.interner.id_of(dni)
+        propios = self._vecinos(i)
+        puntuaciones: Dict[int, float] = {}
+        for intermedio, relacion in propios.items():
+            segundos = self._vecinos(intermedio)
+            if len(segundos) < 2:  # Su único vecino es dni: no lleva a ningún candidato
+                continue
+            if self.metrica == 'adamic_adar':
+                peso = 1 / log(len(segundos))
+            for candidato, relacion_candidato in segundos.items():
+                if candidato == i or candidato in propios:
+                    continue
+                if self.metrica == 'vecinos_comunes':
+                    puntuaciones[candidato] = puntuaciones.get(candidato, 0) + 1
+                elif self.metrica == 'adamic_adar':
+                    puntuaciones[candidato] = puntuaciones.get(candidato, 0) + peso
+                else:
+                    suma = relacion['interacciones'] + relacion_candidato['interacciones']
+                    puntuaciones[candidato] = puntuaciones.get(candidato, 0) + suma
+        keys = self.red.interner._keys
+        return sorted(((keys[candidato], puntuacion) for candidato, puntuacion in puntuaciones.items()),
+                      key=lambda item: (-item[1], item[0]))
+
+    def _resultado(self, dni: str) -> List[Tuple[str, float]]:
+        """Devuelve el resultado de dni desde la caché o calculándolo (y guardándolo)."""
+        cache = self._cache
+        resultado = cache.get(dni)
+        if resultado is not None:
+            self.aciertos += 1
+            cache.move_to_end(dni)
+            return resultado
+        self.fallos += 1
+        resultado = self._calcular(dni)
+        cache[dni] = resultado
+        if len(cache) > self.capacidad:
+            cache.popitem(last=False)
+        return resultado
+
+    def recomendar(self, usuario, k: int = 10) -> List[Tuple[Usuario, float]]:
+        """Devuelve hasta k usuarios recomendados para un usuario (o su DNI), con su puntuación."""
+        dni = E_grafo._dni(usuario)
+        if dni not in self.red.vertices:
+            return []
+        vertices = self.red.vertices
+        return [(vertices[candidato], puntuacion) for candidato, puntuacion in self._resultado(dni)[:k]]
+
+    def precalcular(self, usuarios: Optional[Iterable] = None, n: int = 100) -> int:
+        """Llena la caché para unos usuarios o, por defecto, para los n con más relaciones. Devuelve los calculados.
+
+        Nunca calcula más usuarios de los que caben en la caché.
+        """
+        if usuarios is None:
+            dnis = nlargest(min(n, self.capacidad), self.red.vertices, key=self.red.degree)
+        else:
+            dnis = [E_grafo._dni(usuario) for usuario in usuarios][:self.capacidad]
+        calculados = 0
+        for dni in dnis:
+            if dni in self.red.vertices and dni not in self._cache:
+                self._resultado(dni)
+                calculados += 1
+        return calculados
+
+    def _on_edge_added(self, source: Usuario, target: Usuario, relacion: dict):
+        """Invalida los resultados de los extremos de la relación nueva y de sus vecinos."""
+        cache = self._cache
+        if not cache:
+            return
+        keys = self.red.interner._keys
+        for extremo in (source.dni, target.dni):
+            if cache.pop(extremo, None) is not None:
+                self.invalidaciones += 1
+            for vecino in self._vecinos(self.red.interner.id_of(extremo)):
+                if cache.pop(keys[vecino], None) is not None:
+                    self.invalidaciones += 1
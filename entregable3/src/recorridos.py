@@ -1,33 +1,257 @@
-from typing import Dict, List, Optional, Tuple, Set
+from array import array
+from heapq import heappop, heappush
+from itertools import count, repeat
+from math import inf
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Set
+
+import multirecorrido
+from interner import VertexInterner
+from instrumentacion import Estadisticas, desinstrumentar, instrumentar
 
 class Graph:
-    """Representación de un grafo no dirigido para poder usar con el recorrido en profundidad."""
+    """Representación de un grafo no dirigido para poder usar con el recorrido en profundidad.
+
+    Los vértices se numeran con enteros densos (interner) y la adyacencia es una lista de
+    conjuntos de enteros indexada por vértice; las claves solo se traducen en la interfaz.
+    """
+    directed = False
+
     def __init__(self):
-        self.adjacency_list: Dict[str, Set[str]] = {}
+        self.interner = VertexInterner()  # Numeración de los vértices
+        self._vecinos: List[Set[int]] = []  # Vecinos de cada vértice, indexados por su entero
+        self._listeners: List[Callable[[str, str, Optional[float]], None]] = []  # Avisados de cada arista nueva
+
+    @property
+    def adjacency_list(self) -> Dict[str, Set[str]]:
+        """Lista de adyacencia {vértice: vecinos} con las claves originales (se construye al consultarla)."""
+        return {vertex: self.get_neighbors(vertex) for vertex in self.interner}
 
     def add_vertex(self, vertex: str):
         """Añadir un vértice al grafo si no existe."""
-        if vertex not in self.adjacency_list:
-            self.adjacency_list[vertex] = set()
+        if vertex not in self.interner:
+            self.interner.intern(vertex)
+            self._vecinos.append(set())
 
     def add_edge(self, source: str, target: str):
         """Añadir una arista entre los vértices source y target."""
         self.add_vertex(source)
         self.add_vertex(target)
-        self.adjacency_list[source].add(target)
-        self.adjacency_list[target].add(source)
+        i, j = self.interner.id_of(source), self.interner.id_of(target)
+        if j in self._vecinos[i]:
+            return
+        self._vecinos[i].add(j)
+        self._vecinos[j].add(i)
+        for listener in self._listeners:
+            listener(source, target, None)
+
+    def subscribe(self, listener: Callable[[str, str, Optional[float]], None]):
+        """Registra una función listener(source, target, weight) que se llama tras añadir cada arista nueva."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, str, Optional[float]], None]):
+        """Da de baja una función registrada con subscribe."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     def get_neighbors(self, vertex: str) -> Set[str]:
         """Devuelve los vecinos de un vértice."""
-        return self.adjacency_list.get(vertex, set())
+        i = self.interner.id_of(vertex)
+        if i is None:
+            return set()
+        keys = self.interner._keys
+        return {keys[j] for j in self._vecinos[i]}
+
+    def successors(self, vertex: str) -> Set[str]:
+        """Devuelve los sucesores de un vértice (sus vecinos, al ser no dirigido)."""
+        return self.get_neighbors(vertex)
+
+    def predecessors(self, vertex: str) -> Set[str]:
+        """Devuelve los predecesores de un vértice (sus vecinos, al ser no dirigido)."""
+        return self.get_neighbors(vertex)
+
+    def vertex_set(self) -> Set[str]:
+        """Devuelve el conjunto de todos los vértices del grafo."""
+        return self.interner.keys()
+
+    def vertex_id(self, vertex: str) -> int:
+        """Devuelve el identificador entero denso de un vértice."""
+        return self.interner._ids[vertex]
+
+    def vertex_of(self, i: int) -> str:
+        """Devuelve el vértice correspondiente a un identificador entero."""
+        return self.interner._keys[i]
+
+    def successor_ids(self, i: int) -> Set[int]:
+        """Devuelve, sin copia, los identificadores de los vecinos del vértice i."""
+        return self._vecinos[i]
+
+    predecessor_ids = successor_ids  # No dirigido: predecesores y sucesores coinciden
+
+    def successor_weights(self, i: int) -> Iterable[Tuple[int, int]]:
+        """Devuelve los pares (identificador, peso) de las aristas del vértice i; todas pesan 1."""
+        return zip(self._vecinos[i], repeat(1))
+
+    def edge_weight(self, source: str, target: str) -> Optional[float]:
+        """Devuelve el peso de la arista entre source y target (1 si existe, None si no)."""
+        i = self.interner.id_of(source)
+        if i is None or self.interner.id_of(target) not in self._vecinos[i]:
+            return None
+        return 1
 
 class Recorrido:
-    """Clase base para recorrer un grafo."""
+    """Clase base para recorrer un grafo.
+
+    Tras cada recorrido, la primera consulta de origen, profundidad o grupos construye un
+    índice del árbol (raíz y profundidad de cada vértice) que se reutiliza hasta que el árbol
+    cambia. El índice detecta por sí solo un árbol nuevo o con más vértices; quien modifique
+    _tree de otro modo debe llamar a _invalidate.
+    """
     def __init__(self, grafo: Graph):
         self._grafo = grafo
         self._tree: Dict[str, Tuple[Optional[str], float]] = {}  # Árbol de recorrido
         self._path: List[str] = []  # Camino recorrido
         self._visited: Set[str] = set()  # Conjunto de vértices visitados
+        self._stats: Optional[Estadisticas] = None  # Estadisticas mientras la instrumentación está activa
+        self._reset_measures()
+        self._invalidate()
+
+    def _reset_measures(self):
+        """Pone a cero los datos que mide el recorrido mientras avanza, que registra _record_stats."""
+        self._examined = 0  # Aristas examinadas
+        self._max_frontier = 0  # Tamaño máximo de la frontera (o de la pila en el DFS)
+        self._max_depth = 0  # Profundidad máxima alcanzada
+
+    def _invalidate(self):
+        """Descarta el índice del árbol y los grupos cacheados."""
+        self._indexed_tree: Optional[Dict] = None  # Árbol para el que se construyó el índice
+        self._indexed_size = -1
+        self._roots: Dict[str, str] = {}  # {vértice: raíz de su árbol}
+        self._depths: Dict[str, int] = {}  # {vértice: número de aristas hasta la raíz}
+        self._groups: Optional[Dict[str, Set[str]]] = None
+        self._lifting: Optional[List[Dict[str, str]]] = None  # Tabla de ancestros 2^k para LCA
+
+    def _index(self):
+        """Construye (si no está al día) la raíz y la profundidad de cada vértice del árbol.
+
+        Cada vértice se recorre una sola vez: las cadenas de predecesores aún sin indexar se
+        resuelven de golpe (compresión de caminos), también en bosques con varios orígenes.
+        """
+        tree = self._tree
+        if self._indexed_tree is tree and self._indexed_size == len(tree):
+            return
+        self._invalidate()
+        roots = self._roots
+        depths = self._depths
+        for vertex in tree:
+            chain = []
+            current = vertex
+            while current not in roots:
+                predecessor = tree[current][0] if current in tree else None
+                if predecessor is None:
+                    roots[current] = current
+                    depths[current] = 0
+                    break
+                chain.append(current)
+                current = predecessor
+            root = roots[current]
+            depth = depths[current]
+            for pending in reversed(chain):
+                depth += 1
+                roots[pending] = root
+                depths[pending] = depth
+        self._indexed_tree = tree
+        self._indexed_size = len(tree)
+
+    _METODOS_CRONOMETRADOS = ('traverse', 'traverse_to')  # Recorridos completos
+    _FASES = ()  # Métodos internos cuyo tiempo se mide como fase del recorrido
+    _MAXIMO_FRONTERA = 'max_frontera'  # Nombre con el que se registra _max_frontier
+
+    def enable_stats(self, hook: Optional[Callable[[str, float], None]] = None) -> Estadisticas:
+        """Activa la instrumentación del recorrido: tiempo por recorrido y por fase, vértices y aristas tocados.
+
+        hook(nombre, valor), si se indica, recibe cada dato registrado. Desactivada no tiene coste.
+        """
+        self.disable_stats()
+        self._stats = Estadisticas(hook)
+        recorridos = [nombre for nombre in self._METODOS_CRONOMETRADOS if hasattr(self, nombre)]
+        instrumentar(self, self._stats, cronometrados=recorridos, despues=self._record_stats)
+        instrumentar(self, self._stats, cronometrados=self._FASES)
+        return self._stats
+
+    def disable_stats(self):
+        """Desactiva la instrumentación y descarta los datos registrados."""
+        desinstrumentar(self, self._METODOS_CRONOMETRADOS + self._FASES)
+        self._stats = None
+
+    def stats(self) -> dict:
+        """Devuelve los datos de instrumentación acumulados y el tamaño del último árbol."""
+        datos = {} if self._stats is None else self._stats.as_dict()
+        datos['vertices_en_arbol'] = len(self._tree)
+        return datos
+
+    def _record_stats(self):
+        """Registra, tras cada recorrido, los vértices visitados y lo que el recorrido ha medido al avanzar."""
+        stats = self._stats
+        stats.registrar('recorridos')
+        stats.registrar('vertices_visitados', len(self._tree))
+        stats.registrar('aristas_examinadas', self._examined)
+        stats.registrar_maximo('max_profundidad', self._max_depth)
+        stats.registrar_maximo(self._MAXIMO_FRONTERA, self._max_frontier)
+
+    # Si es True, las reparaciones también acortan costes; si no, solo se añaden vértices alcanzables
+    _REPAIRS_COSTS = True
+
+    def subscribe(self):
+        """Suscribe el recorrido a las aristas nuevas del grafo para mantener el árbol al día.
+
+        Tras cada add_edge el árbol se repara localmente (ver _on_edge_added) en lugar de
+        recalcularse. Solo tiene sentido para árboles completos obtenidos con traverse.
+        """
+        self._grafo.subscribe(self._on_edge_added)
+
+    def unsubscribe(self):
+        """Deja de mantener el árbol al día con las aristas nuevas del grafo."""
+        self._grafo.unsubscribe(self._on_edge_added)
+
+    def _edge_cost(self, source: str, target: str) -> float:
+        """Coste de una arista al reparar el árbol; por defecto un salto."""
+        return 1
+
+    def _on_edge_added(self, source: str, target: str, weight: Optional[float]):
+        """Repara el árbol tras añadir la arista (source, target), en ambos sentidos si el grafo no es dirigido."""
+        changed = self._repair(source, target)
+        if not getattr(self._grafo, 'directed', False):
+            changed = self._repair(target, source) or changed
+        if changed:
+            self._invalidate()
+
+    def _repair(self, source: str, target: str) -> bool:
+        """Propaga desde target si la arista lo hace alcanzable o (con _REPAIRS_COSTS) más barato.
+
+        Es un recorrido parcial tipo Dijkstra que solo visita los vértices cuyo coste mejora
+        (o que pasan a ser alcanzables). Devuelve True si el árbol ha cambiado.
+        """
+        tree = self._tree
+        if source not in tree:
+            return False
+        successors = self._grafo.successors
+        tie = count()
+        heap = [(tree[source][1] + self._edge_cost(source, target), next(tie), target, source)]
+        changed = False
+        while heap:
+            cost, _, vertex, predecessor = heappop(heap)
+            if vertex in tree and (not self._REPAIRS_COSTS or tree[vertex][1] <= cost):
+                continue
+            if vertex not in tree:
+                self._visited.add(vertex)
+                self._path.append(vertex)
+            tree[vertex] = (predecessor, cost)
+            changed = True
+            for neighbor in successors(vertex):
+                heappush(heap, (cost + self._edge_cost(vertex, neighbor), next(tie), neighbor, vertex))
+        return changed
 
     def path_to_origin(self, vertex: str) -> List[str]:
         """Construye el camino hacia el origen desde el vértice dado."""
@@ -39,22 +263,78 @@ class Recorrido:
         return path[::-1]  # Regresa el camino desde el origen al vértice dado
 
     def origin(self, vertex: str) -> str:
-        """Determina el origen del recorrido a partir de un vértice dado."""
-        while self._tree.get(vertex, (None, 0))[0] is not None:
-            vertex = self._tree[vertex][0]  # Sigue los predecesores
-        return vertex
+        """Determina el origen del recorrido a partir de un vértice dado, en O(1) tras indexar el árbol."""
+        self._index()
+        return self._roots.get(vertex, vertex)
+
+    def depth(self, vertex: str) -> Optional[int]:
+        """Devuelve el número de aristas entre el vértice y su origen, o None si no está en el árbol."""
+        self._index()
+        return self._depths.get(vertex)
 
     def groups(self) -> Dict[str, Set[str]]:
-        """Organiza los vértices en grupos basados en su origen."""
-        groups = {}
-        for vertex, (predecessor, _) in self._tree.items():
-            if predecessor not in groups:
-                groups[predecessor] = set()
-            groups[predecessor].add(vertex)
-        return groups
+        """Organiza los vértices en grupos basados en su origen. El resultado se cachea hasta el próximo recorrido."""
+        self._index()
+        if self._groups is None:
+            groups = {}
+            for vertex, (predecessor, _) in self._tree.items():
+                if predecessor not in groups:
+                    groups[predecessor] = set()
+                groups[predecessor].add(vertex)
+            self._groups = groups
+        return self._groups
+
+    def common_ancestor(self, a: str, b: str) -> Optional[str]:
+        """Ancestro común más profundo de dos vértices del árbol (LCA) con binary lifting, en O(log n).
+
+        Devuelve None si algún vértice no está en el árbol o si pertenecen a árboles distintos.
+        """
+        self._index()
+        if a not in self._roots or b not in self._roots or self._roots[a] != self._roots[b]:
+            return None
+        up = self._lifting_table()
+        depths = self._depths
+        if depths[a] < depths[b]:
+            a, b = b, a
+        diff = depths[a] - depths[b]
+        k = 0
+        while diff:
+            if diff & 1:
+                a = up[k][a]
+            diff >>= 1
+            k += 1
+        if a == b:
+            return a
+        for level in reversed(up):
+            if level[a] != level[b]:
+                a = level[a]
+                b = level[b]
+        return up[0][a]
+
+    def _lifting_table(self) -> List[Dict[str, str]]:
+        """Construye la tabla de ancestros: up[k][v] es el ancestro 2^k de v (o la raíz)."""
+        if self._lifting is None:
+            tree = self._tree
+            roots = self._roots
+            parent = {vertex: tree[vertex][0] if tree.get(vertex, (None, 0))[0] is not None else vertex
+                      for vertex in roots}
+            up = [parent]
+            height = max(self._depths.values(), default=0)
+            while (1 << len(up)) <= height:
+                previous = up[-1]
+                up.append({vertex: previous[previous[vertex]] for vertex in previous})
+            self._lifting = up
+        return self._lifting
 
 class RecorridoEnProfundidad(Recorrido):
-    """Implementación de un recorrido en profundidad (DFS)."""
+    """Implementación de un recorrido en profundidad (DFS).
+
+    Suscrito al grafo, el árbol solo se repara en alcanzabilidad: los vértices que pasan a
+    ser alcanzables se añaden, pero no se reordena el árbol ya construido.
+    """
+    _REPAIRS_COSTS = False
+    _MAXIMO_FRONTERA = 'max_pila'  # La frontera del DFS es su pila
+
     def __init__(self, grafo: Graph):
         super().__init__(grafo)
 
@@ -65,18 +345,553 @@ class RecorridoEnProfundidad(Recorrido):
 
     def traverse(self, source: str):
         """Realiza un recorrido en profundidad (DFS) comenzando desde el vértice source."""
+        for _ in self._restart(source):
+            pass
+
+    def iter_traverse(self, source: str) -> Iterator[Tuple[str, Optional[str], int]]:
+        """Recorrido en profundidad perezoso: genera (vértice, predecesor, profundidad) en orden de visita.
+
+        El árbol y el camino se van rellenando a medida que se consume el generador,
+        por lo que se puede parar antes de terminar sin recorrer todo el grafo.
+        """
+        if self._stats is None:
+            return self._restart(source)
+        return self._iter_traverse_stats(source, self._stats)
+
+    def _restart(self, source: str) -> Iterator[Tuple[str, Optional[str], int]]:
+        """Reinicia el árbol, el camino y los datos medidos y recorre desde source."""
         self._tree = {}  # Reinicia el árbol de recorrido
         self._path = []  # Reinicia el camino recorrido
         self._visited = set()  # Reinicia los vértices visitados
-        self._dfs(source, None, 0)
+        self._reset_measures()
+        yield from self._dfs(source)
+
+    def _iter_traverse_stats(self, source: str, stats: Estadisticas) -> Iterator[Tuple[str, Optional[str], int]]:
+        """iter_traverse instrumentado: mide solo el tiempo dentro del recorrido y registra los datos al terminar o cerrarse."""
+        steps = self._restart(source)
+        seconds = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                step = next(steps, None)
+                seconds += time.perf_counter() - start
+                if step is None:
+                    return
+                yield step
+        finally:
+            steps.close()
+            stats.registrar_tiempo('iter_traverse', seconds)
+            if self._stats is stats:
+                self._record_stats()
+
+    def _dfs(self, source: str) -> Iterator[Tuple[str, Optional[str], int]]:
+        """Método auxiliar que realiza el DFS con una pila explícita, sin recursión."""
+        if hasattr(self._grafo, 'successor_ids') and source in self._grafo.interner:
+            yield from self._dfs_ids(source)
+            return
+        get_neighbors = self._grafo.get_neighbors
+        visited = self._visited
+        tree = self._tree
+        path = self._path
+        visited.add(source)
+        tree[source] = (None, 0)
+        path.append(source)
+        examined = 0
+        max_stack = 1
+        try:
+            yield source, None, 0
+            # Cada entrada de la pila guarda el vértice, el iterador de sus vecinos pendientes y su profundidad
+            stack = [(source, iter(get_neighbors(source)), 0)]
+            while stack:
+                vertex, pending, depth = stack[-1]
+                for neighbor in pending:
+                    examined += 1
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        tree[neighbor] = (vertex, depth + 1)  # Se asume un peso de 1 por arista
+                        path.append(neighbor)
+                        yield neighbor, vertex, depth + 1
+                        stack.append((neighbor, iter(get_neighbors(neighbor)), depth + 1))
+                        if len(stack) > max_stack:
+                            max_stack = len(stack)
+                        break
+                else:
+                    stack.pop()  # Todos los vecinos visitados: se vuelve atrás
+        finally:
+            self._record_dfs(examined, max_stack)
+
+    def _record_dfs(self, examined: int, max_stack: int):
+        """Guarda lo medido por un DFS (también si se ha parado antes de terminar)."""
+        self._examined += examined
+        self._max_frontier = max(self._max_frontier, max_stack)
+        self._max_depth = max(self._max_depth, max_stack - 1)
+
+    def _dfs_ids(self, source: str) -> Iterator[Tuple[str, Optional[str], int]]:
+        """DFS sobre los identificadores enteros de un grafo que numera sus vértices (grafo.Graph o FrozenGraph).
+
+        Las comprobaciones de visitado se hacen sobre un bytearray; los vértices solo se
+        traducen a sus claves al anotarlos en el árbol.
+        """
+        successor_ids = self._grafo.successor_ids
+        keys = self._grafo.interner._keys
+        seen = bytearray(len(keys))
+        visited = self._visited
+        tree = self._tree
+        path = self._path
+        start = self._grafo.interner.id_of(source)
+        seen[start] = 1
+        visited.add(source)
+        tree[source] = (None, 0)
+        path.append(source)
+        examined = 0
+        max_stack = 1
+        try:
+            yield source, None, 0
+            stack = [(start, iter(successor_ids(start)), 0)]
+            while stack:
+                vertex, pending, depth = stack[-1]
+                for neighbor in pending:
+                    examined += 1
+                    if not seen[neighbor]:
+                        seen[neighbor] = 1
+                        key = keys[neighbor]
+                        predecessor = keys[vertex]
+                        visited.add(key)
+                        tree[key] = (predecessor, depth + 1)
+                        path.append(key)
+                        yield key, predecessor, depth + 1
+                        stack.append((neighbor, iter(successor_ids(neighbor)), depth + 1))
+                        if len(stack) > max_stack:
+                            max_stack = len(stack)
+                        break
+                else:
+                    stack.pop()
+        finally:
+            self._record_dfs(examined, max_stack)
+
+
+class RecorridoEnAnchura(Recorrido):
+    """Implementación de un recorrido en anchura (BFS) por niveles con frontera de dirección optimizada.
+
+    Mientras la frontera es pequeña se expande de arriba abajo (sucesores de la frontera);
+    cuando crece lo suficiente se pasa a expandir de abajo arriba, buscando para cada vértice
+    no visitado algún predecesor en la frontera. Funciona con cualquier grafo que ofrezca
+    successors, predecessors y vertex_set (recorridos.Graph, grafo.Graph o grafo.FrozenGraph).
+    """
+    ALPHA = 14  # Se pasa a abajo-arriba si la frontera supera 1/ALPHA de los no visitados
+    BETA = 24  # Se vuelve a arriba-abajo si la frontera baja de 1/BETA de los vértices
+    _FASES = ('_top_down_step', '_bottom_up_step', '_top_down_step_ids', '_bottom_up_step_ids')
+
+    def __init__(self, grafo: Graph):
+        super().__init__(grafo)
+
+    @classmethod
+    def of(cls, grafo: Graph):
+        """Método de factoría para crear una nueva instancia de RecorridoEnAnchura."""
+        return cls(grafo)
+
+    @staticmethod
+    def traverse_many(grafo: Graph, sources: Iterable[str], workers: Optional[int] = None,
+                      padres: bool = False) -> 'multirecorrido.ResultadoMultiple':
+        """Recorridos en anchura desde muchos orígenes en un pool de procesos (ver multirecorrido.traverse_many)."""
+        return multirecorrido.traverse_many(grafo, sources, workers, padres)
 
-    def _dfs(self, vertex: str, predecessor: Optional[str], cost: float):
-        """Método auxiliar para realizar el DFS de manera recursiva."""
-        if vertex in self._visited:
+    def traverse(self, source: str):
+        """Realiza un recorrido en anchura (BFS) desde source; el coste de cada vértice es su número de saltos."""
+        if hasattr(self._grafo, 'successor_ids') and source in self._grafo.interner:
+            self._traverse_ids(source)
             return
-        self._visited.add(vertex)
-        self._tree[vertex] = (predecessor, cost)  # Guarda el predecesor y el costo
-        self._path.append(vertex)  # Añade el vértice al recorrido
-        for neighbor in self._grafo.get_neighbors(vertex):
-            if neighbor not in self._visited:
-                self._dfs(neighbor, vertex, cost + 1)  # Se asume un peso de 1 por arista
\ No newline at end of file
+        self._tree = {source: (None, 0)}  # Reinicia el árbol de recorrido
+        self._path = [source]  # Reinicia el camino recorrido
+        self._visited = {source}  # Reinicia los vértices visitados
+        self._reset_measures()
+        self._max_frontier = 1
+        frontier = [source]
+        unvisited = None  # Solo se calcula si se llega a expandir de abajo arriba
+        total = len(self._grafo.vertex_set())
+        level = 0
+        bottom_up = False
+        while frontier:
+            if bottom_up:
+                bottom_up = len(frontier) * self.BETA >= total
+            else:
+                pending = total - len(self._visited)
+                bottom_up = len(frontier) * self.ALPHA > pending
+            if bottom_up:
+                if unvisited is None:
+                    unvisited = set(self._grafo.vertex_set()) - self._visited
+                frontier = self._bottom_up_step(frontier, unvisited, level)
+            else:
+                frontier = self._top_down_step(frontier, level)
+                if unvisited is not None:
+                    unvisited.difference_update(frontier)
+            level += 1
+
+    def traverse_to(self, source: str, target: str, max_saltos: Optional[int] = None) -> Optional[List[str]]:
+        """Camino con menos saltos de source a target con BFS bidireccional.
+
+        Se expande en cada paso un nivel completo de la búsqueda con la frontera más pequeña
+        (hacia delante desde source o hacia atrás desde target) y se para en el nivel en que
+        las dos búsquedas se encuentran. Con max_saltos se abandona si no hay un camino de
+        como mucho esos saltos. Deja en _tree y _path solo el camino y lo devuelve, o None.
+        """
+        self._tree = {source: (None, 0)}
+        self._path = [source]
+        self._visited = {source}
+        self._reset_measures()
+        self._max_frontier = 1
+        if source == target:
+            return [source]
+        # Índice 0: búsqueda hacia delante desde source; índice 1: hacia atrás desde target
+        parent = ({source: None}, {target: None})
+        distance = ({source: 0}, {target: 0})
+        frontiers = ([source], [target])
+        neighbors = (self._grafo.successors, self._grafo.predecessors)
+        levels = [0, 0]
+        meeting = None
+        while frontiers[0] and frontiers[1] and meeting is None:
+            if max_saltos is not None and levels[0] + levels[1] >= max_saltos:
+                return None
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            own, other = parent[side], distance[1 - side]
+            best = inf
+            next_frontier = []
+            examined = 0
+            for vertex in frontiers[side]:
+                adjacent = neighbors[side](vertex)
+                examined += len(adjacent)
+                for neighbor in adjacent:
+                    if neighbor not in own:
+                        own[neighbor] = vertex
+                        distance[side][neighbor] = levels[side] + 1
+                        next_frontier.append(neighbor)
+                    # El nivel se completa: el encuentro con menos saltos del otro lado es el mejor
+                    if neighbor in other and other[neighbor] < best and own[neighbor] == vertex:
+                        best = other[neighbor]
+                        meeting = neighbor
+            levels[side] += 1
+            self._examined += examined
+            self._max_frontier = max(self._max_frontier, len(next_frontier))
+            frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+        if meeting is None:
+            return None
+        path = []
+        vertex = meeting
+        while vertex is not None:
+            path.append(vertex)
+            vertex = parent[0][vertex]
+        path.reverse()
+        vertex = parent[1][meeting]
+        while vertex is not None:
+            path.append(vertex)
+            vertex = parent[1][vertex]
+        self._tree = {vertex: (previous, hops) for hops, (previous, vertex) in enumerate(zip([None] + path, path))}
+        self._path = path
+        self._visited = set(path)
+        self._max_depth = len(path) - 1
+        return path
+
+    def _traverse_ids(self, source: str):
+        """BFS con frontera de dirección optimizada sobre los identificadores enteros de un grafo.Graph o FrozenGraph.
+
+        Padres y distancias se guardan en arrays indexados por identificador; el árbol con las
+        claves originales se construye una sola vez al final.
+        """
+        grafo = self._grafo
+        keys = grafo.interner._keys
+        total = len(keys)
+        start = grafo.interner.id_of(source)
+        parent = array('i', [-1]) * total
+        distance = array('i', [-1]) * total
+        parent[start] = start
+        distance[start] = 0
+        self._reset_measures()
+        self._max_frontier = 1
+        order = [start]
+        frontier = [start]
+        level = 0
+        bottom_up = False
+        while frontier:
+            if bottom_up:
+                bottom_up = len(frontier) * self.BETA >= total
+            else:
+                bottom_up = len(frontier) * self.ALPHA > total - len(order)
+            if bottom_up:
+                frontier = self._bottom_up_step_ids(frontier, parent, distance, level)
+            else:
+                frontier = self._top_down_step_ids(frontier, parent, distance, level)
+            order.extend(frontier)
+            level += 1
+        # Traducción a las claves originales, solo en la frontera de la API
+        self._path = [keys[vertex] for vertex in order]
+        self._tree = {keys[vertex]: (None if vertex == start else keys[parent[vertex]], distance[vertex])
+                      for vertex in order}
+        self._visited = set(self._path)
+
+    def _top_down_step_ids(self, frontier: List[int], parent: array, distance: array, level: int) -> List[int]:
+        """Como _top_down_step, sobre identificadores: los no visitados son los que no tienen padre."""
+        successor_ids = self._grafo.successor_ids
+        next_frontier = []
+        examined = 0
+        for vertex in frontier:
+            neighbors = successor_ids(vertex)
+            examined += len(neighbors)
+            for neighbor in neighbors:
+                if parent[neighbor] < 0:
+                    parent[neighbor] = vertex
+                    distance[neighbor] = level + 1
+                    next_frontier.append(neighbor)
+        self._record_level(examined, next_frontier, level)
+        return next_frontier
+
+    def _bottom_up_step_ids(self, frontier: List[int], parent: array, distance: array, level: int) -> List[int]:
+        """Como _bottom_up_step, sobre identificadores: la frontera se marca en un bytearray."""
+        predecessor_ids = self._grafo.predecessor_ids
+        in_frontier = bytearray(len(parent))
+        for vertex in frontier:
+            in_frontier[vertex] = 1
+        next_frontier = []
+        examined = 0
+        for vertex in range(len(parent)):
+            if parent[vertex] < 0:
+                checked = 0  # Predecesores comprobados hasta encontrar uno en la frontera
+                for checked, predecessor in enumerate(predecessor_ids(vertex), 1):
+                    if in_frontier[predecessor]:
+                        parent[vertex] = predecessor
+                        distance[vertex] = level + 1
+                        next_frontier.append(vertex)
+                        break
+                examined += checked
+        self._record_level(examined, next_frontier, level)
+        return next_frontier
+
+    def _top_down_step(self, frontier: List[str], level: int) -> List[str]:
+        """Expande la frontera recorriendo los sucesores de cada uno de sus vértices."""
+        successors = self._grafo.successors
+        visited = self._visited
+        tree = self._tree
+        next_frontier = []
+        examined = 0
+        for vertex in frontier:
+            neighbors = successors(vertex)
+            examined += len(neighbors)
+            for neighbor in neighbors:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    tree[neighbor] = (vertex, level + 1)
+                    next_frontier.append(neighbor)
+        self._path.extend(next_frontier)
+        self._record_level(examined, next_frontier, level)
+        return next_frontier
+
+    def _bottom_up_step(self, frontier: List[str], unvisited: Set[str], level: int) -> List[str]:
+        """Expande la frontera buscando, para cada vértice no visitado, un predecesor en ella."""
+        predecessors = self._grafo.predecessors
+        in_frontier = set(frontier)
+        tree = self._tree
+        next_frontier = []
+        examined = 0
+        for vertex in unvisited:
+            checked = 0  # Predecesores comprobados hasta encontrar uno en la frontera
+            for checked, predecessor in enumerate(predecessors(vertex), 1):
+                if predecessor in in_frontier:
+                    tree[vertex] = (predecessor, level + 1)
+                    next_frontier.append(vertex)
+                    break
+            examined += checked
+        unvisited.difference_update(next_frontier)
+        self._visited.update(next_frontier)
+        self._path.extend(next_frontier)
+        self._record_level(examined, next_frontier, level)
+        return next_frontier
+
+    def _record_level(self, examined: int, next_frontier: List, level: int):
+        """Guarda lo medido al expandir un nivel: aristas examinadas, tamaño de la frontera y profundidad."""
+        self._examined += examined
+        if next_frontier:
+            self._max_frontier = max(self._max_frontier, len(next_frontier))
+            self._max_depth = level + 1
+
+
+class RecorridoMinimo(Recorrido):
+    """Caminos mínimos ponderados (Dijkstra) con montículo binario y borrado perezoso.
+
+    Los pesos se leen con edge_weight del grafo; una arista sin peso cuenta como 1.
+    traverse hace el barrido completo desde un origen y traverse_to resuelve una consulta
+    punto a punto con búsqueda bidireccional, sin recorrer todo el grafo.
+    """
+
+    def __init__(self, grafo: Graph):
+        super().__init__(grafo)
+
+    @classmethod
+    def of(cls, grafo: Graph):
+        """Método de factoría para crear una nueva instancia de RecorridoMinimo."""
+        return cls(grafo)
+
+    def _record_stats(self):
+        """Dijkstra no avanza por niveles: la profundidad máxima se toma del índice del árbol."""
+        self._index()
+        self._max_depth = max(self._depths.values(), default=0)
+        super()._record_stats()
+
+    def _edge_cost(self, source: str, target: str) -> float:
+        """Coste de una arista al reparar el árbol: su peso."""
+        return self._cost(source, target)
+
+    def _cost(self, source: str, target: str) -> float:
+        """Devuelve el coste de la arista (source, target); se asume 1 si no tiene peso."""
+        weight = self._grafo.edge_weight(source, target)
+        if weight is None:
+            return 1
+        if weight < 0:
+            raise ValueError("Dijkstra no admite aristas con peso negativo.")
+        return weight
+
+    def traverse(self, source: str):
+        """Calcula los caminos mínimos desde source; el coste de cada vértice es su distancia real."""
+        if hasattr(self._grafo, 'successor_weights') and source in self._grafo.interner:
+            self._traverse_ids(source)
+            return
+        self._tree = {source: (None, 0)}  # Reinicia el árbol de recorrido
+        self._path = []  # Vértices en orden de asentamiento
+        self._visited = set()  # Vértices ya asentados
+        self._reset_measures()
+        successors = self._grafo.successors
+        tree = self._tree
+        visited = self._visited
+        tie = count()  # Desempate para no comparar vértices en el montículo
+        heap = [(0, next(tie), source)]
+        examined = 0
+        max_heap = 1
+        while heap:
+            cost, _, vertex = heappop(heap)
+            if vertex in visited:
+                continue  # Entrada obsoleta (borrado perezoso)
+            visited.add(vertex)
+            self._path.append(vertex)
+            neighbors = successors(vertex)
+            examined += len(neighbors)
+            for neighbor in neighbors:
+                if neighbor in visited:
+                    continue
+                new_cost = cost + self._cost(vertex, neighbor)
+                if neighbor not in tree or new_cost < tree[neighbor][1]:
+                    tree[neighbor] = (vertex, new_cost)
+                    heappush(heap, (new_cost, next(tie), neighbor))
+            if len(heap) > max_heap:
+                max_heap = len(heap)
+        self._examined = examined
+        self._max_frontier = max_heap
+
+    def _traverse_ids(self, source: str):
+        """Dijkstra sobre los identificadores enteros de un grafo.Graph o FrozenGraph.
+
+        Los pesos se leen de successor_weights, sin traducir vértices; el árbol con las claves
+        originales se construye una sola vez al final.
+        """
+        grafo = self._grafo
+        keys = grafo.interner._keys
+        successor_weights = grafo.successor_weights
+        start = grafo.interner.id_of(source)
+        self._reset_measures()
+        best = {start: (None, 0)}  # {vértice: (predecesor, coste)}, en orden de descubrimiento
+        settled = bytearray(len(keys))
+        order = []
+        tie = count()
+        heap = [(0, next(tie), start)]
+        examined = 0
+        max_heap = 1
+        while heap:
+            cost, _, vertex = heappop(heap)
+            if settled[vertex]:
+                continue  # Entrada obsoleta (borrado perezoso)
+            settled[vertex] = 1
+            order.append(vertex)
+            for neighbor, weight in successor_weights(vertex):
+                examined += 1
+                if settled[neighbor]:
+                    continue
+                if weight is None:
+                    weight = 1
+                elif weight < 0:
+                    raise ValueError("Dijkstra no admite aristas con peso negativo.")
+                new_cost = cost + weight
+                previous = best.get(neighbor)
+                if previous is None or new_cost < previous[1]:
+                    best[neighbor] = (vertex, new_cost)
+                    heappush(heap, (new_cost, next(tie), neighbor))
+            if len(heap) > max_heap:
+                max_heap = len(heap)
+        self._examined = examined
+        self._max_frontier = max_heap
+        # Traducción a las claves originales, solo en la frontera de la API
+        self._path = [keys[vertex] for vertex in order]
+        self._tree = {keys[vertex]: (None if parent is None else keys[parent], cost)
+                      for vertex, (parent, cost) in best.items()}
+        self._visited = set(self._path)
+
+    def traverse_to(self, source: str, target: str) -> Optional[List[str]]:
+        """Camino mínimo de source a target con Dijkstra bidireccional.
+
+        Se expande en cada paso la búsqueda con menos entradas pendientes y se para en cuanto
+        la suma de los mínimos de ambos montículos alcanza el mejor encuentro conocido. Deja en
+        _tree y _path solo el camino encontrado y lo devuelve, o None si target no es alcanzable.
+        """
+        self._tree = {}
+        self._path = []
+        self._visited = set()
+        self._reset_measures()
+        if source == target:
+            self._tree[source] = (None, 0)
+            self._path.append(source)
+            return [source]
+        # Índice 0: búsqueda hacia delante desde source; índice 1: hacia atrás desde target
+        dist = ({source: 0}, {target: 0})
+        parent = ({source: None}, {target: None})
+        settled = (set(), set())
+        tie = count()
+        heaps = ([(0, next(tie), source)], [(0, next(tie), target)])
+        neighbors = (self._grafo.successors, self._grafo.predecessors)
+        costs = (self._cost, lambda vertex, neighbor: self._cost(neighbor, vertex))
+        best = inf
+        meeting = None
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break  # Ningún camino pendiente puede mejorar el encuentro
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            cost, _, vertex = heappop(heaps[side])
+            if vertex in settled[side]:
+                continue
+            settled[side].add(vertex)
+            own, other = dist[side], dist[1 - side]
+            adjacent = neighbors[side](vertex)
+            self._examined += len(adjacent)
+            for neighbor in adjacent:
+                new_cost = cost + costs[side](vertex, neighbor)
+                if new_cost < own.get(neighbor, inf):
+                    own[neighbor] = new_cost
+                    parent[side][neighbor] = vertex
+                    heappush(heaps[side], (new_cost, next(tie), neighbor))
+                if neighbor in other and own[neighbor] + other[neighbor] < best:
+                    best = own[neighbor] + other[neighbor]
+                    meeting = neighbor
+            self._max_frontier = max(self._max_frontier, len(heaps[side]))
+        if meeting is None:
+            return None
+        path = []
+        vertex = meeting
+        while vertex is not None:
+            path.append(vertex)
+            vertex = parent[0][vertex]
+        path.reverse()
+        vertex = parent[1][meeting]
+        while vertex is not None:
+            path.append(vertex)
+            vertex = parent[1][vertex]
+        self._tree[source] = (None, 0)
+        for previous, vertex in zip(path, path[1:]):
+            self._tree[vertex] = (previous, self._tree[previous][1] + self._cost(previous, vertex))
+        self._path = path
+        self._visited = set(path)
+        return path
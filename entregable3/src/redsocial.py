@@ -1,30 +1,462 @@
-from typing import Dict, List
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import date
+from collections import deque
+from heapq import heapify, heappush, heappushpop, nlargest
+from concurrent.futures import ProcessPoolExecutor
+import gc
+import os
+import sys
+import time
+from array import array
 
-class E_grafo:
-    """Clase base para representar un grafo. Aquí implementaremos lo básico para Red_social."""
+import centralidad
+from componentes import DisjointSet
+import edades
+import exportacion
+from interner import VertexInterner
+from recorridos import RecorridoEnAnchura
+from instrumentacion import Estadisticas, desinstrumentar, estimar_bytes, instrumentar
+from snapshot import KIND_RED_SOCIAL, open_snapshot, pack_strings, string_at, write_snapshot
+from versiones import Versionado
+
+class _IndiceOrdenado:
+    """Índice ordenado de elementos (relaciones, usuarios) por una clave numérica, con inserciones amortizadas.
+
+    Las inserciones se acumulan en un búfer y se incorporan al consultar. Si hay pocas, cada
+    una se inserta con insort (búsqueda binaria y un desplazamiento de memoria), de modo que
+    alternar inserciones y consultas no cuesta una mezcla completa por consulta. Si hay
+    muchas, como en una carga masiva, se ordenan y se mezclan en una pasada: la lista ya
+    ordenada más el búfer ordenado son dos tramos que sort de Python une en tiempo lineal.
+    """
+    _MAX_INSORT = 32  # Pendientes a partir de los cuales compensa mezclar en lugar de insertar uno a uno
+
+    def __init__(self):
+        self._ordenadas: List[Tuple[float, int, object]] = []  # (clave, nº de inserción, elemento)
+        self._pendientes: List[Tuple[float, int, object]] = []
+
+    def add(self, clave: float, secuencia: int, elemento):
+        """Añade un elemento con su clave; el número de inserción desempata y mantiene el orden estable."""
+        self._pendientes.append((clave, secuencia, elemento))
+
+    def extend(self, entradas: Iterable[Tuple[float, int, object]]):
+        """Añade en bloque entradas (clave, nº de inserción, elemento), como add con cada una."""
+        self._pendientes.extend(entradas)
+
+    def ordenadas(self) -> List[Tuple[float, int, object]]:
+        """Devuelve la lista ordenada, incorporando antes las inserciones pendientes."""
+        pendientes = self._pendientes
+        if pendientes:
+            ordenadas = self._ordenadas
+            if len(pendientes) < self._MAX_INSORT:
+                for entrada in pendientes:
+                    insort(ordenadas, entrada)
+            else:
+                pendientes.sort()
+                ordenadas.extend(pendientes)
+                ordenadas.sort()
+            self._pendientes = []
+        return self._ordenadas
+
+    def __len__(self) -> int:
+        return len(self._ordenadas) + len(self._pendientes)
+
+
+class E_grafo(Versionado):
+    """Clase base para representar un grafo. Aquí implementaremos lo básico para Red_social.
+
+    Los usuarios se numeran por DNI con enteros densos (interner), en el orden de vertices, y
+    las adyacencias, las relaciones y las comunidades trabajan solo con esos enteros; los
+    DNIs y los usuarios se traducen en la interfaz pública.
+    """
+    TOP_K = 32  # Relaciones más fuertes que se mantienen por usuario para top_relaciones_de
     def __init__(self, tipo_grafo: str = 'no dirigido', tipo_recorrido: str = 'BACK'):
         self.tipo_grafo = tipo_grafo
         self.tipo_recorrido = tipo_recorrido
         self.vertices = {}  # Diccionario para almacenar los vértices (usuarios)
-        self.aristas = []   # Lista para almacenar las relaciones (aristas)
-    
+        self.interner = VertexInterner()  # Numeración de los usuarios: {dni: entero} y su inversa
+        self._usuarios: List['Usuario'] = []  # Usuario de cada entero
+        self._aristas: Dict[Tuple[int, int], dict] = {}  # Relaciones indexadas por par de enteros, en orden de inserción
+        self._vecinos: Dict[int, Dict[int, dict]] = {}  # {i: {j: relación}} (sucesores si es dirigido)
+        self._predecesores: Dict[int, Dict[int, dict]] = {}  # {j: {i: relación}} (solo si es dirigido)
+        self._componentes = DisjointSet()  # Comunidades (componentes conexas) por entero, al día con cada relación
+        self._stats: Optional[Estadisticas] = None  # Estadisticas mientras la instrumentación está activa
+        self._por_interacciones = _IndiceOrdenado()  # Clave -interacciones: las más fuertes primero
+        self._por_dias = _IndiceOrdenado()  # Clave dias_activa, para filtros por rango
+        # {i: montículo de sus TOP_K relaciones más fuertes, (interacciones, -nº, relación), la más débil en la raíz}
+        self._fuertes: Dict[int, List[Tuple[int, int, dict]]] = {}
+        self._listeners = []  # Funciones listener(source, target, relación) avisadas de cada relación nueva
+
+    @property
+    def dirigido(self) -> bool:
+        """Indica si las relaciones tienen sentido (tipo_grafo 'dirigido')."""
+        return self.tipo_grafo == 'dirigido'
+
+    @property
+    def aristas(self):
+        """Devuelve todas las relaciones en orden de inserción."""
+        return self._aristas.values()
+
+    @staticmethod
+    def _dni(vertex) -> str:
+        """Devuelve el DNI de un usuario; admite tanto el usuario como su DNI."""
+        return getattr(vertex, 'dni', vertex)
+
+    def _id(self, vertex) -> Optional[int]:
+        """Devuelve el entero de un usuario (o de su DNI), o None si no se ha numerado."""
+        return self.interner.id_of(getattr(vertex, 'dni', vertex))
+
+    def _clave(self, i: int, j: int) -> Tuple[int, int]:
+        """Devuelve la clave de una relación; en grafo no dirigido no depende del orden."""
+        if self.dirigido or i <= j:
+            return i, j
+        return j, i
+
     def add_vertex(self, vertex):
         """Agrega un vértice (usuario) al grafo."""
         if vertex.dni not in self.vertices:
+            if self._propios is not None:  # Hay una versión publicada: copia en escritura
+                self._preparar_escritura((('vertices', vertex.dni),))
             self.vertices[vertex.dni] = vertex
+            self._componentes.add(self.interner.intern(vertex.dni))
+            self._usuarios.append(vertex)
             return True
         return False
     
     def add_edge(self, source, target, interacciones, dias_activa):
-        """Agrega una arista (relación) entre dos usuarios."""
-        if source.dni in self.vertices and target.dni in self.vertices and source.dni != target.dni:
-            self.aristas.append({'source': source, 'target': target, 'interacciones': interacciones, 'dias_activa': dias_activa})
+        """Agrega una arista (relación) entre dos usuarios. Devuelve False si no es válida o ya existe."""
+        i, j = self.interner.id_of(source.dni), self.interner.id_of(target.dni)
+        if i is not None and j is not None and i != j:
+            clave = self._clave(i, j)
+            if clave in self._aristas:
+                return False
+            if self._propios is not None:
+                self._preparar_escritura((('_vecinos', i), ('_predecesores' if self.dirigido else '_vecinos', j)))
+            arista = {'source': source, 'target': target, 'interacciones': interacciones, 'dias_activa': dias_activa}
+            secuencia = len(self._aristas)
+            self._aristas[clave] = arista
+            self._componentes.union(i, j)
+            self._por_interacciones.add(-interacciones, secuencia, arista)
+            self._por_dias.add(dias_activa, secuencia, arista)
+            self._anotar_fuerte(i, (interacciones, -secuencia, arista))
+            self._anotar_fuerte(j, (interacciones, -secuencia, arista))
+            self._vecinos.setdefault(i, {})[j] = arista
+            if self.dirigido:
+                self._predecesores.setdefault(j, {})[i] = arista
+            else:
+                self._vecinos.setdefault(j, {})[i] = arista
+            for listener in self._listeners:
+                listener(source, target, arista)
             return True
         return False
 
+    def _add_edges_ids(self, filas: Iterable[Tuple[Optional[int], Optional[int], int, int]]) -> int:
+        """Inserta en bloque relaciones (entero origen, entero destino, interacciones, días); equivale a add_edge con cada una.
+
+        Las filas con un entero None (usuario desconocido), los bucles y las repetidas se
+        descartan. Se recorren una vez y los índices ordenados, los montículos de relaciones
+        fuertes y las comunidades se actualizan al final, una vez por lote. El recolector de
+        ciclos se pausa durante la carga. Devuelve el número de relaciones insertadas.
+        """
+        aristas, dirigido, usuarios = self._aristas, self.dirigido, self._usuarios
+        vecinos = self._vecinos
+        inversas = self._predecesores if dirigido else vecinos
+        if self._propios is not None:  # Se anuncian todas las filas: las descartadas solo cuestan una copia
+            filas = [fila for fila in filas if fila[0] is not None and fila[1] is not None]
+            cambios = {('_vecinos', fila[0]) for fila in filas}
+            cambios.update(('_predecesores' if dirigido else '_vecinos', fila[1]) for fila in filas)
+            self._preparar_escritura(cambios)
+        inicio = secuencia = len(aristas)
+        por_interacciones, por_dias, claves = [], [], []
+        candidatas: Dict[int, List[Tuple[int, int, dict]]] = {}  # Relaciones nuevas de cada usuario, para _fuertes
+        vecinos_get, inversas_get, candidatas_get = vecinos.get, inversas.get, candidatas.get
+        pausado = gc.isenabled()
+        gc.disable()
+        try:
+            for i, j, interacciones, dias_activa in filas:
+                if i is None or j is None or i == j:
+                    continue
+                clave = (i, j) if dirigido or i <= j else (j, i)
+                if clave in aristas:
+                    continue
+                arista = {'source': usuarios[i], 'target': usuarios[j], 'interacciones': interacciones,
+                          'dias_activa': dias_activa}
+                aristas[clave] = arista
+                claves.append(clave)
+                por_interacciones.append((-interacciones, secuencia, arista))
+                por_dias.append((dias_activa, secuencia, arista))
+                fila = vecinos_get(i)
+                if fila is None:
+                    vecinos[i] = {j: arista}
+                else:
+                    fila[j] = arista
+                fila = inversas_get(j)
+                if fila is None:
+                    inversas[j] = {i: arista}
+                else:
+                    fila[i] = arista
+                entrada = (interacciones, -secuencia, arista)
+                lista = candidatas_get(i)
+                if lista is None:
+                    candidatas[i] = [entrada]
+                else:
+                    lista.append(entrada)
+                lista = candidatas_get(j)
+                if lista is None:
+                    candidatas[j] = [entrada]
+                else:
+                    lista.append(entrada)
+                secuencia += 1
+
+            self._por_interacciones.extend(por_interacciones)
+            self._por_dias.extend(por_dias)
+            for i, entradas in candidatas.items():
+                self._fusionar_fuertes(i, entradas)
+            self._componentes.union_all(claves)
+        finally:
+            if pausado:
+                gc.enable()
+
+        for _, _, arista in por_interacciones:
+            for listener in self._listeners:
+                listener(arista['source'], arista['target'], arista)
+        return secuencia - inicio
+
+    def _fusionar_fuertes(self, i: int, entradas: List[Tuple[int, int, dict]]):
+        """Incorpora al montículo del usuario varias relaciones nuevas de una vez; queda como con _anotar_fuerte."""
+        fuertes = self._fuertes.get(i)
+        if fuertes:
+            entradas.extend(fuertes)
+        if len(entradas) > self.TOP_K:
+            entradas = nlargest(self.TOP_K, entradas)
+        heapify(entradas)
+        self._fuertes[i] = entradas
+
+    def _anotar_fuerte(self, i: int, entrada: Tuple[int, int, dict]):
+        """Añade una relación al montículo del usuario; si ya tiene TOP_K, sustituye a la más débil en O(log TOP_K)."""
+        fuertes = self._fuertes.get(i)
+        if fuertes is None:
+            self._fuertes[i] = [entrada]
+        elif len(fuertes) < self.TOP_K:
+            heappush(fuertes, entrada)
+        elif entrada > fuertes[0]:
+            heappushpop(fuertes, entrada)
+
+    def subscribe(self, listener):
+        """Registra una función listener(source, target, relación) que se llama tras añadir cada relación nueva."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Da de baja una función registrada con subscribe."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def top_relaciones(self, k: int) -> List[dict]:
+        """Devuelve las k relaciones con más interacciones (en empate, las más antiguas primero)."""
+        return [arista for _, _, arista in self._por_interacciones.ordenadas()[:k]]
+
+    def relaciones_activas(self, min_dias: int, max_dias: Optional[int] = None) -> List[dict]:
+        """Devuelve las relaciones con min_dias <= dias_activa <= max_dias, ordenadas por días, en O(log n + k)."""
+        ordenadas = self._por_dias.ordenadas()
+        inicio = bisect_left(ordenadas, (min_dias, -1))
+        fin = len(ordenadas) if max_dias is None else bisect_left(ordenadas, (max_dias + 1, -1), inicio)
+        return [arista for _, _, arista in ordenadas[inicio:fin]]
+
+    def top_relaciones_de(self, vertex, k: int) -> List[dict]:
+        """Devuelve las k relaciones más fuertes (por interacciones) de un usuario, en ambos sentidos.
+
+        Hasta TOP_K se responden desde el montículo del usuario, en O(TOP_K log TOP_K); en empate
+        van primero las más antiguas. Para k mayores se recorren sus relaciones en O(grado log k).
+        """
+        i = self._id(vertex)
+        fuertes = self._fuertes.get(i, [])
+        if k <= len(fuertes) or len(fuertes) < self.TOP_K:  # El montículo basta (o tiene todas sus relaciones)
+            return [arista for _, _, arista in sorted(fuertes, reverse=True)[:k]]
+        relaciones = list(self._vecinos.get(i, {}).values()) + list(self._predecesores.get(i, {}).values())
+        return nlargest(k, relaciones, key=lambda arista: arista['interacciones'])
+
+    def edge(self, source, target) -> Optional[dict]:
+        """Devuelve la relación entre dos usuarios (o sus DNIs), o None si no existe."""
+        i, j = self._id(source), self._id(target)
+        if i is None or j is None:
+            return None
+        return self._aristas.get(self._clave(i, j))
+
+    def contains_edge(self, source, target) -> bool:
+        """Verifica si existe una relación entre dos usuarios (o sus DNIs)."""
+        return self.edge(source, target) is not None
+
+    def relaciones(self, vertex) -> Dict[str, dict]:
+        """Devuelve las relaciones de un usuario como {dni vecino: relación} (salientes si es dirigido)."""
+        keys = self.interner._keys
+        return {keys[j]: arista for j, arista in self._vecinos.get(self._id(vertex), {}).items()}
+
+    def neighbors(self, vertex) -> Iterator:
+        """Itera sobre los usuarios relacionados con un usuario (sucesores si es dirigido)."""
+        usuarios = self._usuarios
+        return (usuarios[j] for j in self._vecinos.get(self._id(vertex), ()))
+
+    def predecessors(self, vertex) -> Iterator:
+        """Itera sobre los usuarios con una relación hacia el dado (vecinos si no es dirigido)."""
+        if not self.dirigido:
+            return self.neighbors(vertex)
+        usuarios = self._usuarios
+        return (usuarios[i] for i in self._predecesores.get(self._id(vertex), ()))
+
+    def degree(self, vertex) -> int:
+        """Devuelve el número de relaciones en las que participa un usuario."""
+        i = self._id(vertex)
+        return len(self._vecinos.get(i, ())) + len(self._predecesores.get(i, ()))
+
+    def camino_mas_corto(self, source, target, max_saltos: Optional[int] = None) -> Optional[List['Usuario']]:
+        """Devuelve los usuarios del camino con menos relaciones de source a target, o None si no lo hay.
+
+        Los grados de separación son len(camino) - 1. Usa BFS bidireccional
+        (RecorridoEnAnchura.traverse_to) directamente sobre los enteros de los usuarios; con
+        max_saltos se descartan los caminos más largos.
+        """
+        dni_a, dni_b = self._dni(source), self._dni(target)
+        if dni_a not in self.vertices or dni_b not in self.vertices:
+            return None
+        camino = RecorridoEnAnchura.of(_AdyacenciaIds(self)).traverse_to(self._id(dni_a), self._id(dni_b), max_saltos)
+        return None if camino is None else [self._usuarios[i] for i in camino]
+
+    # Copia en escritura (ver Versionado): las relaciones, los índices y las comunidades no se comparten;
+    # el interner y _usuarios solo crecen y las versiones no llegan a los enteros posteriores
+    _COMPARTIDOS = ('vertices', '_vecinos', '_predecesores')
+
+    def _crear_version(self, numero):
+        """Crea la versión publicada número 'numero' (ver publish)."""
+        return VersionRedSocial(self, numero)
+
+    _METODOS_CONTADOS = ('add_vertex', 'add_edge', 'edge', 'contains_edge', 'relaciones',
+                         'neighbors', 'predecessors', 'degree', 'top_relaciones', 'relaciones_activas',
+                         'top_relaciones_de')
+
+    def enable_stats(self, hook=None) -> Estadisticas:
+        """Activa la instrumentación: cuenta las llamadas a los métodos de consulta y modificación.
+
+        hook(nombre, valor), si se indica, recibe cada dato registrado. Desactivada no tiene coste.
+        """
+        self.disable_stats()
+        self._stats = Estadisticas(hook)
+        instrumentar(self, self._stats, contados=self._METODOS_CONTADOS)
+        return self._stats
+
+    def disable_stats(self):
+        """Desactiva la instrumentación y descarta los datos registrados."""
+        desinstrumentar(self, self._METODOS_CONTADOS)
+        self._stats = None
+
+    def stats(self) -> dict:
+        """Devuelve los datos de instrumentación y una estimación del tamaño de los índices."""
+        datos = {} if self._stats is None else self._stats.as_dict()
+        num_aristas = len(self._aristas)
+        bytes_vertices = estimar_bytes(self.vertices, self.interner._ids, self.interner._keys, self._usuarios,
+                                       self._vecinos, self._predecesores)
+        bytes_aristas = estimar_bytes(self._aristas) + sys.getsizeof((None, None)) * num_aristas
+        datos.update({
+            'vertices': len(self.vertices),
+            'aristas': num_aristas,
+            'bytes_por_vertice': bytes_vertices / len(self.vertices) if self.vertices else 0.0,
+            'bytes_por_arista': bytes_aristas / num_aristas if num_aristas else 0.0,
+        })
+        return datos
+
+    def same_component(self, a, b) -> bool:
+        """Indica si dos usuarios (o DNIs) están en la misma comunidad."""
+        return self._componentes.same(self._id(a), self._id(b))
+
+    def component_of(self, vertex) -> Optional[str]:
+        """Devuelve el DNI representante de la comunidad de un usuario, o None si no está en la red."""
+        raiz = self._componentes.find(self._id(vertex))
+        return None if raiz is None else self.interner._keys[raiz]
+
+    def component_sizes(self) -> Dict[str, int]:
+        """Devuelve {DNI representante: número de usuarios} de cada comunidad."""
+        keys = self.interner._keys
+        return {keys[raiz]: tamaño for raiz, tamaño in self._componentes.sizes().items()}
+
+    def component_count(self) -> int:
+        """Devuelve el número de comunidades."""
+        return self._componentes.count()
+
+class VersionRedSocial:
+    """Versión publicada de una red (ver E_grafo.publish): de solo lectura y consistente.
+
+    Ve los usuarios y adyacencias de la red a través de vistas (ver VistaVersion), sin
+    copiarlos, y comparte su numeración de usuarios, de modo que se puede consultar desde
+    otros hilos sin bloqueos. Las relaciones se obtienen de las adyacencias, no en orden de
+    inserción.
+    """
+
+    def __init__(self, red: E_grafo, version: int):
+        self.tipo_grafo = red.tipo_grafo
+        self.version = version  # Número de versión, creciente
+        self.interner = red.interner
+        self._usuarios = red._usuarios
+        self.vertices = red._vista('vertices')
+        self._vecinos = red._vista('_vecinos')
+        self._predecesores = red._vista('_predecesores')
+
+    @property
+    def usuarios_dni(self) -> Dict[str, 'Usuario']:
+        """Usuarios indexados por su DNI."""
+        return self.vertices
+
+    @property
+    def aristas(self) -> Iterator[dict]:
+        """Itera sobre todas las relaciones de la versión, cada una una vez."""
+        keys = self.interner._keys
+        for i, relaciones in self._vecinos.items():
+            for arista in relaciones.values():
+                if arista['source'].dni == keys[i]:
+                    yield arista
+
+    def edge(self, source, target) -> Optional[dict]:
+        """Devuelve la relación entre dos usuarios (o sus DNIs), o None si no existe."""
+        return self._vecinos.get(self._id(source), {}).get(self._id(target))
+
+    def contains_edge(self, source, target) -> bool:
+        """Verifica si existe una relación entre dos usuarios (o sus DNIs)."""
+        return self.edge(source, target) is not None
+
+    dirigido = E_grafo.dirigido
+    _dni = staticmethod(E_grafo._dni)
+    _id = E_grafo._id
+    relaciones = E_grafo.relaciones
+    neighbors = E_grafo.neighbors
+    predecessors = E_grafo.predecessors
+    degree = E_grafo.degree
+    camino_mas_corto = E_grafo.camino_mas_corto
+
+
+class _AdyacenciaIds:
+    """Adapta una red (o una versión) a la interfaz de grafo de los recorridos, con los enteros de los usuarios como vértices."""
+
+    def __init__(self, red):
+        self._red = red
+
+    def successors(self, i: int):
+        """Enteros de los usuarios relacionados con i (destinos si la red es dirigida)."""
+        return self._red._vecinos.get(i, {})
+
+    def predecessors(self, i: int):
+        """Enteros de los usuarios con una relación hacia i (vecinos si la red no es dirigida)."""
+        if self._red.dirigido:
+            return self._red._predecesores.get(i, {})
+        return self.successors(i)
+
+    def vertex_set(self):
+        """Enteros de todos los usuarios."""
+        return range(len(self._red.vertices))
+
+
 class Usuario:
     """Clase que representa un usuario en el sistema."""
+    __slots__ = ('dni', 'nombre', 'apellidos', 'fecha_nacimiento')
+
     def __init__(self, dni: str, nombre: str, apellidos: str, fecha_nacimiento: date):
         self.dni = dni
         self.nombre = nombre
@@ -44,6 +476,7 @@ class Usuario:
 
 class Relacion:
     """Clase que representa una relación entre dos usuarios."""
+    __slots__ = ('id', 'interacciones', 'dias_activa')
     _xx_num = 0
     
     def __init__(self, interacciones: int, dias_activa: int):
@@ -61,26 +494,116 @@ class Red_social(E_grafo):
     
     def __init__(self, tipo_grafo: str = 'no dirigido', tipo_recorrido: str = 'BACK'):
         super().__init__(tipo_grafo, tipo_recorrido)
-        self.usuarios_dni: Dict[str, Usuario] = {}  # Diccionario para almacenar los usuarios indexados por su DNI
+        self.estadisticas_carga: Optional[EstadisticasCarga] = None  # Resultado de la última carga masiva
+        self._nacimientos = array('i')  # Ordinal de la fecha de nacimiento de cada usuario, en el orden de vertices
+        self._por_nacimiento = _IndiceOrdenado()  # Usuarios por ordinal de nacimiento, para rangos de edad
     
+    @property
+    def usuarios_dni(self) -> Dict[str, Usuario]:
+        """Usuarios indexados por su DNI (el mismo diccionario que vertices)."""
+        return self.vertices
+
     @classmethod
     def of(cls, tipo_grafo: str = 'no dirigido', tipo_recorrido: str = 'BACK') -> 'Red_social':
         """Método de factoría que crea una nueva instancia de Red_social."""
         return cls(tipo_grafo, tipo_recorrido)
     
+    def add_vertex(self, vertex):
+        """Agrega un usuario y lo registra en el índice de fechas de nacimiento."""
+        if super().add_vertex(vertex):
+            ordinal = vertex.fecha_nacimiento.toordinal()
+            self._por_nacimiento.add(ordinal, len(self._nacimientos), vertex)
+            self._nacimientos.append(ordinal)
+            return True
+        return False
+
+    def usuarios_por_edad(self, min_edad: int, max_edad: int, referencia: Optional[date] = None) -> List[Usuario]:
+        """Devuelve los usuarios con min_edad <= edad <= max_edad en referencia (hoy por defecto), del mayor al menor.
+
+        Es una búsqueda binaria sobre el índice de fechas de nacimiento: O(log n + k).
+        """
+        referencia = referencia or date.today()
+        ordenados = self._por_nacimiento.ordenadas()
+        # Edad >= min_edad si se nació como tarde en la fecha límite; edad <= max_edad si después de la de max_edad + 1
+        fin = bisect_right(ordenados, (edades.fecha_limite(referencia, min_edad).toordinal(), len(ordenados)))
+        inicio = bisect_right(ordenados, (edades.fecha_limite(referencia, max_edad + 1).toordinal(), len(ordenados)), 0, fin)
+        return [usuario for _, _, usuario in ordenados[inicio:fin]]
+
+    def edades(self, referencia: Optional[date] = None):
+        """Calcula de una vez la edad en referencia (hoy por defecto) de todos los usuarios, en el orden de vertices.
+
+        Con NumPy devuelve un ndarray; sin él, un array('i').
+        """
+        return edades.edades(self._nacimientos, referencia or date.today())
+
+    def histograma_edades(self, ancho: int = 10, referencia: Optional[date] = None) -> Dict[int, int]:
+        """Devuelve {edad inicial del tramo: número de usuarios} con tramos de 'ancho' años."""
+        return edades.histograma(self.edades(referencia), ancho)
+
+    def edad_media_por_comunidad(self, referencia: Optional[date] = None) -> Dict[str, float]:
+        """Devuelve la edad media de cada comunidad (componente conexa), indexada por su representante."""
+        medias = edades.media_por_grupo(self.edades(referencia), map(self._componentes.find, range(len(self._usuarios))))
+        keys = self.interner._keys
+        return {keys[raiz]: media for raiz, media in medias.items()}
+
+    def _csr(self, peso: str = 'interacciones') -> Tuple[VertexInterner, array, array, array]:
+        """Construye la adyacencia CSR (interner de DNIs, offsets, destinos, pesos) ponderada por peso."""
+        if peso not in ('interacciones', 'dias_activa'):
+            raise ValueError("Peso no válido. Use 'interacciones' o 'dias_activa'.")
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+        vecinos_get = self._vecinos.get
+        for i in range(len(self._usuarios)):
+            fila = vecinos_get(i)
+            if fila:
+                targets.extend(fila)  # Las filas ya están numeradas: se copian sin traducir
+                weights.extend(arista[peso] for arista in fila.values())
+            offsets.append(len(targets))
+        return VertexInterner(self.interner), offsets, targets, weights
+
+    def to_sparse(self, peso: str = 'interacciones'):
+        """Devuelve (matriz, interner): la adyacencia como scipy.sparse.csr_matrix y el índice de DNIs.
+
+        peso es 'interacciones' o 'dias_activa'. En una red no dirigida la matriz es simétrica. Requiere SciPy.
+        """
+        interner, offsets, targets, weights = self._csr(peso)
+        return centralidad.matriz_csr(offsets, targets, weights), interner
+
+    def _por_usuario(self, valores) -> Dict[Usuario, float]:
+        """Asocia cada valor, en el orden de vertices, con su usuario."""
+        return dict(zip(self.vertices.values(), valores))
+
+    def centralidad_grado(self) -> Dict[Usuario, float]:
+        """Devuelve el grado de cada usuario (entrada más salida si es dirigida) dividido entre V - 1."""
+        _, offsets, targets, _ = self._csr()
+        return self._por_usuario(centralidad.centralidad_grado(offsets, targets, self.dirigido))
+
+    def pagerank(self, peso: str = 'interacciones', amortiguacion: float = 0.85, tolerancia: float = 1e-10,
+                 max_iter: int = 100) -> Dict[Usuario, float]:
+        """Devuelve el PageRank de cada usuario, ponderado por peso (vectorizado si SciPy está instalado)."""
+        _, offsets, targets, weights = self._csr(peso)
+        return self._por_usuario(centralidad.pagerank(offsets, targets, weights, amortiguacion, tolerancia, max_iter))
+
+    def centralidad_autovector(self, peso: str = 'interacciones', tolerancia: float = 1e-10,
+                               max_iter: int = 1000) -> Dict[Usuario, float]:
+        """Devuelve la centralidad de autovector de cada usuario, ponderada por peso (vectorizada si SciPy está instalado)."""
+        _, offsets, targets, weights = self._csr(peso)
+        return self._por_usuario(centralidad.centralidad_autovector(offsets, targets, weights, tolerancia, max_iter))
+
     @classmethod
     def parse(cls, usuarios_file: str, relaciones_file: str) -> 'Red_social':
         """Método de factoría que lee los archivos y crea una instancia de Red_social."""
         red_social = cls()
         
         # Leer usuarios desde el archivo
-        with open(usuarios, 'r') as f:
+        with exportacion.abrir(usuarios_file) as f:
             for line in f:
                 usuario = Usuario.parse(line.strip())
                 red_social.add_vertex(usuario)
         
         # Leer relaciones desde el archivo
-        with open(relaciones_file, 'r') as f:
+        with exportacion.abrir(relaciones_file) as f:
             for line in f:
                 dni_origen, dni_destino, interacciones, dias_activa = line.strip().split(',')
                 interacciones = int(interacciones)
@@ -93,13 +616,363 @@ class Red_social(E_grafo):
                     red_social.add_edge(usuario_origen, usuario_destino, interacciones, dias_activa)
         
         return red_social
+
+    @classmethod
+    def parse_bulk(cls, usuarios_file: str, relaciones_file: str, workers: Optional[int] = None,
+                   chunk_bytes: int = 1 << 22, tipo_grafo: str = 'no dirigido',
+                   tipo_recorrido: str = 'BACK') -> 'Red_social':
+        """Carga masiva: lee los ficheros por bloques y parsea las relaciones en un pool de procesos.
+
+        Los procesos reciben una vez la numeración de usuarios {DNI: entero} y devuelven cada
+        bloque como columnas de enteros (array), que se insertan con un lote por bloque sin
+        volver a traducir DNIs. Sin workers se usa
+        el pool solo si hay varias CPU y varios bloques (ver _workers_por_defecto). Las filas mal
+        formadas, las relaciones con DNIs desconocidos y las repetidas se descartan y se cuentan.
+        El resumen queda en red_social.estadisticas_carga.
+        """
+        red_social = cls(tipo_grafo, tipo_recorrido)
+        estadisticas = EstadisticasCarga()
+        inicio = time.perf_counter()
+
+        # Los usuarios se crean en este proceso: son los objetos que guarda la red
+        for lineas in _bloques(usuarios_file, chunk_bytes):
+            for line in lineas:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    usuario = Usuario.parse(line)
+                except ValueError:
+                    estadisticas.usuarios_rechazados += 1
+                    continue
+                if red_social.add_vertex(usuario):
+                    estadisticas.usuarios += 1
+                else:
+                    estadisticas.usuarios_rechazados += 1
+
+        # Las relaciones se parsean por bloques (en paralelo si workers > 1) y se insertan por lotes
+        ids = red_social.interner._ids
+        if workers is None:
+            workers = _workers_por_defecto(relaciones_file, chunk_bytes)
+        bloques = _bloques(relaciones_file, chunk_bytes)
+        for origenes, destinos, interacciones, dias, rechazadas in _map_bloques(_parse_relaciones, bloques, workers, ids):
+            estadisticas.relaciones_rechazadas += rechazadas
+            insertadas = red_social._add_edges_ids(zip(origenes, destinos, interacciones, dias))
+            estadisticas.relaciones += insertadas
+            estadisticas.relaciones_rechazadas += len(origenes) - insertadas
+
+        estadisticas.segundos = time.perf_counter() - inicio
+        red_social.estadisticas_carga = estadisticas
+        return red_social
+
+    def _add_edges_batch(self, filas: Iterable[Tuple[str, str, int, int]]) -> int:
+        """Inserta un lote de relaciones (dni origen, dni destino, interacciones, días). Devuelve las insertadas."""
+        ids = self.interner._ids
+        return self._add_edges_ids((ids.get(dni_origen), ids.get(dni_destino), interacciones, dias_activa)
+                                   for dni_origen, dni_destino, interacciones, dias_activa in filas)
     
+    def save_snapshot(self, path: str):
+        """Guarda la red en una instantánea binaria versionada que se puede cargar con mmap.
+
+        Contiene la tabla de usuarios (pool de cadenas para DNI, nombre y apellidos, fechas
+        de nacimiento como ordinales y un índice ordenado por DNI) y las relaciones en CSR
+        por usuario origen, con columnas de interacciones y días activa.
+        """
+        usuarios = self._usuarios
+        indice = self.interner._ids
+        n = len(usuarios)
+        pool_offsets, pool_data = pack_strings(
+            campo for usuario in usuarios for campo in (usuario.dni, usuario.nombre, usuario.apellidos))
+        nacimiento = array('i', (usuario.fecha_nacimiento.toordinal() for usuario in usuarios))
+        orden_dni = array('i', sorted(range(n), key=lambda i: usuarios[i].dni))
+
+        # CSR directo por origen (ordenación por cuentas) conservando el orden de inserción en cada fila
+        aristas = list(self.aristas)
+        origenes = [indice[arista['source'].dni] for arista in aristas]
+        destinos = [indice[arista['target'].dni] for arista in aristas]
+        offsets = _offsets_csr(origenes, n)
+        siguiente = offsets[:-1]
+        m = len(aristas)
+        targets = array('i', bytes(4 * m))
+        interacciones = array('q', bytes(8 * m))
+        dias = array('q', bytes(8 * m))
+        rango = array('q', bytes(8 * m))  # Posición de cada relación en el orden de inserción
+        for r, arista in enumerate(aristas):
+            k = siguiente[origenes[r]]
+            siguiente[origenes[r]] += 1
+            targets[k] = destinos[r]
+            interacciones[k] = arista['interacciones']
+            dias[k] = arista['dias_activa']
+            rango[k] = r
+
+        # CSR inverso por destino: guarda la posición de cada relación en el CSR directo
+        rev_offsets = _offsets_csr(destinos, n)
+        siguiente = rev_offsets[:-1]
+        rev_pos = array('q', bytes(8 * m))
+        for origen in range(n):
+            for k in range(offsets[origen], offsets[origen + 1]):
+                destino = targets[k]
+                rev_pos[siguiente[destino]] = k
+                siguiente[destino] += 1
+
+        write_snapshot(path, KIND_RED_SOCIAL, (int(self.dirigido), n, m),
+                       [pool_offsets, pool_data, nacimiento, orden_dni,
+                        offsets, targets, interacciones, dias, rango, rev_offsets, rev_pos])
+
+    @staticmethod
+    def load_snapshot(path: str) -> 'InstantaneaRedSocial':
+        """Carga una instantánea con mmap como vista perezosa de solo lectura (ver InstantaneaRedSocial)."""
+        return InstantaneaRedSocial(path)
+
+    def exportar_csv(self, usuarios_file, relaciones_file, comprimir: bool = False):
+        """Escribe los CSV de usuarios y relaciones que lee parse (rutas, .gz incluidos, o ficheros abiertos)."""
+        exportacion.exportar_csv(self, usuarios_file, relaciones_file, comprimir)
+
+    def exportar_jsonl(self, destino, comprimir: bool = False):
+        """Escribe la red en JSON Lines: un objeto por usuario y otro por relación."""
+        exportacion.exportar_jsonl(self, destino, comprimir)
+
+    def exportar_graphml(self, destino, comprimir: bool = False):
+        """Escribe la red en GraphML para herramientas externas."""
+        exportacion.exportar_graphml(self, destino, comprimir)
+
     def __str__(self):
         """Representación en cadena de la red social, mostrando los usuarios y sus relaciones."""
-        resultado = "Usuarios en la red social:\n"
-        for usuario in self.vertices.values():
-            resultado += f"{usuario}\n"
-        resultado += "\nRelaciones:\n"
-        for arista in self.aristas:
-            resultado += f"{arista}\n"
-        return resultado
+        sentido = '->' if self.dirigido else '--'
+        partes = ["Usuarios en la red social:\n"]
+        partes.extend(f"{usuario}\n" for usuario in self.vertices.values())
+        partes.append("\nRelaciones:\n")
+        partes.extend(f"{a['source'].dni} {sentido} {a['target'].dni} (días activa: {a['dias_activa']}"
+                      f" - num interacciones: {a['interacciones']})\n" for a in self.aristas)
+        return "".join(partes)
+
+
+
+class EstadisticasCarga:
+    """Resumen de una carga masiva de Red_social."""
+
+    def __init__(self):
+        self.usuarios = 0
+        self.relaciones = 0
+        self.usuarios_rechazados = 0
+        self.relaciones_rechazadas = 0
+        self.segundos = 0.0
+
+    @property
+    def filas_por_segundo(self) -> float:
+        """Filas procesadas (aceptadas y rechazadas) por segundo."""
+        filas = self.usuarios + self.relaciones + self.usuarios_rechazados + self.relaciones_rechazadas
+        return filas / self.segundos if self.segundos > 0 else 0.0
+
+    def __str__(self):
+        """Representación en cadena del resumen de la carga."""
+        return (f"{self.usuarios} usuarios ({self.usuarios_rechazados} rechazados), "
+                f"{self.relaciones} relaciones ({self.relaciones_rechazadas} rechazadas) "
+                f"en {self.segundos:.2f} s - {self.filas_por_segundo:.0f} filas/s")
+
+
+def _bloques(path: str, chunk_bytes: int) -> Iterator[List[str]]:
+    """Lee un fichero de texto (o .gz) en bloques de líneas completas de unos chunk_bytes bytes."""
+    with exportacion.abrir(path) as f:
+        while True:
+            lineas = f.readlines(chunk_bytes)
+            if not lineas:
+                return
+            yield lineas
+
+
+def _parse_relaciones(lineas: List[str], ids: Dict[str, int]) -> Tuple[array, array, array, array, int]:
+    """Parsea un bloque de líneas de relaciones, con los DNIs traducidos a su número en ids.
+
+    Devuelve las columnas (origen, destino, interacciones, días) de las filas válidas y el
+    número de filas rechazadas (mal formadas o con un DNI desconocido).
+    """
+    origenes, destinos, interacciones, dias = array('i'), array('i'), array('q'), array('q')
+    rechazadas = 0
+    for line in lineas:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            dni_origen, dni_destino, num_interacciones, dias_activa = line.split(',')
+            origen, destino = ids[dni_origen], ids[dni_destino]
+            interacciones.append(int(num_interacciones))
+            dias.append(int(dias_activa))
+        except (KeyError, ValueError, OverflowError):
+            del interacciones[len(origenes):]  # Si ha fallado dias, deshace interacciones
+            rechazadas += 1
+            continue
+        origenes.append(origen)
+        destinos.append(destino)
+    return origenes, destinos, interacciones, dias, rechazadas
+
+
+def _workers_por_defecto(path: str, chunk_bytes: int) -> int:
+    """Procesos para parsear path: el pool solo compensa con varias CPU y al menos un bloque por proceso."""
+    bloques = os.path.getsize(path) // chunk_bytes + 1
+    return max(1, min(os.cpu_count() or 1, bloques))
+
+
+_CONTEXTO = None  # Datos de solo lectura de _map_bloques en cada proceso del pool
+
+
+def _iniciar_trabajador(contexto):
+    """Inicializador del pool: guarda el contexto una vez por proceso."""
+    global _CONTEXTO
+    _CONTEXTO = contexto
+
+
+def _en_trabajador(funcion, bloque):
+    """Aplica funcion a un bloque con el contexto del proceso."""
+    return funcion(bloque, _CONTEXTO)
+
+
+def _map_bloques(funcion, bloques: Iterable, workers: int, contexto=None) -> Iterator:
+    """Aplica funcion(bloque, contexto) a cada bloque conservando el orden; con workers > 1 usa un pool de procesos.
+
+    El contexto se envía a cada proceso una sola vez, no con cada bloque. Como mucho hay
+    2 * workers bloques en vuelo, de modo que la memoria no depende del tamaño del fichero.
+    """
+    if workers <= 1:
+        for bloque in bloques:
+            yield funcion(bloque, contexto)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_trabajador, initargs=(contexto,)) as pool:
+        pendientes = deque()
+        for bloque in bloques:
+            pendientes.append(pool.submit(_en_trabajador, funcion, bloque))
+            if len(pendientes) >= 2 * workers:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+
+def _offsets_csr(filas: List[int], n: int) -> array:
+    """Calcula los offsets de un CSR de n filas a partir de la fila de cada entrada."""
+    offsets = array('q', bytes(8 * (n + 1)))
+    for fila in filas:
+        offsets[fila + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    return offsets
+
+
+class InstantaneaRedSocial:
+    """Vista perezosa, de solo lectura, de una Red_social guardada con save_snapshot.
+
+    Las tablas se leen del fichero proyectado en memoria y los objetos Usuario y las
+    relaciones se crean solo al consultarlos, así que cargarla no depende del tamaño de la red.
+    """
+
+    def __init__(self, path: str):
+        self._mmap, (dirigido, n, m), secciones = open_snapshot(path, KIND_RED_SOCIAL)
+        self.dirigido = bool(dirigido)
+        self._n = n
+        self._m = m
+        (self._pool_offsets, self._pool_data, self._nacimiento, self._orden_dni,
+         self._offsets, self._targets, self._interacciones, self._dias, self._rango,
+         self._rev_offsets, self._rev_pos) = secciones
+
+    def __len__(self) -> int:
+        """Número de usuarios de la red."""
+        return self._n
+
+    @property
+    def num_relaciones(self) -> int:
+        """Número de relaciones de la red."""
+        return self._m
+
+    def _campo(self, i: int, campo: int) -> str:
+        """Devuelve el campo (0 DNI, 1 nombre, 2 apellidos) del usuario i."""
+        return string_at(self._pool_offsets, self._pool_data, 3 * i + campo)
+
+    def _indice(self, dni: str) -> Optional[int]:
+        """Busca por bisección en el índice ordenado el número de usuario de un DNI."""
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._campo(self._orden_dni[mid], 0) < dni:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n and self._campo(self._orden_dni[lo], 0) == dni:
+            return self._orden_dni[lo]
+        return None
+
+    def _usuario_en(self, i: int) -> Usuario:
+        """Crea el Usuario de la posición i de la tabla."""
+        return Usuario(self._campo(i, 0), self._campo(i, 1), self._campo(i, 2),
+                       date.fromordinal(self._nacimiento[i]))
+
+    def usuario(self, dni: str) -> Optional[Usuario]:
+        """Devuelve el usuario con el DNI dado, o None si no está en la red."""
+        i = self._indice(dni)
+        return None if i is None else self._usuario_en(i)
+
+    def usuarios(self) -> Iterator[Usuario]:
+        """Itera sobre todos los usuarios en el orden en que se guardaron."""
+        return (self._usuario_en(i) for i in range(self._n))
+
+    def _relacion(self, k: int, origen: int) -> dict:
+        """Crea el diccionario de la relación en la posición k del CSR directo."""
+        return {'source': self._usuario_en(origen), 'target': self._usuario_en(self._targets[k]),
+                'interacciones': self._interacciones[k], 'dias_activa': self._dias[k]}
+
+    def _entradas(self, i: int) -> Iterator[Tuple[int, int, int]]:
+        """Itera sobre (vecino, posición en el CSR directo, origen) de las relaciones del usuario i."""
+        for k in range(self._offsets[i], self._offsets[i + 1]):
+            yield self._targets[k], k, i
+        if not self.dirigido:
+            for j in range(self._rev_offsets[i], self._rev_offsets[i + 1]):
+                k = self._rev_pos[j]
+                yield self._origen(k), k, self._origen(k)
+
+    def _origen(self, k: int) -> int:
+        """Devuelve el usuario origen de la posición k del CSR directo (bisección sobre offsets)."""
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._offsets[mid + 1] <= k:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def relaciones(self, dni: str) -> Dict[str, dict]:
+        """Devuelve las relaciones de un usuario como {dni vecino: relación}, como Red_social.relaciones."""
+        i = self._indice(dni)
+        if i is None:
+            return {}
+        return {self._campo(vecino, 0): self._relacion(k, origen) for vecino, k, origen in self._entradas(i)}
+
+    def degree(self, dni: str) -> int:
+        """Devuelve el número de relaciones en las que participa un usuario."""
+        i = self._indice(dni)
+        if i is None:
+            return 0
+        return (self._offsets[i + 1] - self._offsets[i]) + (self._rev_offsets[i + 1] - self._rev_offsets[i])
+
+    def contains_edge(self, source: str, target: str) -> bool:
+        """Verifica si existe una relación entre dos DNIs."""
+        i, j = self._indice(source), self._indice(target)
+        if i is None or j is None:
+            return False
+        if any(self._targets[k] == j for k in range(self._offsets[i], self._offsets[i + 1])):
+            return True
+        return not self.dirigido and any(
+            self._targets[k] == i for k in range(self._offsets[j], self._offsets[j + 1]))
+
+    def to_red_social(self, tipo_recorrido: str = 'BACK') -> Red_social:
+        """Reconstruye una Red_social completa en memoria, con las relaciones en su orden original."""
+        red_social = Red_social('dirigido' if self.dirigido else 'no dirigido', tipo_recorrido)
+        usuarios = [self._usuario_en(i) for i in range(self._n)]
+        for usuario in usuarios:
+            red_social.add_vertex(usuario)
+        filas = [None] * self._m
+        for origen in range(self._n):
+            for k in range(self._offsets[origen], self._offsets[origen + 1]):
+                filas[self._rango[k]] = (usuarios[origen], usuarios[self._targets[k]], self._interacciones[k], self._dias[k])
+        for source, target, interacciones, dias_activa in filas:
+            red_social.add_edge(source, target, interacciones, dias_activa)
+        return red_social
@@ -1,5 +1,6 @@
 class Relacion:
     """Clase que representa una relación entre dos usuarios."""
+    __slots__ = ('id', 'interacciones', 'dias_activa')
     
     # Contador de ID único
     _xx_num = 0
@@ -0,0 +1,92 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import List, Sequence, Tuple
+
+# Formato de fichero de instantánea binaria (little endian, alineado a 8 bytes):
+#   cabecera:  magic (8s) | versión (I) | tipo (I) | nº metadatos (I) | nº secciones (I)
+#   metadatos: n enteros (q)
+#   secciones: n entradas (desplazamiento Q, nº bytes Q, typecode c, 7 bytes de relleno)
+#   datos:     cada sección es un buffer de 'array' con el typecode indicado
+MAGIC = b'E3SNAP\x00\x00'
+VERSION = 1
+KIND_GRAFO = 1
+KIND_RED_SOCIAL = 2
+
+_HEADER = struct.Struct('<8sIIII')
+_META = struct.Struct('<q')
+_SECTION = struct.Struct('<QQc7x')
+
+
+def _align(offset: int) -> int:
+    """Redondea un desplazamiento al siguiente múltiplo de 8."""
+    return (offset + 7) & ~7
+
+
+def write_snapshot(path: str, kind: int, meta: Sequence[int], sections: Sequence):
+    """Escribe una instantánea con los metadatos y las secciones (arrays o memoryviews tipadas) dados."""
+    if sys.byteorder != 'little':
+        raise ValueError("Las instantáneas solo se pueden escribir en máquinas little endian.")
+    offset = _align(_HEADER.size + _META.size * len(meta) + _SECTION.size * len(sections))
+    table = []
+    views = [memoryview(section) for section in sections]
+    for view in views:
+        nbytes = view.nbytes
+        table.append((offset, nbytes, view.format.encode('ascii')))
+        offset = _align(offset + nbytes)
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, kind, len(meta), len(sections)))
+        for value in meta:
+            f.write(_META.pack(value))
+        for entry in table:
+            f.write(_SECTION.pack(*entry))
+        for (start, _, _), view in zip(table, views):
+            f.write(b'\x00' * (start - f.tell()))
+            f.write(view)
+
+
+def open_snapshot(path: str, kind: int) -> Tuple[mmap.mmap, List[int], List[memoryview]]:
+    """Proyecta en memoria una instantánea y devuelve (mmap, metadatos, vistas tipadas de cada sección).
+
+    Las vistas no copian datos: leen directamente de la caché de páginas del sistema,
+    que se comparte entre todos los procesos que abren el mismo fichero.
+    """
+    if sys.byteorder != 'little':
+        raise ValueError("Las instantáneas solo se pueden leer en máquinas little endian.")
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, found_kind, n_meta, n_sections = _HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError("El fichero no es una instantánea válida.")
+    if version != VERSION:
+        raise ValueError(f"Versión de instantánea no soportada: {version}.")
+    if found_kind != kind:
+        raise ValueError("La instantánea no corresponde al tipo de estructura pedido.")
+    position = _HEADER.size
+    meta = []
+    for _ in range(n_meta):
+        meta.append(_META.unpack_from(mapped, position)[0])
+        position += _META.size
+    raw = memoryview(mapped)
+    sections = []
+    for _ in range(n_sections):
+        start, nbytes, typecode = _SECTION.unpack_from(mapped, position)
+        position += _SECTION.size
+        sections.append(raw[start:start + nbytes].cast(typecode.decode('ascii')))
+    return mapped, meta, sections
+
+
+def pack_strings(strings) -> Tuple[array, array]:
+    """Empaqueta cadenas en un pool UTF-8. Devuelve (offsets 'q' con n + 1 posiciones, datos 'B')."""
+    offsets = array('q', [0])
+    data = array('B')
+    for string in strings:
+        data.frombytes(string.encode('utf-8'))
+        offsets.append(len(data))
+    return offsets, data
+
+
+def string_at(offsets, data, i: int) -> str:
+    """Devuelve la cadena i-ésima de un pool creado con pack_strings."""
+    return bytes(data[offsets[i]:offsets[i + 1]]).decode('utf-8')
@@ -0,0 +1,177 @@
+from array import array
+from datetime import date
+from typing import Dict, Iterator, Optional
+
+from relación import Relacion
+from usuarios import usuarios
+
+
+class UserTable:
+    """Almacenamiento columnar de usuarios.
+
+    DNI, nombre y apellidos se guardan en un único pool UTF-8 con sus offsets y la fecha
+    de nacimiento como ordinal en un array tipado. Cada usuario es una fila; UserRow
+    ofrece una vista ligera con la misma interfaz que usuarios.usuarios.
+    """
+
+    def __init__(self):
+        self._datos = bytearray()  # Pool de cadenas: dni, nombre y apellidos de cada fila, seguidos
+        self._offsets = array('q', [0])  # 3 * filas + 1 posiciones en el pool
+        self._nacimiento = array('i')  # Fecha de nacimiento como ordinal
+        self._filas: Dict[str, int] = {}  # {dni: fila}
+
+    @classmethod
+    def of(cls, usuarios_iterable=()) -> 'UserTable':
+        """Método de factoría que crea una tabla y le añade los usuarios dados."""
+        tabla = cls()
+        for usuario in usuarios_iterable:
+            tabla.add(usuario)
+        return tabla
+
+    def append(self, dni: str, nombre: str, apellidos: str, fecha_nacimiento: date) -> int:
+        """Añade un usuario y devuelve su fila; si el DNI ya existe devuelve la fila existente."""
+        fila = self._filas.get(dni)
+        if fila is not None:
+            return fila
+        for campo in (dni, nombre, apellidos):
+            self._datos += campo.encode('utf-8')
+            self._offsets.append(len(self._datos))
+        self._nacimiento.append(fecha_nacimiento.toordinal())
+        fila = len(self._nacimiento) - 1
+        self._filas[dni] = fila
+        return fila
+
+    def add(self, usuario) -> int:
+        """Añade un objeto usuario (cualquiera con dni, nombre, apellidos y fecha_nacimiento)."""
+        return self.append(usuario.dni, usuario.nombre, usuario.apellidos, usuario.fecha_nacimiento)
+
+    def _campo(self, fila: int, campo: int) -> str:
+        """Devuelve el campo (0 DNI, 1 nombre, 2 apellidos) de una fila."""
+        i = 3 * fila + campo
+        return self._datos[self._offsets[i]:self._offsets[i + 1]].decode('utf-8')
+
+    def row_of(self, dni: str) -> Optional[int]:
+        """Devuelve la fila de un DNI, o None si no está en la tabla."""
+        return self._filas.get(dni)
+
+    def get(self, dni: str) -> Optional['UserRow']:
+        """Devuelve la vista del usuario con el DNI dado, o None si no está en la tabla."""
+        fila = self._filas.get(dni)
+        return None if fila is None else UserRow(self, fila)
+
+    def __len__(self) -> int:
+        return len(self._nacimiento)
+
+    def __getitem__(self, fila: int) -> 'UserRow':
+        if not 0 <= fila < len(self._nacimiento):
+            raise IndexError("Fila de usuario fuera de rango.")
+        return UserRow(self, fila)
+
+    def __iter__(self) -> Iterator['UserRow']:
+        return (UserRow(self, fila) for fila in range(len(self._nacimiento)))
+
+
+class UserRow:
+    """Vista ligera de una fila de UserTable con la interfaz de usuarios.usuarios."""
+    __slots__ = ('_tabla', '_fila')
+
+    def __init__(self, tabla: UserTable, fila: int):
+        self._tabla = tabla
+        self._fila = fila
+
+    @property
+    def dni(self) -> str:
+        return self._tabla._campo(self._fila, 0)
+
+    @property
+    def nombre(self) -> str:
+        return self._tabla._campo(self._fila, 1)
+
+    @property
+    def apellidos(self) -> str:
+        return self._tabla._campo(self._fila, 2)
+
+    @property
+    def fecha_nacimiento(self) -> date:
+        return date.fromordinal(self._tabla._nacimiento[self._fila])
+
+    # Se reutilizan tal cual los métodos de usuarios, que solo leen los atributos anteriores
+    __str__ = usuarios.__str__
+    edad = usuarios.edad
+
+
+class RelationTable:
+    """Almacenamiento columnar de relaciones entre filas de una UserTable.
+
+    Los identificadores se asignan con el mismo contador global que Relacion, de modo
+    que mezclar objetos Relacion y filas de la tabla no produce identificadores repetidos.
+    """
+
+    def __init__(self, usuarios_tabla: Optional[UserTable] = None):
+        self.usuarios = usuarios_tabla  # Tabla de usuarios a la que apuntan source y target (opcional)
+        self._ids = array('q')
+        self._source = array('i')
+        self._target = array('i')
+        self._interacciones = array('q')
+        self._dias_activa = array('q')
+
+    @classmethod
+    def of(cls, usuarios_tabla: Optional[UserTable] = None) -> 'RelationTable':
+        """Método de factoría que crea una tabla de relaciones vacía."""
+        return cls(usuarios_tabla)
+
+    def append(self, interacciones: int, dias_activa: int, source: int = -1, target: int = -1) -> int:
+        """Añade una relación (opcionalmente entre dos filas de usuario) y devuelve su fila."""
+        Relacion._xx_num += 1  # Incrementamos el contador de ID único compartido con Relacion
+        self._ids.append(Relacion._xx_num)
+        self._source.append(source)
+        self._target.append(target)
+        self._interacciones.append(interacciones)
+        self._dias_activa.append(dias_activa)
+        return len(self._ids) - 1
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, fila: int) -> 'RelationRow':
+        if not 0 <= fila < len(self._ids):
+            raise IndexError("Fila de relación fuera de rango.")
+        return RelationRow(self, fila)
+
+    def __iter__(self) -> Iterator['RelationRow']:
+        return (RelationRow(self, fila) for fila in range(len(self._ids)))
+
+
+class RelationRow:
+    """Vista ligera de una fila de RelationTable con la interfaz de relación.Relacion."""
+    __slots__ = ('_tabla', '_fila')
+
+    def __init__(self, tabla: RelationTable, fila: int):
+        self._tabla = tabla
+        self._fila = fila
+
+    @property
+    def id(self) -> int:
+        return self._tabla._ids[self._fila]
+
+    @property
+    def interacciones(self) -> int:
+        return self._tabla._interacciones[self._fila]
+
+    @property
+    def dias_activa(self) -> int:
+        return self._tabla._dias_activa[self._fila]
+
+    @property
+    def source(self) -> Optional[UserRow]:
+        """Usuario origen, si la tabla está asociada a una UserTable."""
+        fila = self._tabla._source[self._fila]
+        return None if fila < 0 or self._tabla.usuarios is None else self._tabla.usuarios[fila]
+
+    @property
+    def target(self) -> Optional[UserRow]:
+        """Usuario destino, si la tabla está asociada a una UserTable."""
+        fila = self._tabla._target[self._fila]
+        return None if fila < 0 or self._tabla.usuarios is None else self._tabla.usuarios[fila]
+
+    __str__ = Relacion.__str__
@@ -0,0 +1,33 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks.ejecutar import aceleraciones, comparar, ejecutar
+from benchmarks.generador import dni, generar
+from redsocial import Red_social
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_generador_reproducible(self):
+        """Verifica que el generador es determinista y que sus ficheros se cargan con parse."""
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        rutas = [os.path.join(directorio.name, nombre) for nombre in ("u1", "r1", "u2", "r2")]
+        for modelo in ("power_law", "small_world"):
+            escritas = generar(modelo, 500, rutas[0], rutas[1], semilla=7)
+            generar(modelo, 500, rutas[2], rutas[3], semilla=7)
+            with open(rutas[1]) as a, open(rutas[3]) as b:
+                self.assertEqual(a.read(), b.read())  # Misma semilla, mismo resultado
+            red = Red_social.parse(rutas[0], rutas[1])
+            self.assertEqual(len(red.aristas), escritas)  # Todas las relaciones son válidas y distintas
+        self.assertEqual(dni(1), "00000001R")
+
+    def test_ejecutar(self):
+        """Verifica que la ejecución produce resultados comparables."""
+        datos = ejecutar([200], ["power_law"], memoria=True)  # Sin directorio: usa uno temporal y lo borra
+        self.assertTrue(all(r['pico_bytes'] is not None for r in datos['resultados']))
+        self.assertEqual(len(comparar(datos, datos)), len(datos['resultados']))
+        self.assertEqual(len(aceleraciones(datos)), 4)  # Bloque y arrays, dirigido y no dirigido
+
+if __name__ == "__main__":
+    unittest.main()
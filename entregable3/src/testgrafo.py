@@ -1,5 +1,12 @@
+import os
+import threading
+import tempfile
 import unittest
 
+import centralidad
+from grafo import Graph, FrozenGraph
+from recorridos import RecorridoEnProfundidad
+
 class TestGraph(unittest.TestCase):
 
     def test_add_vertex(self):
@@ -56,6 +63,25 @@ class TestGraph(unittest.TestCase):
         # Verificar que el grafo original no ha cambiado
         self.assertTrue(graph.contains_edge("A", "B"))  # El grafo original sigue teniendo la arista de A a B
 
+    def test_inverse_graph_vista(self):
+        """Test para la vista del grafo inverso y su materialización."""
+        graph = Graph(directed=True)
+        graph.add_edge("A", "B", 10)
+        graph.add_edge("C", "B", 1)
+        inverted = graph.inverse_graph()
+        self.assertEqual(inverted.successors("B"), {"A", "C"})
+        self.assertEqual(inverted.predecessors("A"), {"B"})
+        self.assertEqual(inverted.edge_weight("B", "A"), 10)
+        self.assertIs(inverted.inverse_graph(), graph)
+
+        # La vista refleja los cambios del original; la copia materializada no
+        copy = inverted.materialize()
+        graph.add_edge("D", "A", 2)
+        self.assertTrue(inverted.contains_edge("A", "D"))
+        self.assertFalse(copy.contains_edge("A", "D"))
+        self.assertEqual(copy.successors("B"), {"A", "C"})
+        self.assertEqual(inverted.freeze().successors("A"), {"D"})
+
     def test_edge_exceptions(self):
         """Test para manejar errores como bucles no permitidos."""
         graph = Graph()
@@ -65,5 +91,207 @@ class TestGraph(unittest.TestCase):
         with self.assertRaises(ValueError):
             graph.add_edge("A", "A", 5)
 
+    def test_freeze(self):
+        """Test para congelar el grafo en una instantánea CSR."""
+        graph = Graph(directed=True)
+        graph.add_edge("A", "B", 3)
+        graph.add_edge("A", "C", 1.5)
+        graph.add_edge("C", "B")
+
+        frozen = graph.freeze()
+        self.assertIsInstance(frozen, FrozenGraph)
+        self.assertEqual(set(frozen.vertex_set()), {"A", "B", "C"})  # Mismos vértices que el original
+        self.assertEqual(frozen.successors("A"), {"B", "C"})  # Sucesores por el CSR directo
+        self.assertEqual(frozen.predecessors("B"), {"A", "C"})  # Predecesores por el CSR inverso
+        self.assertEqual(frozen.successors("B", "BACK"), {"A", "C"})
+        self.assertTrue(frozen.contains_edge("A", "C"))
+        self.assertFalse(frozen.contains_edge("C", "A"))  # El grafo es dirigido
+        self.assertEqual(frozen.edge_weight("A", "B"), 3)
+        self.assertIsNone(frozen.edge_weight("C", "B"))  # Arista sin peso
+        self.assertEqual(frozen.successors("X"), set())  # Vértice inexistente
+
+        # La instantánea no cambia aunque se modifique el grafo original
+        graph.add_edge("B", "D", 2)
+        self.assertNotIn("D", frozen.vertex_set())
+
+    def test_freeze_no_dirigido(self):
+        """Test para congelar un grafo no dirigido."""
+        graph = Graph(directed=False)
+        graph.add_edge("A", "B", 5)
+        frozen = graph.freeze()
+        self.assertTrue(frozen.contains_edge("B", "A"))  # La arista existe en ambos sentidos
+        self.assertEqual(frozen.edge_weight("B", "A"), 5)
+        self.assertEqual(frozen.predecessors("A"), {"B"})
+        i = frozen.vertex_id("A")
+        self.assertEqual([frozen.vertex_of(j) for j in frozen.successor_ids(i)], ["B"])
+
+    def test_componentes(self):
+        """Test para las componentes conexas mantenidas al añadir aristas."""
+        graph = Graph(directed=True)
+        graph.add_edge("A", "B")
+        graph.add_edge("C", "D")
+        graph.add_vertex("E")
+        self.assertTrue(graph.same_component("B", "A"))  # Conexión débil en grafo dirigido
+        self.assertFalse(graph.same_component("A", "C"))
+        self.assertEqual(graph.component_count(), 3)
+        graph.add_edge("D", "A")
+        self.assertTrue(graph.same_component("B", "C"))
+        self.assertEqual(graph.component_of("C"), graph.component_of("B"))
+        self.assertEqual(sorted(graph.component_sizes().values()), [1, 4])
+        self.assertIsNone(graph.component_of("Z"))
+        inverted = graph.inverse_graph()  # La vista comparte las componentes del original
+        self.assertEqual(inverted.component_count(), 2)
+        self.assertEqual(inverted.component_sizes(), graph.component_sizes())
+
+    def test_add_edges_from(self):
+        """Verifica que la inserción en bloque equivale a llamar a add_edge con cada arista."""
+        for directed in (True, False):
+            edges = [("A", "B", 2), ("B", "C", None), ("B", "A", 7), ("A", "B", 9), ("D", "E", 1)]
+            uno_a_uno, en_bloque, en_arrays = Graph(directed), Graph(directed), Graph(directed)
+            avisos_uno, avisos_bloque = [], []
+            uno_a_uno.subscribe(lambda *edge: avisos_uno.append(edge))
+            en_bloque.subscribe(lambda *edge: avisos_bloque.append(edge))
+            for edge in edges:
+                uno_a_uno.add_edge(*edge)
+            self.assertEqual(en_bloque.add_edges_from(edges), len(avisos_uno))
+            en_arrays.add_edges_from_arrays(*zip(*edges))
+            for graph in (en_bloque, en_arrays):
+                self.assertEqual(graph.vertices, uno_a_uno.vertices)
+                self.assertEqual(graph.edges, uno_a_uno.edges)
+                self.assertEqual(list(graph.interner), list(uno_a_uno.interner))
+                self.assertEqual(graph._out, uno_a_uno._out)
+                self.assertEqual(graph._in, uno_a_uno._in)
+                self.assertEqual(sorted(graph.component_sizes().values()), [2, 3])  # El representante puede variar
+                self.assertTrue(graph.same_component("C", "A"))
+            self.assertEqual(avisos_bloque, avisos_uno)
+
+        graph = Graph()
+        graph.add_edges_from([("A", "B")])
+        with self.assertRaises(ValueError):
+            graph.add_edges_from([("B", "C"), ("C", "C")])  # Un bucle invalida todo el lote
+        self.assertEqual(graph.vertices, {"A", "B"})
+        with self.assertRaises(ValueError):
+            graph.add_edges_from_arrays(["A"], ["B", "C"])
+        self.assertEqual(graph.add_edges_from_arrays(["B", "C"], ["C", "A"]), 2)
+        self.assertIsNone(graph.edge_weight("C", "A"))
+        graph.add_edges_from([("D", "E"), ("F", "E")])  # Las uniones pendientes se aplican al consultar
+        graph.add_edge("E", "G")
+        self.assertEqual(graph.component_count(), 2)
+        self.assertEqual(graph.add_edges_from([("D", "A"), ("D", "E")]), 1)
+        self.assertEqual(graph.component_sizes(), {graph.component_of("G"): 7})
+
+    @unittest.skipIf(centralidad.sparse is None, "SciPy no está instalado")
+    def test_to_sparse(self):
+        """Verifica la exportación a matriz dispersa del grafo y de su instantánea."""
+        graph = Graph(directed=True)
+        graph.add_edge("A", "B", 5)
+        graph.add_edge("B", "C")
+        for matriz, interner in (graph.to_sparse(), graph.freeze().to_sparse()):
+            self.assertEqual(matriz.shape, (3, 3))
+            self.assertEqual(matriz[interner.id_of("A"), interner.id_of("B")], 5)
+            self.assertEqual(matriz[interner.id_of("B"), interner.id_of("C")], 1)  # Sin peso cuenta como 1
+            self.assertEqual(matriz[interner.id_of("B"), interner.id_of("A")], 0)
+
+    def test_publish(self):
+        """Verifica que las versiones publicadas no cambian y comparten lo que no se modifica."""
+        graph = Graph(directed=True)
+        self.assertIsNone(graph.snapshot())
+        graph.add_edge("A", "B", 1)
+        graph.add_edge("C", "D", 2)
+        v1 = graph.publish()
+        self.assertIs(graph.publish(), v1)  # Sin escrituras no hay versión nueva
+        graph.add_edge("A", "C", 3)
+        graph.add_vertex("E")
+        self.assertEqual(v1.successors("A"), {"B"})
+        self.assertNotIn("E", v1.vertex_set())
+        self.assertIs(graph.snapshot(), v1)
+        v2 = graph.publish()
+        self.assertEqual((v1.version, v2.version), (1, 2))
+        self.assertEqual(v2.successors("A"), {"B", "C"})
+        self.assertEqual(v2.predecessors("C"), {"A"})
+        self.assertEqual(v2.edge_weight("A", "C"), 3)
+        c = graph.vertex_id("C")
+        self.assertIs(v1.successor_ids(c), v2.successor_ids(c))  # Adyacencia no modificada: compartida
+        self.assertEqual(set(v2.freeze().successors("A")), {"B", "C"})
+
+        no_dirigido = Graph()
+        no_dirigido.add_edge("A", "B", 5)
+        self.assertEqual(no_dirigido.publish().edge_weight("B", "A"), 5)
+
+    def test_publish_sin_copias(self):
+        """Verifica que publicar y escribir no copia los diccionarios exteriores del grafo."""
+        graph = Graph(directed=True)
+        graph.add_edges_from((i, i + 1) for i in range(100))
+        sucesores, interner = graph._out, graph.interner
+        versiones = []
+        for i in range(100, 110):
+            versiones.append(graph.publish())
+            graph.add_edge(i, i + 1)
+        graph.add_edges_from([(0, 50), (200, 201)])
+        self.assertIs(graph._out, sucesores)
+        self.assertIs(graph.interner, interner)
+        for numero, version in enumerate(versiones):
+            self.assertEqual(len(version.vertex_set()), 101 + numero)
+            self.assertNotIn(101 + numero, version.vertex_set())
+            self.assertEqual(version.successors(0), {1})
+            self.assertEqual(version.successors(99 + numero), {100 + numero})
+            self.assertEqual(version.successors(100 + numero), set())
+        self.assertEqual(graph.publish().successors(0), {1, 50})
+
+    def test_publish_concurrente(self):
+        """Verifica que un lector recorre versiones consistentes mientras otro hilo escribe."""
+        graph = Graph(directed=True)
+        graph.add_edge(0, 1)
+        graph.publish()
+        def escritor():
+            for i in range(1, 3000):
+                graph.add_edge(i, i + 1)
+                if i % 50 == 0:
+                    graph.publish()
+        hilo = threading.Thread(target=escritor)
+        hilo.start()
+        while hilo.is_alive():
+            version = graph.snapshot()
+            recorrido = RecorridoEnProfundidad.of(version)
+            recorrido.traverse(0)
+            self.assertEqual(len(recorrido.path_to_origin(max(version.vertex_set()))), len(version.vertex_set()))
+        hilo.join()
+
+    def test_stats(self):
+        """Test para la instrumentación opcional del grafo."""
+        graph = Graph(directed=True)
+        graph.add_edge("A", "B")
+        eventos = []
+        stats = graph.enable_stats(hook=lambda nombre, valor: eventos.append(nombre))
+        graph.add_edge("B", "C", 2)
+        graph.successors("A")
+        self.assertEqual(stats.contadores["add_edge"], 1)
+        self.assertEqual(stats.contadores["add_vertex"], 1)  # Solo C es nuevo
+        self.assertIn("successors", eventos)
+        datos = graph.stats()
+        self.assertEqual((datos["vertices"], datos["aristas"]), (3, 2))
+        self.assertGreater(datos["bytes_por_arista"], 0)
+
+        # Desactivada, los métodos vuelven a ser los de la clase
+        graph.disable_stats()
+        self.assertNotIn("add_edge", vars(graph))
+        self.assertNotIn("contadores", graph.stats())
+
+    def test_snapshot(self):
+        """Test para guardar y cargar el grafo en una instantánea binaria."""
+        graph = Graph(directed=True)
+        graph.add_edge("A", "B", 3)
+        graph.add_edge("C", "B")
+        path = os.path.join(tempfile.mkdtemp(), "grafo.snap")
+        graph.save_snapshot(path)
+        self.addCleanup(os.remove, path)
+
+        loaded = Graph.load_snapshot(path)
+        self.assertEqual(set(loaded.vertex_set()), {"A", "B", "C"})
+        self.assertEqual(loaded.predecessors("B"), {"A", "C"})
+        self.assertEqual(loaded.edge_weight("A", "B"), 3)
+        self.assertIsNone(loaded.edge_weight("C", "B"))
+        self.assertFalse(loaded.contains_edge("B", "A"))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
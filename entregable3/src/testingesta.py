@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+from datetime import date
+
+from ingesta import Ingesta, eventos_de_cola, eventos_de_stream, parse_evento
+from redsocial import Red_social, Usuario
+
+class TestIngesta(unittest.TestCase):
+
+    def test_parse_evento(self):
+        """Verifica la conversión de líneas en eventos de usuario y de relación."""
+        usuario = parse_evento("U,11111111A,Ana,Garcia,1990-05-01")
+        self.assertIsInstance(usuario, Usuario)
+        self.assertEqual(usuario.fecha_nacimiento, date(1990, 5, 1))
+        self.assertEqual(parse_evento("R,11111111A,22222222B,10,30"), ("11111111A", "22222222B", 10, 30))
+        for linea in ("X,1,2", "R,11111111A,22222222B,diez,30", "R,11111111A"):
+            with self.assertRaises(ValueError):
+                parse_evento(linea)
+
+    def test_ingesta_cola(self):
+        """Verifica que los eventos de una cola se aplican en orden, en lotes acotados, con sus métricas."""
+        red = Red_social.of()
+        ingesta = Ingesta(red, max_lote=2, capacidad=2)
+
+        async def escenario():
+            cola = asyncio.Queue()
+            for evento in ["U,11111111A,Ana,Garcia,1990-05-01", "R,11111111A,22222222B,1,1",  # Luis aún no existe
+                           Usuario("22222222B", "Luis", "Perez", date(1985, 3, 12)),
+                           ("11111111A", "22222222B", 10, 30), "R,22222222B,11111111A,5,5",  # Repetida
+                           "U,11111111A,Ana,Garcia,1990-05-01", "basura", None]:
+                cola.put_nowait(evento)
+            return await ingesta.consumir(eventos_de_cola(cola))
+
+        estadisticas = asyncio.run(escenario())
+        self.assertTrue(red.contains_edge("11111111A", "22222222B"))
+        self.assertEqual(red.edge("11111111A", "22222222B")['interacciones'], 10)
+        self.assertEqual((estadisticas.usuarios, estadisticas.usuarios_rechazados), (2, 1))
+        self.assertEqual((estadisticas.relaciones, estadisticas.relaciones_rechazadas), (1, 2))
+        self.assertEqual(estadisticas.eventos_rechazados, 1)
+        self.assertEqual((estadisticas.recibidos, estadisticas.pendientes), (7, 0))
+        self.assertGreaterEqual(estadisticas.lotes, 3)  # Nunca más de max_lote eventos por lote
+        self.assertGreaterEqual(estadisticas.retraso_maximo, estadisticas.retraso)
+        self.assertGreater(estadisticas.filas_por_segundo, 0)
+
+    def test_ingesta_stream(self):
+        """Verifica la ingesta de las líneas de un StreamReader hasta el fin de datos."""
+        red = Red_social.of()
+
+        async def escenario():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"U,11111111A,Ana,Garcia,1990-05-01\n\nU,22222222B,Luis,Perez,1985-03-12\n")
+            reader.feed_data(b"R,11111111A,22222222B,10,30\n")
+            reader.feed_eof()
+            return await Ingesta(red).consumir(eventos_de_stream(reader))
+
+        estadisticas = asyncio.run(escenario())
+        self.assertEqual(estadisticas.recibidos, 3)
+        self.assertEqual(red.degree("11111111A"), 1)
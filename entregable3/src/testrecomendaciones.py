@@ -0,0 +1,83 @@
+import unittest
+from datetime import date
+from math import log
+
+from recomendaciones import Recomendador
+from redsocial import Red_social, Usuario
+
+class TestRecomendador(unittest.TestCase):
+
+    def _red(self, tipo_grafo='no dirigido'):
+        """Construye una red A-B, A-C, B-D, C-D, D-E (E está a tres saltos de A)."""
+        red = Red_social.of(tipo_grafo)
+        self.u = {letra: Usuario(f"{i:08d}{letra}", letra, "Apellido", date(1990, 1, 1 + i))
+                  for i, letra in enumerate("ABCDE")}
+        for usuario in self.u.values():
+            red.add_vertex(usuario)
+        for a, b, interacciones in [("A", "B", 10), ("A", "C", 4), ("B", "D", 2), ("C", "D", 6), ("D", "E", 1)]:
+            red.add_edge(self.u[a], self.u[b], interacciones, 1)
+        return red
+
+    def _nombres(self, recomendaciones):
+        return [(usuario.nombre, puntuacion) for usuario, puntuacion in recomendaciones]
+
+    def test_metricas(self):
+        """Verifica las tres métricas de puntuación sobre los candidatos a distancia 2."""
+        red = self._red()
+        self.assertEqual(self._nombres(Recomendador(red).recomendar(self.u["A"])), [("D", 2)])
+        self.assertEqual(self._nombres(Recomendador(red).recomendar(self.u["E"])), [("B", 1), ("C", 1)])
+        adamic_adar = Recomendador(red, 'adamic_adar').recomendar(self.u["A"])
+        self.assertAlmostEqual(adamic_adar[0][1], 2 / log(2))
+        interacciones = Recomendador(red, 'interacciones')
+        self.assertEqual(self._nombres(interacciones.recomendar(self.u["A"])), [("D", 22)])
+        self.assertEqual(self._nombres(interacciones.recomendar(self.u["E"].dni, k=1)), [("C", 7)])
+        self.assertEqual(Recomendador(red).recomendar("00000000X"), [])
+        dirigida = self._red('dirigido')  # Las relaciones cuentan en ambos sentidos
+        self.assertEqual(self._nombres(Recomendador(dirigida).recomendar(self.u["E"])), [("B", 1), ("C", 1)])
+        with self.assertRaises(ValueError):
+            Recomendador(red, 'popularidad')
+
+    def test_intermedio_sin_candidatos(self):
+        """Verifica que un vecino cuyo único vecino es el propio usuario no aporta candidatos."""
+        red = Red_social.of('no dirigido')
+        a = Usuario("00000000A", "A", "Apellido", date(1990, 1, 1))
+        b = Usuario("00000001B", "B", "Apellido", date(1990, 1, 2))
+        red.add_vertex(a)
+        red.add_vertex(b)
+        red.add_edge(a, b, 1, 1)
+        for metrica in ('vecinos_comunes', 'adamic_adar', 'interacciones'):
+            self.assertEqual(Recomendador(red, metrica).recomendar(a), [])
+
+    def test_invalidacion(self):
+        """Verifica que una relación nueva solo invalida a sus extremos y a los vecinos de estos."""
+        red = self._red()
+        recomendador = Recomendador(red)
+        recomendador.recomendar(self.u["A"])
+        recomendador.recomendar(self.u["E"])
+        recomendador.recomendar(self.u["A"])
+        self.assertEqual((recomendador.aciertos, recomendador.fallos), (1, 2))
+
+        red.add_edge(self.u["B"], self.u["C"], 1, 1)  # A es vecino de B: se invalida; E no
+        self.assertEqual(recomendador.invalidaciones, 1)
+        recomendador.recomendar(self.u["E"])
+        self.assertEqual(recomendador.aciertos, 2)
+
+        red.add_edge(self.u["E"], self.u["A"], 1, 1)
+        self.assertEqual(self._nombres(recomendador.recomendar(self.u["E"])), [("B", 2), ("C", 2)])
+        self.assertEqual(self._nombres(recomendador.recomendar(self.u["A"])), [("D", 3)])
+        recomendador.close()
+        red.add_edge(self.u["A"], self.u["D"], 1, 1)  # Ya no está suscrito
+        self.assertEqual(recomendador.invalidaciones, 2)
+
+    def test_precalcular_lru(self):
+        """Verifica el precálculo de los usuarios más activos y la expulsión del menos reciente."""
+        red = self._red()
+        recomendador = Recomendador(red, capacidad=2)
+        self.assertEqual(recomendador.precalcular(n=5), 2)  # No calcula más de lo que cabe
+        self.assertEqual(set(recomendador._cache), {self.u["D"].dni, self.u["A"].dni})
+        recomendador.recomendar(self.u["E"])  # Expulsa al usado hace más tiempo
+        self.assertEqual(set(recomendador._cache), {self.u["A"].dni, self.u["E"].dni})
+        self.assertEqual(recomendador.precalcular([self.u["A"]]), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
+import random
 import unittest
 
+import grafo
+from recorridos import Graph, RecorridoEnProfundidad, RecorridoEnAnchura
+
 class TestGraphAndDFS(unittest.TestCase):
 
     def test_add_vertex(self):
@@ -39,9 +43,9 @@ class TestGraphAndDFS(unittest.TestCase):
         graph.add_edge("C", "D")
 
         dfs = RecorridoEnProfundidad.of(graph)
-        dfs.traverse("D")  # Comenzamos desde D
+        dfs.traverse("A")  # Comenzamos desde A
 
-        # Verificamos el camino desde D hasta A
+        # Verificamos el camino desde el origen A hasta D
         path = dfs.path_to_origin("D")
         self.assertEqual(path, ["A", "B", "C", "D"])  # El camino debe ser [A, B, C, D]
 
@@ -53,7 +57,7 @@ class TestGraphAndDFS(unittest.TestCase):
         graph.add_edge("C", "D")
 
         dfs = RecorridoEnProfundidad.of(graph)
-        dfs.traverse("D")
+        dfs.traverse("A")
 
         # Verificamos que el origen del vértice "D" sea A
         self.assertEqual(dfs.origin("D"), "A")
@@ -75,5 +79,183 @@ class TestGraphAndDFS(unittest.TestCase):
         self.assertIn("C", groups["A"])  # C debe ser un vecino de A
         self.assertIn("D", groups["C"])  # D debe ser un vecino de C
 
+class TestRecorridoEnAnchura(unittest.TestCase):
+
+    def _grafo_social(self):
+        """Construye un grafo con varios caminos de distinta longitud entre A y F."""
+        graph = Graph()
+        for source, target in [("A", "B"), ("B", "C"), ("C", "D"), ("D", "F"), ("A", "E"), ("E", "F"), ("C", "G")]:
+            graph.add_edge(source, target)
+        return graph
+
+    def test_bfs_saltos(self):
+        """Verifica que el BFS guarda el número de saltos como coste y da caminos mínimos."""
+        bfs = RecorridoEnAnchura.of(self._grafo_social())
+        bfs.traverse("A")
+        self.assertEqual(bfs._tree["A"], (None, 0))
+        self.assertEqual(bfs._tree["F"], ("E", 2))  # F está a dos saltos por E
+        self.assertEqual(bfs.path_to_origin("F"), ["A", "E", "F"])
+        self.assertEqual(bfs._path[0], "A")
+        self.assertEqual(set(bfs._path), {"A", "B", "C", "D", "E", "F", "G"})
+
+    def test_bfs_abajo_arriba(self):
+        """Verifica que la expansión de abajo arriba da las mismas distancias que la de arriba abajo."""
+        graph = self._grafo_social()
+        top_down = RecorridoEnAnchura.of(graph)
+        top_down.ALPHA = 0  # Nunca pasa a abajo-arriba
+        top_down.traverse("A")
+        bottom_up = RecorridoEnAnchura.of(graph)
+        bottom_up.ALPHA = 10 ** 6  # Pasa a abajo-arriba desde el primer nivel
+        bottom_up.BETA = 10 ** 6
+        bottom_up.traverse("A")
+        self.assertEqual({v: c for v, (_, c) in top_down._tree.items()},
+                         {v: c for v, (_, c) in bottom_up._tree.items()})
+
+    def test_reparacion_incremental(self):
+        """Verifica que el árbol suscrito se repara al añadir aristas, igual que un recorrido nuevo."""
+        graph = self._grafo_social()
+        graph.add_edge("X", "Y")
+        bfs = RecorridoEnAnchura.of(graph)
+        bfs.traverse("A")
+        bfs.subscribe()
+        self.assertEqual(bfs.depth("D"), 3)
+
+        graph.add_edge("A", "D")  # Acorta la distancia de D y de lo que cuelga de él
+        graph.add_edge("G", "X")  # Une una región no visitada
+        self.assertEqual(bfs._tree["D"], ("A", 1))
+        self.assertEqual(bfs.path_to_origin("Y"), ["A", "B", "C", "G", "X", "Y"])
+        self.assertEqual(bfs.depth("D"), 1)  # El índice del árbol se ha invalidado
+
+        nuevo = RecorridoEnAnchura.of(graph)
+        nuevo.traverse("A")
+        self.assertEqual({v: c for v, (_, c) in bfs._tree.items()}, {v: c for v, (_, c) in nuevo._tree.items()})
+
+        bfs.unsubscribe()
+        graph.add_edge("Y", "Z")
+        self.assertNotIn("Z", bfs._tree)
+
+    def test_stats(self):
+        """Verifica la instrumentación del recorrido: tiempos por fase y tamaños máximos."""
+        arriba_abajo = RecorridoEnAnchura.of(self._grafo_social())
+        arriba_abajo.ALPHA = 0  # Fuerza la fase de arriba abajo
+        arriba_abajo.enable_stats()
+        arriba_abajo.traverse("A")
+        datos = arriba_abajo.stats()
+        self.assertEqual(datos["contadores"]["vertices_visitados"], 7)
+        self.assertEqual(datos["contadores"]["aristas_examinadas"], 14)  # Cada arista, una vez por extremo
+        self.assertEqual(datos["maximos"]["max_frontera"], 2)
+        self.assertEqual(datos["maximos"]["max_profundidad"], 3)
+        self.assertNotIn("_bottom_up_step_ids", datos["tiempos"])
+
+        bfs = RecorridoEnAnchura.of(self._grafo_social())
+        bfs.ALPHA = 10 ** 6  # Fuerza la fase de abajo arriba
+        stats = bfs.enable_stats()
+        bfs.traverse("A")
+        datos = bfs.stats()
+        self.assertEqual(datos["maximos"]["max_frontera"], 2)
+        # Cada nivel comprueba los predecesores de los no visitados hasta dar con uno en la frontera
+        self.assertGreaterEqual(datos["contadores"]["aristas_examinadas"], 6)
+        self.assertIn("_bottom_up_step_ids", datos["tiempos"])  # El grafo numera sus vértices
+        self.assertIn("traverse", stats.tiempos)
+        bfs.traverse_to("A", "D")
+        self.assertEqual(stats.contadores["recorridos"], 2)
+        bfs.disable_stats()
+        self.assertNotIn("traverse", vars(bfs))
+
+    def test_traverse_many(self):
+        """Verifica los recorridos desde varios orígenes, en el proceso actual y con trabajadores."""
+        graph = self._grafo_social()
+        for workers in (1, 2):
+            resultado = RecorridoEnAnchura.traverse_many(graph, ["A", "G"], workers=workers, padres=True)
+            self.assertEqual(resultado.histogramas["A"], [1, 2, 2, 2])  # A | B E | C F | D G
+            self.assertEqual(sum(resultado.histogramas["G"]), 7)
+            self.assertEqual(resultado.parent("A", "F"), "E")
+            self.assertIsNone(resultado.parent("A", "A"))
+        with self.assertRaises(KeyError) as error:  # Se detecta antes de repartir el trabajo
+            RecorridoEnAnchura.traverse_many(graph, ["A", "Z"], workers=2)
+        self.assertIn("'Z'", str(error.exception))
+
+        # Sobre una instantánea CSR de grafo.Graph el resultado coincide con el BFS normal
+        weighted = grafo.Graph()
+        for source, target in [("A", "B"), ("B", "C"), ("C", "D"), ("D", "F"), ("A", "E"), ("E", "F"), ("C", "G")]:
+            weighted.add_edge(source, target)
+        bfs = RecorridoEnAnchura.of(weighted)
+        bfs.traverse("G")
+        resultado = RecorridoEnAnchura.traverse_many(weighted.freeze(), ["G"], workers=2)
+        self.assertEqual(len(resultado.histogramas["G"]) - 1, max(c for _, c in bfs._tree.values()))
+
+    def test_bfs_enteros(self):
+        """Verifica que el BFS sobre identificadores enteros (FrozenGraph) da las mismas distancias."""
+        graph = grafo.Graph(directed=True)
+        for source, target in [("A", "B"), ("B", "C"), ("C", "D"), ("A", "E"), ("E", "D"), ("D", "F"), ("X", "A")]:
+            graph.add_edge(source, target)
+        esperado = RecorridoEnAnchura.of(graph)
+        esperado.traverse("A")
+        # De abajo arriba cada nivel comprueba los predecesores de los no visitados hasta dar con uno en
+        # la frontera: el total depende de si D tiene primero a C o a E entre sus predecesores
+        for alpha, fase, examinadas in ((0, "_top_down_step_ids", (6,)), (10 ** 6, "_bottom_up_step_ids", (10, 11))):
+            bfs = RecorridoEnAnchura.of(graph.freeze())
+            bfs.ALPHA = alpha
+            stats = bfs.enable_stats()
+            bfs.traverse("A")
+            self.assertEqual({v: c for v, (_, c) in bfs._tree.items()}, {v: c for v, (_, c) in esperado._tree.items()})
+            self.assertEqual(len(bfs.path_to_origin("F")), 4)
+            self.assertNotIn("X", bfs._tree)
+            self.assertIn(fase, stats.tiempos)  # Las fases sobre enteros también se cronometran
+            self.assertEqual(stats.contadores["vertices_visitados"], 6)
+            self.assertIn(stats.contadores["aristas_examinadas"], examinadas)
+            self.assertEqual(stats.maximos["max_frontera"], 2)  # A | B E | C D | F
+            self.assertEqual(stats.maximos["max_profundidad"], 3)
+
+    def test_bfs_grafo_dirigido(self):
+        """Verifica el BFS sobre grafo.Graph dirigido usando sus predecesores."""
+        graph = grafo.Graph(directed=True)
+        graph.add_edge("A", "B")
+        graph.add_edge("B", "C")
+        graph.add_edge("C", "A")
+        graph.add_edge("D", "A")
+        bfs = RecorridoEnAnchura.of(graph)
+        bfs.ALPHA = 10 ** 6
+        bfs.traverse("A")
+        self.assertEqual(bfs.path_to_origin("C"), ["A", "B", "C"])
+        self.assertNotIn("D", bfs._tree)  # D no es alcanzable desde A
+
+    def test_traverse_to(self):
+        """Verifica el BFS bidireccional: camino mínimo, límite de saltos y sentido de las aristas."""
+        bfs = RecorridoEnAnchura.of(self._grafo_social())
+        self.assertEqual(bfs.traverse_to("A", "F"), ["A", "E", "F"])
+        self.assertEqual(bfs._tree["F"], ("E", 2))
+        self.assertEqual(bfs.traverse_to("G", "F", max_saltos=4), ["G", "C", "D", "F"])
+        self.assertIsNone(bfs.traverse_to("G", "F", max_saltos=2))
+        self.assertEqual(bfs.traverse_to("A", "A"), ["A"])
+        self.assertIsNone(bfs.traverse_to("A", "Z"))
+
+        graph = grafo.Graph(directed=True)
+        graph.add_edge("A", "B")
+        graph.add_edge("B", "C")
+        graph.add_edge("C", "A")
+        bfs = RecorridoEnAnchura.of(graph)
+        self.assertEqual(bfs.traverse_to("A", "C"), ["A", "B", "C"])
+        self.assertEqual(bfs.traverse_to("C", "B"), ["C", "A", "B"])
+
+    def test_traverse_to_aleatorio(self):
+        """Compara la longitud de los caminos bidireccionales con la distancia de un BFS completo."""
+        rng = random.Random(3)
+        for directed in (False, True):
+            graph = grafo.Graph(directed=directed)
+            for _ in range(150):
+                a, b = rng.randrange(60), rng.randrange(60)
+                if a != b:
+                    graph.add_edge(a, b)
+            bfs = RecorridoEnAnchura.of(graph)
+            for _ in range(40):
+                source, target = rng.sample(sorted(graph.vertex_set()), 2)
+                bfs.traverse(source)
+                esperado = bfs._tree[target][1] if target in bfs._tree else None
+                camino = bfs.traverse_to(source, target)
+                self.assertEqual(None if camino is None else len(camino) - 1, esperado)
+                if camino is not None:
+                    self.assertTrue(all(graph.contains_edge(a, b) for a, b in zip(camino, camino[1:])))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
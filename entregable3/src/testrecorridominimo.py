@@ -0,0 +1,87 @@
+import unittest
+
+import grafo
+from recorridos import Graph, RecorridoMinimo
+
+class TestRecorridoMinimo(unittest.TestCase):
+
+    def _grafo_ponderado(self):
+        """Construye un grafo dirigido donde el camino más corto en saltos no es el más barato."""
+        graph = grafo.Graph(directed=True)
+        graph.add_edge("A", "B", 10)
+        graph.add_edge("B", "E", 10)
+        graph.add_edge("A", "C", 1)
+        graph.add_edge("C", "D", 2)
+        graph.add_edge("D", "E", 3)
+        graph.add_edge("E", "F", 1)
+        graph.add_edge("X", "A", 1)
+        return graph
+
+    def test_dijkstra(self):
+        """Verifica que el árbol guarda el coste real y path_to_origin da la ruta más barata."""
+        minimo = RecorridoMinimo.of(self._grafo_ponderado())
+        minimo.traverse("A")
+        self.assertEqual(minimo._tree["E"], ("D", 6))  # 1 + 2 + 3 es mejor que 10 + 10
+        self.assertEqual(minimo.path_to_origin("F"), ["A", "C", "D", "E", "F"])
+        self.assertNotIn("X", minimo._tree)  # X no es alcanzable desde A
+        self.assertEqual(minimo._path[0], "A")
+
+    def test_identificadores(self):
+        """Verifica que el grafo, su versión publicada y su instantánea CSR dan el mismo árbol."""
+        graph = self._grafo_ponderado()
+        arboles = []
+        for vista in (graph, graph.publish(), graph.freeze()):
+            minimo = RecorridoMinimo.of(vista)
+            minimo.traverse("A")
+            arboles.append((minimo._tree, minimo._path))
+        self.assertEqual(arboles[0], arboles[1])
+        self.assertEqual(arboles[0], arboles[2])
+        self.assertEqual(arboles[0][0]["F"], ("E", 7))
+        minimo = RecorridoMinimo.of(graph.inverse_graph())
+        minimo.traverse("F")
+        self.assertEqual(minimo.path_to_origin("A"), ["F", "E", "D", "C", "A"])
+
+    def test_bidireccional(self):
+        """Verifica que la consulta punto a punto coincide con el barrido completo."""
+        graph = self._grafo_ponderado()
+        minimo = RecorridoMinimo.of(graph)
+        self.assertEqual(minimo.traverse_to("A", "F"), ["A", "C", "D", "E", "F"])
+        self.assertEqual(minimo._tree["F"], ("E", 7))
+        self.assertEqual(minimo.path_to_origin("F"), ["A", "C", "D", "E", "F"])
+        self.assertIsNone(minimo.traverse_to("A", "X"))  # Camino inexistente
+        self.assertEqual(minimo.traverse_to("A", "A"), ["A"])
+
+    def test_reparacion_incremental(self):
+        """Verifica que el árbol suscrito se repara con aristas que abaratan caminos."""
+        graph = self._grafo_ponderado()
+        minimo = RecorridoMinimo.of(graph)
+        minimo.traverse("A")
+        minimo.subscribe()
+        graph.add_edge("A", "E", 2)
+        self.assertEqual(minimo._tree["E"], ("A", 2))
+        self.assertEqual(minimo._tree["F"], ("E", 3))  # Se propaga a los descendientes
+        graph.add_edge("B", "Z", 1)
+        self.assertEqual(minimo._tree["Z"], ("B", 11))
+        graph.add_edge("D", "F", 100)  # No mejora nada
+        self.assertEqual(minimo._tree["F"], ("E", 3))
+
+    def test_sin_pesos(self):
+        """Verifica que en un grafo sin pesos cada arista cuenta como 1."""
+        graph = Graph()
+        graph.add_edge("A", "B")
+        graph.add_edge("B", "C")
+        graph.add_edge("A", "C")
+        minimo = RecorridoMinimo.of(graph)
+        minimo.traverse("A")
+        self.assertEqual(minimo._tree["C"], ("A", 1))
+        self.assertEqual(minimo.traverse_to("C", "A"), ["C", "A"])
+
+    def test_peso_negativo(self):
+        """Verifica que se rechazan aristas con peso negativo."""
+        graph = grafo.Graph(directed=True)
+        graph.add_edge("A", "B", -1)
+        with self.assertRaises(ValueError):
+            RecorridoMinimo.of(graph).traverse("A")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
 
+import grafo
+from recorridos import Graph, RecorridoEnProfundidad
+
 class TestGraphAndDFS(unittest.TestCase):
 
     def test_add_vertex(self):
@@ -39,9 +42,9 @@ class TestGraphAndDFS(unittest.TestCase):
         graph.add_edge("C", "D")
 
         dfs = RecorridoEnProfundidad.of(graph)
-        dfs.traverse("D")  # Comenzamos desde D
+        dfs.traverse("A")  # Comenzamos desde A
 
-        # Verificamos el camino desde D hasta A
+        # Verificamos el camino desde el origen A hasta D
         path = dfs.path_to_origin("D")
         self.assertEqual(path, ["A", "B", "C", "D"])  # El camino debe ser [A, B, C, D]
 
@@ -53,7 +56,7 @@ class TestGraphAndDFS(unittest.TestCase):
         graph.add_edge("C", "D")
 
         dfs = RecorridoEnProfundidad.of(graph)
-        dfs.traverse("D")
+        dfs.traverse("A")
 
         # Verificamos que el origen del vértice "D" sea A
         self.assertEqual(dfs.origin("D"), "A")
@@ -75,5 +78,103 @@ class TestGraphAndDFS(unittest.TestCase):
         self.assertIn("C", groups["A"])  # C debe ser un vecino de A
         self.assertIn("D", groups["C"])  # D debe ser un vecino de C
 
+    def test_cadena_larga(self):
+        """Verifica que el DFS no depende del límite de recursión en cadenas largas."""
+        graph = Graph()
+        n = 20000
+        for i in range(n):
+            graph.add_edge(str(i), str(i + 1))
+
+        dfs = RecorridoEnProfundidad.of(graph)
+        dfs.traverse("0")
+        self.assertEqual(len(dfs._path), n + 1)  # Se visitan todos los vértices
+        self.assertEqual(dfs._tree[str(n)], (str(n - 1), n))  # El coste es la profundidad
+
+    def test_iter_traverse(self):
+        """Verifica que el recorrido perezoso genera (vértice, predecesor, profundidad) y se puede parar."""
+        graph = Graph()
+        graph.add_edge("A", "B")
+        graph.add_edge("B", "C")
+        graph.add_edge("C", "D")
+
+        dfs = RecorridoEnProfundidad.of(graph)
+        visitados = list(dfs.iter_traverse("A"))
+        self.assertEqual(visitados, [("A", None, 0), ("B", "A", 1), ("C", "B", 2), ("D", "C", 3)])
+        self.assertEqual(dfs._path, ["A", "B", "C", "D"])
+
+        # Parada anticipada: solo se rellena lo consumido
+        for vertex, _, _ in dfs.iter_traverse("A"):
+            if vertex == "B":
+                break
+        self.assertEqual(dfs._path, ["A", "B"])
+
+    def test_indice_arbol(self):
+        """Verifica el origen, la profundidad, los grupos cacheados y el ancestro común del árbol."""
+        graph = Graph()
+        for source, target in [("A", "B"), ("B", "C"), ("C", "D"), ("B", "E"), ("E", "F"), ("X", "Y")]:
+            graph.add_edge(source, target)
+
+        dfs = RecorridoEnProfundidad.of(graph)
+        dfs.traverse("A")
+        self.assertEqual(dfs.origin("F"), "A")
+        self.assertEqual(dfs.depth("D"), 3)
+        self.assertIsNone(dfs.depth("X"))  # X no es alcanzable desde A
+        self.assertEqual(dfs.common_ancestor("D", "F"), "B")
+        self.assertEqual(dfs.common_ancestor("C", "D"), "C")
+        self.assertIsNone(dfs.common_ancestor("D", "X"))
+        self.assertIs(dfs.groups(), dfs.groups())  # Se cachean entre consultas
+
+        # Un recorrido nuevo invalida el índice
+        dfs.traverse("X")
+        self.assertEqual(dfs.origin("Y"), "X")
+        self.assertNotIn("B", dfs.groups())
+
+    def test_reparacion_alcanzabilidad(self):
+        """Verifica que el DFS suscrito añade los vértices que pasan a ser alcanzables."""
+        graph = Graph()
+        graph.add_edge("A", "B")
+        graph.add_edge("C", "D")
+        dfs = RecorridoEnProfundidad.of(graph)
+        dfs.traverse("A")
+        dfs.subscribe()
+        graph.add_edge("B", "C")
+        self.assertEqual(dfs.path_to_origin("D"), ["A", "B", "C", "D"])
+        self.assertEqual(dfs.origin("D"), "A")
+
+    def test_dfs_enteros(self):
+        """Verifica el DFS sobre los identificadores enteros de un FrozenGraph."""
+        graph = grafo.Graph()
+        for i in range(5000):
+            graph.add_edge(i, i + 1)
+        graph.add_edge(5000, 0)
+        dfs = RecorridoEnProfundidad.of(graph.freeze())
+        stats = dfs.enable_stats()
+        dfs.traverse(0)
+        self.assertEqual(len(dfs._path), 5001)
+        self.assertEqual(stats.contadores["aristas_examinadas"], 10002)  # Cada arista del ciclo, una vez por extremo
+        self.assertEqual(stats.maximos["max_pila"], 5001)
+        self.assertEqual(dfs.origin(2500), 0)
+        self.assertEqual(dfs._tree[dfs._path[1]], (0, 1))
+
+    def test_stats(self):
+        """Verifica que el DFS instrumentado registra el tamaño máximo de la pila."""
+        graph = Graph()
+        graph.add_edge("A", "B")
+        graph.add_edge("B", "C")
+        dfs = RecorridoEnProfundidad.of(graph)
+        stats = dfs.enable_stats()
+        dfs.traverse("A")
+        self.assertEqual(dfs.stats()["maximos"]["max_pila"], 3)
+        self.assertEqual(stats.contadores["aristas_examinadas"], 4)  # Cada arista, una vez por extremo
+        self.assertNotIn("max_frontera", stats.maximos)
+
+        # El recorrido perezoso también se registra, aunque se pare antes de terminar
+        recorrido = dfs.iter_traverse("C")
+        next(recorrido)
+        recorrido.close()
+        self.assertEqual(stats.contadores["recorridos"], 2)
+        self.assertEqual(stats.contadores["vertices_visitados"], 4)  # 3 del primer recorrido, 1 del segundo
+        self.assertIn("iter_traverse", stats.tiempos)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,370 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from datetime import date
+
+import centralidad
+import edades
+from redsocial import Red_social, Usuario, _workers_por_defecto
+from usuarios import usuarios
+
+class TestRedSocial(unittest.TestCase):
+
+    def _red(self, tipo_grafo='no dirigido'):
+        """Construye una red con cuatro usuarios y tres relaciones."""
+        red = Red_social.of(tipo_grafo)
+        self.ana = Usuario("11111111A", "Ana", "Garcia", date(1990, 5, 1))
+        self.luis = Usuario("22222222B", "Luis", "Perez", date(1985, 3, 12))
+        self.eva = Usuario("33333333C", "Eva", "Lopez", date(2000, 11, 30))
+        self.juan = Usuario("44444444D", "Juan", "Ruiz", date(1979, 1, 7))
+        for usuario in (self.ana, self.luis, self.eva, self.juan):
+            red.add_vertex(usuario)
+        red.add_edge(self.ana, self.luis, 10, 30)
+        red.add_edge(self.eva, self.ana, 4, 7)
+        red.add_edge(self.luis, self.eva, 1, 2)
+        return red
+
+    def test_indice_relaciones(self):
+        """Verifica las consultas de relación, grado y vecinos sobre el índice."""
+        red = self._red()
+        self.assertTrue(red.contains_edge("22222222B", "11111111A"))  # No dirigido: vale en ambos sentidos
+        self.assertEqual(red.edge(self.ana, self.eva)['interacciones'], 4)
+        self.assertIsNone(red.edge(self.ana, self.juan))
+        self.assertEqual(red.degree(self.ana), 2)
+        self.assertEqual(red.degree("44444444D"), 0)
+        self.assertEqual({u.dni for u in red.neighbors(self.ana)}, {"22222222B", "33333333C"})
+        self.assertEqual(red.relaciones(self.luis)["11111111A"]['dias_activa'], 30)
+
+    def test_relaciones_duplicadas(self):
+        """Verifica que no se añaden relaciones repetidas y se conserva el orden de inserción."""
+        red = self._red()
+        self.assertFalse(red.add_edge(self.luis, self.ana, 99, 99))  # Ya existe en sentido contrario
+        self.assertFalse(red.add_edge(self.ana, self.ana, 1, 1))  # Bucle
+        self.assertEqual([(a['source'].dni, a['target'].dni) for a in red.aristas],
+                         [("11111111A", "22222222B"), ("33333333C", "11111111A"), ("22222222B", "33333333C")])
+
+    def test_red_dirigida(self):
+        """Verifica el índice en una red dirigida."""
+        red = self._red('dirigido')
+        self.assertFalse(red.contains_edge(self.luis, self.ana))
+        self.assertTrue(red.add_edge(self.luis, self.ana, 2, 2))  # El sentido contrario es otra relación
+        self.assertEqual({u.dni for u in red.predecessors(self.ana)}, {"33333333C", "22222222B"})
+        self.assertEqual(red.degree(self.ana), 3)
+
+    def test_comunidades(self):
+        """Verifica las comunidades mantenidas con union-find al añadir relaciones."""
+        red = self._red()
+        self.assertTrue(red.same_component(self.ana, "33333333C"))
+        self.assertFalse(red.same_component(self.ana, self.juan))
+        self.assertEqual(red.component_count(), 2)
+        self.assertEqual(sorted(red.component_sizes().values()), [1, 3])
+        red.add_edge(self.juan, self.eva, 1, 1)
+        self.assertEqual(red.component_count(), 1)
+        self.assertEqual(red.component_of(self.juan), red.component_of(self.luis))
+
+    def test_stats(self):
+        """Verifica la instrumentación opcional de la red."""
+        red = self._red()
+        stats = red.enable_stats()
+        red.degree(self.ana)
+        list(red.neighbors(self.ana))
+        self.assertEqual(stats.contadores["degree"], 1)
+        self.assertEqual(stats.contadores["neighbors"], 1)
+        self.assertEqual(red.stats()["aristas"], 3)
+        red.disable_stats()
+        self.assertNotIn("degree", vars(red))
+
+    def test_consultas_ordenadas(self):
+        """Verifica las consultas por ranking de interacciones y por rango de días activa."""
+        red = self._red()
+        red.add_edge(self.juan, self.luis, 10, 400)  # Empata con la primera relación en interacciones
+        self.assertEqual([a['interacciones'] for a in red.top_relaciones(3)], [10, 10, 4])
+        self.assertIs(red.top_relaciones(1)[0], red.edge(self.ana, self.luis))  # En empate, la más antigua
+        self.assertEqual([a['dias_activa'] for a in red.relaciones_activas(5)], [7, 30, 400])
+        self.assertEqual([a['dias_activa'] for a in red.relaciones_activas(2, 30)], [2, 7, 30])
+        self.assertEqual(red.relaciones_activas(31, 399), [])
+        self.assertEqual([a['interacciones'] for a in red.top_relaciones_de(self.luis, 2)], [10, 10])
+        self.assertEqual([a['interacciones'] for a in red.top_relaciones_de(self.eva, 5)], [4, 1])
+        self.assertEqual(red.top_relaciones_de("00000000X", 3), [])
+
+    def test_top_relaciones_de_acotado(self):
+        """Verifica que el montículo acotado por usuario da las mismas relaciones que ordenarlas todas."""
+        for tipo in ('no dirigido', 'dirigido'):
+            red = Red_social.of(tipo)
+            red.TOP_K = 4
+            centro = Usuario("00000000H", "Hub", "Apellido", date(1990, 1, 1))
+            red.add_vertex(centro)
+            for i in range(20):
+                otro = Usuario(f"{i + 1:08d}X", f"U{i}", "Apellido", date(1990, 1, 1))
+                red.add_vertex(otro)
+                source, target = (centro, otro) if i % 2 else (otro, centro)
+                red.add_edge(source, target, (i * 7) % 5, i)
+            self.assertEqual(len(red._fuertes[red.interner.id_of(centro.dni)]), 4)  # Solo guarda TOP_K relaciones por usuario
+            esperadas = sorted(red.aristas, key=lambda a: -a['interacciones'])  # Estable: las más antiguas primero
+            for k in (1, 4):
+                self.assertEqual(red.top_relaciones_de(centro, k), esperadas[:k])
+            for k in (5, 30):
+                self.assertEqual([a['interacciones'] for a in red.top_relaciones_de(centro, k)],
+                                 [a['interacciones'] for a in esperadas[:k]])
+
+    def test_add_edges_batch(self):
+        """Verifica que la inserción por lotes deja la red igual que add_edge con cada relación."""
+        for tipo in ('no dirigido', 'dirigido'):
+            uno_a_uno, en_bloque = Red_social.of(tipo), Red_social.of(tipo)
+            uno_a_uno.TOP_K = en_bloque.TOP_K = 4
+            avisos_uno, avisos_bloque = [], []
+            uno_a_uno.subscribe(lambda *relacion: avisos_uno.append(relacion[2]['interacciones']))
+            en_bloque.subscribe(lambda *relacion: avisos_bloque.append(relacion[2]['interacciones']))
+            dnis = [f"{i:08d}X" for i in range(12)]
+            for red in (uno_a_uno, en_bloque):
+                for dni in dnis:
+                    red.add_vertex(Usuario(dni, "Nombre", "Apellido", date(1990, 1, 1)))
+            filas = [(dnis[i % 3], dnis[(i * 5) % 12], (i * 7) % 5, i) for i in range(40)]
+            filas += [(dnis[0], "99999999Z", 1, 1), (dnis[1], dnis[1], 1, 1)]  # DNI desconocido y bucle
+            for origen, destino, interacciones, dias in filas:
+                usuarios_red = uno_a_uno.usuarios_dni
+                if destino in usuarios_red:
+                    uno_a_uno.add_edge(usuarios_red[origen], usuarios_red[destino], interacciones, dias)
+            insertadas = en_bloque._add_edges_batch(filas[:15]) + en_bloque._add_edges_batch(filas[15:])
+            resumen = lambda relaciones: [(a['source'].dni, a['target'].dni, a['interacciones'], a['dias_activa'])
+                                          for a in relaciones]
+            self.assertEqual(insertadas, len(uno_a_uno.aristas))
+            self.assertEqual(resumen(en_bloque.aristas), resumen(uno_a_uno.aristas))
+            self.assertEqual(avisos_bloque, avisos_uno)
+            self.assertEqual(resumen(en_bloque.top_relaciones(10)), resumen(uno_a_uno.top_relaciones(10)))
+            self.assertEqual(resumen(en_bloque.relaciones_activas(5, 20)), resumen(uno_a_uno.relaciones_activas(5, 20)))
+            self.assertEqual(en_bloque.component_count(), uno_a_uno.component_count())
+            for dni in dnis:
+                self.assertEqual(resumen(en_bloque.relaciones(dni).values()), resumen(uno_a_uno.relaciones(dni).values()))
+                self.assertEqual(resumen(en_bloque.top_relaciones_de(dni, 3)), resumen(uno_a_uno.top_relaciones_de(dni, 3)))
+                self.assertEqual(resumen(en_bloque.top_relaciones_de(dni, 8)), resumen(uno_a_uno.top_relaciones_de(dni, 8)))
+
+    def test_consultas_intercaladas(self):
+        """Verifica los índices ordenados al alternar inserciones y consultas, y tras un bloque grande de inserciones."""
+        red = Red_social.of('dirigido')
+        usuarios_red = [Usuario(f"{i:08d}X", f"U{i}", "Apellido", date(1990, 1, 1)) for i in range(12)]
+        for usuario in usuarios_red:
+            red.add_vertex(usuario)
+        pares = [(a, b) for a in usuarios_red for b in usuarios_red if a is not b]
+        for i, (a, b) in enumerate(pares[:40]):  # Una consulta tras cada inserción
+            red.add_edge(a, b, (i * 7) % 13, (i * 5) % 11)
+            self.assertEqual([x['dias_activa'] for x in red.relaciones_activas(0)],
+                             sorted(x['dias_activa'] for x in red.aristas))
+        for i, (a, b) in enumerate(pares[40:], 40):  # Muchas inserciones antes de consultar
+            red.add_edge(a, b, (i * 7) % 13, (i * 5) % 11)
+        self.assertEqual([x['interacciones'] for x in red.top_relaciones(len(pares))],
+                         sorted((x['interacciones'] for x in red.aristas), reverse=True))
+        self.assertEqual([x['dias_activa'] for x in red.relaciones_activas(3, 6)],
+                         sorted(x['dias_activa'] for x in red.aristas if 3 <= x['dias_activa'] <= 6))
+
+    def test_usuarios_por_edad(self):
+        """Verifica la consulta por rango de edad sobre el índice de fechas de nacimiento."""
+        red = self._red()
+        referencia = date(2020, 5, 1)  # Ana cumple 30 ese mismo día
+        self.assertEqual([u.dni for u in red.usuarios_por_edad(30, 41, referencia)], ["44444444D", "22222222B", "11111111A"])
+        self.assertEqual([u.dni for u in red.usuarios_por_edad(0, 29, referencia)], ["33333333C"])
+        self.assertEqual(red.usuarios_por_edad(35, 35, date(2020, 3, 11)), [])  # Luis tiene 34 un día antes de cumplir 35
+        self.assertEqual(red.usuarios_por_edad(35, 35, date(2020, 3, 12)), [self.luis])
+        bisiesto = Usuario("55555555E", "Sara", "Diaz", date(2000, 2, 29))
+        red.add_vertex(bisiesto)
+        self.assertEqual(red.usuarios_por_edad(21, 21, date(2021, 2, 28)), [])
+        self.assertEqual(red.usuarios_por_edad(21, 21, date(2021, 3, 1)), [bisiesto])
+
+    def test_analisis_edades(self):
+        """Verifica las edades calculadas en bloque con y sin NumPy frente a usuarios.edad()."""
+        red = self._red()
+        red.add_vertex(Usuario("55555555E", "Sara", "Diaz", date(2000, 2, 29)))
+        referencia = date(2021, 2, 28)
+        for numpy in {edades.np, None}:
+            with self.subTest(numpy=numpy is not None):
+                anterior, edades.np = edades.np, numpy
+                try:
+                    self.assertEqual(list(red.edades(referencia)), [30, 35, 20, 42, 20])
+                    self.assertEqual(red.histograma_edades(10, referencia), {20: 2, 30: 2, 40: 1})
+                    medias = red.edad_media_por_comunidad(referencia)
+                    self.assertEqual(medias[red.component_of(self.ana)], (30 + 35 + 20) / 3)
+                    self.assertEqual(medias[red.component_of(self.juan)], 42)
+                    self.assertEqual(len(medias), 3)
+                finally:
+                    edades.np = anterior
+        usuario = usuarios("11111111A", "Ana", "Garcia", date(1990, 5, 1))
+        self.assertEqual(list(red.edades())[0], usuario.edad())
+
+    def test_centralidades(self):
+        """Verifica grado, PageRank y autovector (con y sin SciPy) frente a sus definiciones."""
+        red = self._red('dirigido')
+        red.add_edge(self.ana, self.eva, 5, 3)  # Ana reparte su rango entre dos relaciones de distinto peso
+        usuarios = list(red.vertices.values())
+        grado = red.centralidad_grado()
+        self.assertEqual(grado[self.ana], 1)
+        self.assertEqual(grado[self.juan], 0)
+        for modulos in {(centralidad.np, centralidad.sparse), (None, None)}:
+            with self.subTest(scipy=modulos[1] is not None):
+                anteriores = centralidad.np, centralidad.sparse
+                centralidad.np, centralidad.sparse = modulos
+                try:
+                    rango = red.pagerank()
+                    salida = {u: sum(a['interacciones'] for a in red.aristas if a['source'] is u) for u in usuarios}
+                    self.assertAlmostEqual(sum(rango.values()), 1)
+                    # Ecuación estacionaria: juan no tiene salida y reparte su rango entre todos
+                    for usuario in usuarios:
+                        entrante = sum(rango[a['source']] * a['interacciones'] / salida[a['source']]
+                                       for a in red.aristas if a['target'] is usuario)
+                        esperado = 0.85 * (entrante + rango[self.juan] / 4) + 0.15 / 4
+                        self.assertAlmostEqual(rango[usuario], esperado)
+                    autovector = red.centralidad_autovector('dias_activa')
+                    self.assertAlmostEqual(sum(valor * valor for valor in autovector.values()), 1)
+                    self.assertAlmostEqual(autovector[self.juan], 0)
+                finally:
+                    centralidad.np, centralidad.sparse = anteriores
+        with self.assertRaises(ValueError):
+            red.pagerank('edad')
+
+    @unittest.skipIf(centralidad.sparse is None, "SciPy no está instalado")
+    def test_to_sparse(self):
+        """Verifica la matriz dispersa de la red y su índice de DNIs."""
+        red = self._red()
+        matriz, indice = red.to_sparse('dias_activa')
+        i, j = indice.id_of(self.ana.dni), indice.id_of(self.luis.dni)
+        self.assertEqual(matriz[i, j], 30)
+        self.assertEqual(matriz[j, i], 30)  # No dirigida: simétrica
+        self.assertEqual(matriz.nnz, 6)
+
+    def test_publish(self):
+        """Verifica que una versión publicada de la red no ve las escrituras posteriores."""
+        red = self._red()
+        vertices, vecinos = red.vertices, red._vecinos
+        version = red.publish()
+        red.add_edge(self.juan, self.ana, 3, 3)
+        red.add_vertex(Usuario("55555555E", "Sara", "Diaz", date(2000, 2, 29)))
+        self.assertIs(red.usuarios_dni, red.vertices)
+        self.assertIs(red.vertices, vertices)  # Escribir tras publicar no copia los diccionarios exteriores
+        self.assertIs(red._vecinos, vecinos)
+        self.assertEqual(len(version.vertices), 4)
+        self.assertNotIn("55555555E", version.vertices)
+        self.assertEqual(version.degree(self.ana), 2)
+        self.assertFalse(version.contains_edge(self.ana, self.juan))
+        self.assertEqual(version.edge(self.luis, self.ana)['interacciones'], 10)
+        self.assertEqual(len(list(version.aristas)), 3)
+        nueva = red.publish()
+        self.assertEqual(nueva.version, version.version + 1)
+        self.assertEqual({u.dni for u in nueva.neighbors(self.ana)}, {"22222222B", "33333333C", "44444444D"})
+        self.assertEqual(len(list(nueva.aristas)), 4)
+        eva = red.interner.id_of(self.eva.dni)
+        self.assertIs(nueva._vecinos[eva], version._vecinos[eva])  # No modificada: compartida
+
+    def test_exportar_csv(self):
+        """Verifica que el CSV exportado (también con gzip) se vuelve a leer con parse."""
+        red = self._red()
+        with tempfile.TemporaryDirectory() as directorio:
+            for extension in ('.csv', '.csv.gz'):
+                usuarios_file = os.path.join(directorio, 'usuarios' + extension)
+                relaciones_file = os.path.join(directorio, 'relaciones' + extension)
+                red.exportar_csv(usuarios_file, relaciones_file)
+                leida = Red_social.parse(usuarios_file, relaciones_file)
+                self.assertEqual(list(leida.vertices), list(red.vertices))
+                self.assertEqual(leida.usuarios_dni[self.eva.dni].fecha_nacimiento, self.eva.fecha_nacimiento)
+                self.assertEqual([(a['source'].dni, a['target'].dni, a['interacciones'], a['dias_activa'])
+                                  for a in leida.aristas],
+                                 [(a['source'].dni, a['target'].dni, a['interacciones'], a['dias_activa'])
+                                  for a in red.aristas])
+
+    def test_exportar_csv_campos_no_validos(self):
+        """Verifica que no se exportan a CSV campos con comas o saltos de línea, que parse no leería."""
+        for apellidos in ("García, López", "García\nLópez", "García\r"):
+            red = Red_social.of('no dirigido')
+            red.add_vertex(Usuario("33333333C", "Carlos", apellidos, date(1992, 3, 3)))
+            with self.assertRaises(ValueError):
+                red.exportar_csv(io.StringIO(), io.StringIO())
+
+    def test_exportar_jsonl_graphml(self):
+        """Verifica las exportaciones a JSON Lines y GraphML."""
+        red = self._red('dirigido')
+        salida = io.StringIO()
+        red.exportar_jsonl(salida)
+        objetos = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+        self.assertEqual([o['tipo'] for o in objetos], ['usuario'] * 4 + ['relacion'] * 3)
+        self.assertEqual(objetos[4], {'tipo': 'relacion', 'source': "11111111A", 'target': "22222222B",
+                                      'interacciones': 10, 'dias_activa': 30})
+
+        salida = io.StringIO()
+        red.exportar_graphml(salida)
+        espacio = '{http://graphml.graphdrawing.org/xmlns}'
+        grafo = ET.fromstring(salida.getvalue()).find(espacio + 'graph')
+        self.assertEqual(grafo.get('edgedefault'), 'directed')
+        self.assertEqual(len(grafo.findall(espacio + 'node')), 4)
+        arista = grafo.findall(espacio + 'edge')[1]
+        self.assertEqual((arista.get('source'), arista.get('target')), ("33333333C", "11111111A"))
+        self.assertEqual([d.text for d in arista], ['4', '7'])
+        self.assertIn("33333333C -> 11111111A (días activa: 7 - num interacciones: 4)", str(red))
+
+    def test_camino_mas_corto(self):
+        """Verifica los grados de separación entre usuarios, también en una versión publicada."""
+        red = self._red()
+        red.add_edge(self.juan, self.eva, 1, 1)
+        self.assertEqual(red.camino_mas_corto(self.juan, "22222222B"), [self.juan, self.eva, self.luis])
+        self.assertIsNone(red.camino_mas_corto(self.juan, self.luis, max_saltos=1))
+        self.assertIsNone(red.camino_mas_corto(self.juan, "00000000X"))
+        dirigida = self._red('dirigido')
+        self.assertEqual(dirigida.camino_mas_corto(self.luis, self.ana), [self.luis, self.eva, self.ana])
+        self.assertEqual(dirigida.publish().camino_mas_corto(self.ana, self.eva), [self.ana, self.luis, self.eva])
+
+    def _ficheros(self):
+        """Escribe unos ficheros de usuarios y relaciones (con filas erróneas) en un directorio temporal."""
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        usuarios_file = os.path.join(directorio.name, "usuarios.txt")
+        relaciones_file = os.path.join(directorio.name, "relaciones.txt")
+        with open(usuarios_file, "w") as f:
+            f.write("11111111A,Ana,Garcia,1990-05-01\n")
+            f.write("22222222B,Luis,Perez,1985-03-12\n")
+            f.write("33333333C,Eva,Lopez,2000-11-30\n")
+        with open(relaciones_file, "w") as f:
+            f.write("11111111A,22222222B,10,30\n")
+            f.write("22222222B,33333333C,1,2\n")
+            f.write("22222222B,99999999Z,1,2\n")  # DNI desconocido
+            f.write("11111111A,22222222B,x,3\n")  # Fila mal formada
+            f.write("22222222B,11111111A,5,5\n")  # Relación repetida
+        return usuarios_file, relaciones_file
+
+    def test_parse_bulk(self):
+        """Verifica la carga masiva, con y sin pool de procesos, y sus estadísticas."""
+        usuarios_file, relaciones_file = self._ficheros()
+        for workers in (1, 2):
+            red = Red_social.parse_bulk(usuarios_file, relaciones_file, workers=workers, chunk_bytes=16)
+            self.assertEqual(len(red.usuarios_dni), 3)
+            self.assertEqual(len(red.aristas), 2)
+            self.assertTrue(red.contains_edge("33333333C", "22222222B"))
+            self.assertEqual(red.estadisticas_carga.relaciones, 2)
+            self.assertEqual(red.estadisticas_carga.relaciones_rechazadas, 3)
+            self.assertIn("filas/s", str(red.estadisticas_carga))
+        self.assertEqual(_workers_por_defecto(relaciones_file, 1 << 22), 1)  # Un solo bloque: sin pool
+        self.assertEqual(len(Red_social.parse_bulk(usuarios_file, relaciones_file).aristas), 2)
+
+    def test_snapshot(self):
+        """Verifica que la instantánea binaria conserva usuarios y relaciones."""
+        red = self._red()
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        path = os.path.join(directorio.name, "red.snap")
+        red.save_snapshot(path)
+
+        instantanea = Red_social.load_snapshot(path)
+        self.assertEqual(len(instantanea), 4)
+        self.assertEqual(instantanea.num_relaciones, 3)
+        self.assertEqual(instantanea.usuario("33333333C").fecha_nacimiento, date(2000, 11, 30))
+        self.assertIsNone(instantanea.usuario("00000000X"))
+        self.assertTrue(instantanea.contains_edge("22222222B", "11111111A"))
+        self.assertFalse(instantanea.contains_edge("44444444D", "11111111A"))
+        self.assertEqual(instantanea.degree("11111111A"), 2)
+        self.assertEqual(instantanea.relaciones("11111111A")["33333333C"]['interacciones'], 4)
+
+        copia = instantanea.to_red_social()
+        self.assertEqual([(a['source'].dni, a['target'].dni, a['interacciones'], a['dias_activa']) for a in copia.aristas],
+                         [(a['source'].dni, a['target'].dni, a['interacciones'], a['dias_activa']) for a in red.aristas])
+
+if __name__ == "__main__":
+    unittest.main()
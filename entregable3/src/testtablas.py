@@ -0,0 +1,49 @@
+import unittest
+from datetime import date
+
+from relación import Relacion
+from tablas import RelationTable, UserTable
+from usuarios import usuarios
+
+class TestTablas(unittest.TestCase):
+
+    def test_user_table(self):
+        """Verifica que las filas de UserTable se comportan como usuarios."""
+        ana = usuarios.of("11111111A", "Ana", "García", date(1990, 5, 1))
+        tabla = UserTable.of([ana])
+        fila = tabla.append("22222222B", "Luis", "Perez", date(1985, 3, 12))
+        self.assertEqual(fila, 1)
+        self.assertEqual(tabla.append("22222222B", "Otro", "Otro", date(2000, 1, 1)), 1)  # DNI repetido
+        self.assertEqual(len(tabla), 2)
+
+        vista = tabla.get("11111111A")
+        self.assertEqual(str(vista), str(ana))  # Misma representación que usuarios
+        self.assertEqual(vista.apellidos, "García")
+        self.assertEqual(vista.fecha_nacimiento, date(1990, 5, 1))
+        self.assertEqual(vista.edad(), ana.edad())
+        self.assertIsNone(tabla.get("00000000X"))
+        self.assertEqual([u.dni for u in tabla], ["11111111A", "22222222B"])
+
+    def test_relation_table(self):
+        """Verifica que RelationTable comparte el contador de identificadores con Relacion."""
+        usuarios_tabla = UserTable()
+        a = usuarios_tabla.append("11111111A", "Ana", "Garcia", date(1990, 5, 1))
+        b = usuarios_tabla.append("22222222B", "Luis", "Perez", date(1985, 3, 12))
+        relaciones = RelationTable.of(usuarios_tabla)
+        anterior = Relacion.of(1, 1)
+        fila = relaciones.append(10, 30, a, b)
+        siguiente = Relacion.of(2, 2)
+
+        relacion = relaciones[fila]
+        self.assertEqual(relacion.id, anterior.id + 1)
+        self.assertEqual(siguiente.id, relacion.id + 1)
+        self.assertEqual(str(relacion), f"({relacion.id} - días activa: 30 - num interacciones: 10)")
+        self.assertEqual(relacion.target.nombre, "Luis")
+
+    def test_slots(self):
+        """Verifica que las clases de datos usan __slots__ y no tienen __dict__."""
+        self.assertFalse(hasattr(usuarios.of("11111111A", "Ana", "Garcia", date(1990, 5, 1)), "__dict__"))
+        self.assertFalse(hasattr(Relacion.of(1, 1), "__dict__"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ from typing import Optional
 
 class usuarios:
     """Clase que representa un usuario en el sistema."""
+    __slots__ = ('dni', 'nombre', 'apellidos', 'fecha_nacimiento')
     
     def __init__(self, dni: str, nombre: str, apellidos: str, fecha_nacimiento: date):
         """Inicializa un nuevo usuario con los atributos proporcionados."""
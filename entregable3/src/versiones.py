@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+
+_AUSENTE = object()  # Marca de una clave que no existía en la versión
+
+
+class _Cambios:
+    """Valores que tenían, en una versión publicada, las claves que el escritor modificó después de publicarla.
+
+    Solo se anotan los cambios hechos mientras es la última versión; los posteriores están en
+    los _Cambios de las versiones siguientes, enlazados con siguiente.
+    """
+    __slots__ = ('antes', 'siguiente')
+
+    def __init__(self, nombres):
+        self.antes = {nombre: {} for nombre in nombres}  # {atributo: {clave: valor en la versión o _AUSENTE}}
+        self.siguiente = None  # _Cambios de la versión publicada a continuación
+
+
+class VistaVersion:
+    """Un contenedor exterior (dict o set) tal como era al publicar una versión, sin copiarlo.
+
+    Lee el contenedor vivo del escritor y lo corrige con los valores anteriores que éste
+    anota antes de cada escritura, empezando por los _Cambios de la propia versión. Se lee
+    siempre primero el contenedor vivo y después los cambios: si una escritura concurrente
+    llega entre ambas lecturas, su valor anterior ya está anotado.
+    """
+    __slots__ = ('_vivo', '_nombre', '_cambios', '_conjunto', '_copia')
+
+    def __init__(self, vivo, nombre: str, cambios: _Cambios):
+        self._vivo = vivo
+        self._nombre = nombre
+        self._cambios = cambios
+        self._conjunto = isinstance(vivo, set)
+        self._copia = None  # Contenido completo, reconstruido la primera vez que se recorre
+
+    def _valor(self, clave):
+        """Devuelve el valor de clave en la versión, o _AUSENTE."""
+        if self._copia is not None:
+            return self._copia.get(clave, _AUSENTE)
+        if self._conjunto:
+            valor = True if clave in self._vivo else _AUSENTE
+        else:
+            valor = self._vivo.get(clave, _AUSENTE)
+        cambios = self._cambios
+        while cambios is not None:
+            antes = cambios.antes[self._nombre]
+            if clave in antes:
+                return antes[clave]
+            cambios = cambios.siguiente
+        return valor
+
+    def _contenido(self) -> dict:
+        """Contenido completo de la versión; se reconstruye en O(V) la primera vez y después se reutiliza."""
+        if self._copia is None:
+            self._copia = self._reconstruir()
+        return self._copia
+
+    def _reconstruir(self) -> dict:
+        contenido = dict.fromkeys(self._vivo, True) if self._conjunto else self._vivo.copy()
+        anteriores = {}
+        cambios = self._cambios
+        while cambios is not None:
+            for clave, valor in list(cambios.antes[self._nombre].items()):
+                anteriores.setdefault(clave, valor)  # El valor más antiguo es el de esta versión
+            cambios = cambios.siguiente
+        contenido.update(anteriores)
+        return {clave: valor for clave, valor in contenido.items() if valor is not _AUSENTE}
+
+    def get(self, clave, defecto=None):
+        valor = self._valor(clave)
+        return defecto if valor is _AUSENTE else valor
+
+    def __getitem__(self, clave):
+        valor = self._valor(clave)
+        if valor is _AUSENTE:
+            raise KeyError(clave)
+        return valor
+
+    def __contains__(self, clave) -> bool:
+        return self._valor(clave) is not _AUSENTE
+
+    def __iter__(self):
+        return iter(self._contenido())
+
+    def __len__(self) -> int:
+        return len(self._contenido())
+
+    def keys(self):
+        return self._contenido().keys()
+
+    def values(self):
+        return self._contenido().values()
+
+    def items(self):
+        return self._contenido().items()
+
+
+class Versionado(ABC):
+    """Aislamiento por instantáneas con copia en escritura, para estructuras con un único escritor.
+
+    El escritor llama a publish() para publicar la versión actual: un objeto de solo lectura
+    cuyos contenedores son vistas (VistaVersion) de los de la estructura, sin copiarlos. Los
+    lectores obtienen la última versión publicada con snapshot(), desde cualquier hilo y sin
+    bloqueos, y la recorren sabiendo que nunca cambia. Tras publicar, cada escritura anota el
+    valor anterior de las claves que modifica (una vez por versión) y copia los contenedores
+    interiores que va a modificar; publicar y escribir cuesta O(vértices modificados).
+
+    La clase define _COMPARTIDOS (atributos compartidos con las versiones) y
+    _crear_version(numero), que construye las vistas con _vista(nombre), y llama a
+    _preparar_escritura(cambios) antes de modificar esos atributos si _propios no es None.
+    Mientras no se publica ninguna versión no hay ningún coste adicional.
+    """
+    _COMPARTIDOS = ()
+    _version = 0  # Número de la última versión publicada
+    _publicada = None  # Última versión publicada
+    _compartida = False  # True si no ha habido escrituras desde la última publicación
+    _propios = None  # Pares (atributo, clave) ya anotados en esta versión (None si nunca se ha publicado)
+    _cambios = None  # _Cambios de la última versión publicada
+
+    @abstractmethod
+    def _crear_version(self, numero):
+        """Crea el objeto de solo lectura con vistas de los contenedores actuales."""
+
+    def publish(self):
+        """Publica la versión actual y la devuelve en O(1). Solo debe llamarla el hilo escritor.
+
+        Si no ha habido escrituras desde la última publicación se devuelve la misma versión.
+        """
+        if not self._compartida:
+            self._version += 1
+            self._propios = set()
+            cambios = _Cambios(self._COMPARTIDOS)
+            if self._cambios is not None:
+                self._cambios.siguiente = cambios
+            self._cambios = cambios
+            self._compartida = True
+            self._publicada = self._crear_version(self._version)
+        return self._publicada
+
+    def snapshot(self):
+        """Devuelve la última versión publicada (None si no se ha publicado ninguna)."""
+        return self._publicada
+
+    def _vista(self, nombre: str) -> VistaVersion:
+        """Vista del contenedor nombre tal como está ahora, para la versión que se va a publicar."""
+        return VistaVersion(getattr(self, nombre), nombre, self._cambios)
+
+    def _preparar_escritura(self, cambios=()):
+        """Anota el valor actual de lo que se va a modificar, si no se ha anotado ya en esta versión.
+
+        cambios son pares (atributo, clave): la entrada atributo[clave] que se va a añadir o
+        modificar. Si ya existe, su contenedor interior se sustituye por una copia, de modo que
+        el que ve la versión publicada no cambia.
+        """
+        self._compartida = False
+        propios = self._propios
+        anotados = self._cambios.antes
+        for cambio in cambios:
+            if cambio not in propios:
+                propios.add(cambio)
+                nombre, clave = cambio
+                contenedor = getattr(self, nombre)
+                if isinstance(contenedor, set):
+                    anotados[nombre][clave] = True if clave in contenedor else _AUSENTE
+                    continue
+                interior = contenedor.get(clave, _AUSENTE)
+                anotados[nombre][clave] = interior  # Se anota antes de escribir (ver VistaVersion)
+                if interior is not _AUSENTE:
+                    contenedor[clave] = interior.copy()